@@ -0,0 +1,112 @@
+"""
+API endpoints for the audit trail.
+"""
+from datetime import datetime
+from typing import Any, Dict, Optional
+from uuid import UUID
+
+from django.http import StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from ninja import Router, Schema
+
+from apps.authentication.decorators import auth_required
+from .encoding import get_audit_dictionary
+from .models import AuditLog
+from .queries import AuditFilters, DEFAULT_PAGE_SIZE, InvalidCursor, export, search
+from .schemas import AuditLogOut, AuditLogPage
+from .writer import get_audit_writer
+
+
+class ErrorSchema(Schema):
+    detail: str
+
+
+router = Router()
+
+
+def _staff_user(request):
+    """Return the staff user for ``request``, or an error response tuple."""
+    user = request.user if hasattr(request, 'user') else request.auth
+    if not user or not getattr(user, 'is_authenticated', False):
+        return None, (401, ErrorSchema(detail="Authentication required"))
+    if not (user.is_staff or user.is_superuser):
+        return None, (403, ErrorSchema(detail="Staff access required"))
+    return user, None
+
+
+@router.get("/metrics", response={200: Dict[str, Any], 401: ErrorSchema, 403: ErrorSchema}, auth=auth_required)
+def get_audit_metrics(request):
+    """
+    Returns the audit writer's buffer depth and flush counters for this worker process.
+    Restricted to staff users.
+    """
+    user, error = _staff_user(request)
+    if error:
+        return error
+
+    return {"writer": get_audit_writer().stats(), "dictionary": get_audit_dictionary().stats()}
+
+
+@router.get("/logs", response={200: AuditLogPage, 400: ErrorSchema, 401: ErrorSchema, 403: ErrorSchema}, auth=auth_required)
+def list_audit_logs(
+    request,
+    user_id: Optional[UUID] = None,
+    action: Optional[str] = None,
+    resource: Optional[str] = None,
+    status_code: Optional[int] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+):
+    """
+    Search audit entries, newest first. ``resource`` matches a path prefix.
+    Without ``since`` only the last 24 hours (QUERY_DEFAULT_WINDOW_HOURS) are searched.
+    Pass the returned ``next_cursor`` back as ``cursor`` for the next page.
+    Restricted to staff users.
+    """
+    user, error = _staff_user(request)
+    if error:
+        return error
+    filters = AuditFilters(user_id, action, resource, status_code, since, until)
+    try:
+        items, next_cursor = search(filters, cursor, limit)
+    except InvalidCursor as e:
+        return 400, ErrorSchema(detail=str(e))
+    return {"items": items, "next_cursor": next_cursor}
+
+
+@router.get("/logs/export", response={401: ErrorSchema, 403: ErrorSchema}, auth=auth_required)
+def export_audit_logs(
+    request,
+    user_id: Optional[UUID] = None,
+    action: Optional[str] = None,
+    resource: Optional[str] = None,
+    status_code: Optional[int] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+):
+    """
+    Stream matching audit entries as NDJSON (one JSON object per line), newest
+    first, up to EXPORT_MAX_ROWS rows. Restricted to staff users.
+    """
+    user, error = _staff_user(request)
+    if error:
+        return error
+    filters = AuditFilters(user_id, action, resource, status_code, since, until)
+    lines = (AuditLogOut.from_orm(entry).model_dump_json() + "\n" for entry in export(filters))
+    response = StreamingHttpResponse(lines, content_type="application/x-ndjson")
+    response["Content-Disposition"] = 'attachment; filename="audit-log.ndjson"'
+    return response
+
+
+@router.get("/logs/{log_id}", response={200: AuditLogOut, 401: ErrorSchema, 403: ErrorSchema}, auth=auth_required)
+def get_audit_log(request, log_id: int):
+    """
+    Returns a single audit entry with resource, user agent and request body rehydrated.
+    Restricted to staff users.
+    """
+    user, error = _staff_user(request)
+    if error:
+        return error
+    return get_object_or_404(AuditLog.objects.rehydrated(), id=log_id)
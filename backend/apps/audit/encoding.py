@@ -0,0 +1,183 @@
+"""
+Compact encoding of audit rows.
+
+- Resource paths and user agents are dictionary-encoded into ``AuditPath`` and
+  ``AuditUserAgent``. ``AuditDictionary`` resolves a whole batch with at most
+  one lookup and one conflict-ignoring insert per table, and keeps the ids
+  in a bounded in-process cache so steady-state batches need no lookups.
+- Request bodies are parsed (JSON or form-encoded), sensitive keys are
+  redacted, and the result is stored as zlib-compressed JSON. Other bodies
+  (multipart uploads, binary) are recorded only by type and length.
+"""
+import hashlib
+import json
+import logging
+import re
+import threading
+import zlib
+from typing import Any, Dict, Iterable, List, Optional
+from urllib.parse import parse_qsl
+
+from django.conf import settings
+
+from .models import AuditLog, AuditPath, AuditUserAgent
+
+logger = logging.getLogger(__name__)
+
+REDACTED = '[REDACTED]'
+SENSITIVE_KEY_RE = re.compile(
+    # Sensitive anywhere in a key: "client_secret", "accessToken", "X-API-Key".
+    r'(?i:passw(?:or)?d|passphrase|secret|token|authori[sz]ation|api[_-]?key|credential|cookie)'
+    # Only as a whole word of the key ("pass", "user_pass", "newPass"), so "passport",
+    # "compass" and "passenger" are kept.
+    r'|(?<![A-Za-z])(?:pass|Pass|PASS|pwd|Pwd|PWD)(?![A-Za-z])|(?<=[a-z])(?:Pass|Pwd)(?![a-z])'
+)
+DEFAULT_MAX_PAYLOAD_BYTES = 8192
+DEFAULT_DICTIONARY_CACHE_SIZE = 10000
+USER_AGENT_MAX_LENGTH = 500
+
+
+# --- Request bodies ---
+
+def redact(value: Any) -> Any:
+    """Replace the values of sensitive keys, recursively."""
+    if isinstance(value, dict):
+        return {
+            key: REDACTED if isinstance(key, str) and SENSITIVE_KEY_RE.search(key) else redact(item)
+            for key, item in value.items()
+        }
+    if isinstance(value, list):
+        return [redact(item) for item in value]
+    return value
+
+
+def parse_body(body: str) -> Any:
+    """Parse a request body as JSON or form data; other bodies are summarised."""
+    if not body:
+        return None
+    try:
+        return json.loads(body)
+    except ValueError:
+        pass
+    if '=' in body and '\n' not in body:
+        pairs = parse_qsl(body, keep_blank_values=True)
+        if pairs:
+            return dict(pairs)
+    return {'_omitted': 'unparsed body', '_length': len(body)}
+
+
+def encode_payload(body: Optional[str], max_bytes: Optional[int] = None) -> Optional[bytes]:
+    """Redact ``body`` and return it as compressed JSON (``None`` for an empty body)."""
+    data = parse_body(body or '')
+    if data is None:
+        return None
+    if max_bytes is None:
+        max_bytes = getattr(settings, 'AUDIT_LOG', {}).get('MAX_PAYLOAD_BYTES', DEFAULT_MAX_PAYLOAD_BYTES)
+    serialized = json.dumps(redact(data), separators=(',', ':'), default=str)
+    if len(serialized) > max_bytes:
+        serialized = json.dumps({'_truncated': serialized[:max_bytes], '_length': len(serialized)})
+    return zlib.compress(serialized.encode('utf-8'))
+
+
+def decode_payload(payload: Optional[bytes]) -> Any:
+    if not payload:
+        return None
+    try:
+        return json.loads(zlib.decompress(bytes(payload)).decode('utf-8'))
+    except (zlib.error, ValueError) as e:
+        logger.warning(f"Could not decode audit payload: {e}")
+        return None
+
+
+# --- Dictionary tables ---
+
+def user_agent_digest(value: str) -> str:
+    return hashlib.sha1(value.encode('utf-8')).hexdigest()
+
+
+class AuditDictionary:
+    """Resolves resource paths and user agents to dictionary ids, in bulk and with caching."""
+
+    def __init__(self, max_size: int = DEFAULT_DICTIONARY_CACHE_SIZE):
+        self.max_size = max_size
+        self._paths: Dict[str, int] = {}
+        self._agents: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _resolve(self, cache: Dict[str, Any], model, key_field: str, wanted: Dict[str, Dict[str, Any]]) -> Dict[str, int]:
+        with self._lock:
+            found = {key: cache[key] for key in wanted if key in cache}
+            self.hits += len(found)
+            self.misses += len(wanted) - len(found)
+        missing = [key for key in wanted if key not in found]
+        if missing:
+            model.objects.bulk_create([model(**wanted[key]) for key in missing], ignore_conflicts=True)
+            resolved = dict(model.objects.filter(**{f'{key_field}__in': missing}).values_list(key_field, 'id'))
+            found.update(resolved)
+            with self._lock:
+                if len(cache) + len(resolved) > self.max_size:
+                    cache.clear()
+                cache.update(resolved)
+        return found
+
+    def path_ids(self, paths: Iterable[str]) -> Dict[str, int]:
+        wanted = {path: {'path': path} for path in paths if path}
+        return self._resolve(self._paths, AuditPath, 'path', wanted)
+
+    def agent_ids(self, user_agents: Iterable[str]) -> Dict[str, int]:
+        wanted = {user_agent_digest(ua): {'digest': user_agent_digest(ua), 'value': ua} for ua in user_agents if ua}
+        return self._resolve(self._agents, AuditUserAgent, 'digest', wanted)
+
+    def encode(self, entries: List[AuditLog]) -> List[AuditLog]:
+        """Move the pending decoded values on ``entries`` into their compact columns."""
+        pending = [entry for entry in entries if entry.__dict__.keys() & {
+            '_pending_resource', '_pending_user_agent', '_pending_request_data'}]
+        if not pending:
+            return entries
+
+        paths = self.path_ids({entry.__dict__.get('_pending_resource') for entry in pending} - {None})
+        agents = self.agent_ids({
+            entry.__dict__['_pending_user_agent'][:USER_AGENT_MAX_LENGTH]
+            for entry in pending if entry.__dict__.get('_pending_user_agent')
+        })
+        for entry in pending:
+            resource = entry.__dict__.pop('_pending_resource', None)
+            if resource:
+                entry.path_id = paths.get(resource)
+            user_agent = entry.__dict__.pop('_pending_user_agent', None)
+            if user_agent:
+                entry.agent_id = agents.get(user_agent_digest(user_agent[:USER_AGENT_MAX_LENGTH]))
+            if '_pending_request_data' in entry.__dict__:
+                entry.payload = encode_payload(entry.__dict__.pop('_pending_request_data'))
+        return entries
+
+    def clear(self) -> None:
+        with self._lock:
+            self._paths.clear()
+            self._agents.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'paths': len(self._paths),
+                'user_agents': len(self._agents),
+                'hits': self.hits,
+                'misses': self.misses,
+            }
+
+
+_audit_dictionary: Optional[AuditDictionary] = None
+_audit_dictionary_lock = threading.Lock()
+
+
+def get_audit_dictionary() -> AuditDictionary:
+    """Return the process-wide audit dictionary cache."""
+    global _audit_dictionary
+    if _audit_dictionary is None:
+        with _audit_dictionary_lock:
+            if _audit_dictionary is None:
+                size = getattr(settings, 'AUDIT_LOG', {}).get('DICTIONARY_CACHE_SIZE', DEFAULT_DICTIONARY_CACHE_SIZE)
+                _audit_dictionary = AuditDictionary(max_size=size)
+    return _audit_dictionary
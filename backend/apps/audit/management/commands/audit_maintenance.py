@@ -0,0 +1,64 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.audit.models import AuditDailyRollup
+from apps.audit.partitions import (
+    RETENTION_DETACH, RETENTION_DROP, add_months, apply_retention, drain_default_partition, ensure_partitions,
+    expired_partitions,
+)
+from apps.audit.rollups import days_between, rollup_missing, rollup_range
+
+# Run daily, e.g. from cron:
+# python manage.py audit_maintenance [--months-ahead 3] [--retain-months 24] [--retention-action drop]
+class Command(BaseCommand):
+    help = 'Create upcoming audit partitions, roll up daily audit counts and apply the retention policy'
+
+    def add_arguments(self, parser):
+        config = getattr(settings, 'AUDIT_LOG', {})
+        parser.add_argument(
+            '--months-ahead', type=int, default=config.get('PARTITION_MONTHS_AHEAD', 3),
+            help='Number of future monthly partitions to keep ready',
+        )
+        parser.add_argument(
+            '--retain-months', type=int, default=config.get('RETENTION_MONTHS', 0),
+            help='Remove partitions older than this many months (0 keeps everything)',
+        )
+        parser.add_argument(
+            '--retention-action', choices=[RETENTION_DETACH, RETENTION_DROP],
+            default=config.get('RETENTION_ACTION', RETENTION_DETACH),
+        )
+        parser.add_argument(
+            '--rollup-days', type=int, default=7,
+            help='Roll up any of the last N days that have no rollup yet',
+        )
+
+    def handle(self, *args, **options):
+        # First, so the months those rows belong to get partitions and fall under retention.
+        for name, count in drain_default_partition().items():
+            self.stdout.write(f'Moved {count} row(s) from the default partition into {name}')
+
+        created = ensure_partitions(options['months_ahead'])
+        for name in created:
+            self.stdout.write(f'Created partition {name}')
+
+        buckets = rollup_missing(lookback_days=options['rollup_days'])
+        self.stdout.write(f'Wrote {buckets} rollup bucket(s) for the last {options["rollup_days"]} day(s)')
+
+        expired = expired_partitions(options['retain_months'])
+        if expired:
+            # Make sure every day in a partition is rolled up before the raw rows go.
+            first, last = expired[0][1], add_months(expired[-1][1], 1) - timedelta(days=1)
+            done = set(
+                AuditDailyRollup.objects.filter(date__gte=first, date__lte=last)
+                .values_list('date', flat=True).distinct()
+            )
+            rollup_range(day for day in days_between(first, last) if day not in done)
+
+            removed = apply_retention(options['retain_months'], options['retention_action'])
+            verb = 'Dropped' if options['retention_action'] == RETENTION_DROP else 'Detached'
+            for name in removed:
+                self.stdout.write(f'{verb} partition {name}')
+
+        self.stdout.write(self.style.SUCCESS('Audit maintenance complete.'))
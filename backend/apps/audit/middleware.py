@@ -1,7 +1,9 @@
 import json
 from django.utils.deprecation import MiddlewareMixin
 from django.contrib.auth.models import AnonymousUser
+from django.utils import timezone
 from .models import AuditLog
+from .writer import get_audit_writer
 
 class AuditTrailMiddleware(MiddlewareMixin):
     def process_response(self, request, response):
@@ -11,15 +13,17 @@ class AuditTrailMiddleware(MiddlewareMixin):
             
             if not isinstance(request.user, AnonymousUser):
                 try:
-                    AuditLog.objects.create(
+                    get_audit_writer().write(AuditLog(
                         user=request.user,
                         action=request.method,
-                        resource=request.path,
+                        resource=self.get_resource(request),
+                        resource_id=self.get_resource_id(request),
                         ip_address=self.get_client_ip(request),
                         user_agent=request.META.get('HTTP_USER_AGENT', '')[:500],
                         status_code=response.status_code,
                         request_data=self.get_request_data(request),
-                    )
+                        timestamp=timezone.now(),
+                    ))
                 except Exception:
                     # Don't let audit logging break the request
                     pass
@@ -32,12 +36,29 @@ class AuditTrailMiddleware(MiddlewareMixin):
             return x_forwarded_for.split(',')[0].strip()
         return request.META.get('REMOTE_ADDR')
     
+    def get_resource(self, request):
+        # Record the route template (e.g. /api/v1/clients/<uuid:client_id>) rather than
+        # the concrete path, so the path dictionary stays small; the id goes to resource_id.
+        match = getattr(request, 'resolver_match', None)
+        if match is not None and match.route:
+            return ('/' + match.route)[:200]
+        return request.path[:200]
+
+    def get_resource_id(self, request):
+        match = getattr(request, 'resolver_match', None)
+        if match is None or not match.kwargs:
+            return ''
+        # The last captured parameter identifies the most specific resource.
+        return str(list(match.kwargs.values())[-1])[:100]
+
     def get_request_data(self, request):
+        # Redaction, size limits and compression are applied by the audit writer.
         try:
+            if request.content_type and request.content_type.startswith('multipart/'):
+                # Uploads are summarised, never stored.
+                return json.dumps({'_omitted': request.content_type, '_length': int(request.META.get('CONTENT_LENGTH') or 0)})
             if hasattr(request, 'body') and request.body:
-                # Limit size and sanitize sensitive data
-                data = request.body.decode('utf-8')[:1000]
-                return data
+                return request.body.decode('utf-8', errors='replace')
         except Exception:
             pass
         return ""
@@ -0,0 +1,123 @@
+# Generated by Django 5.0.14 on 2026-10-16 22:38
+
+import django.db.models.deletion
+import django.utils.timezone
+from datetime import datetime, timezone
+from django.conf import settings
+from django.db import migrations, models
+
+# On PostgreSQL the audit table is range-partitioned by month on "timestamp".
+# A partitioned table's primary key must include the partition key, so the
+# database key is (id, timestamp) while Django keeps treating "id" as the pk.
+CREATE_PARTITIONED_AUDITLOG = """
+CREATE TABLE "audit_auditlog" (
+    "id" bigint GENERATED BY DEFAULT AS IDENTITY,
+    "action" varchar(50) NOT NULL,
+    "resource" varchar(200) NOT NULL,
+    "resource_id" varchar(100) NOT NULL,
+    "ip_address" inet NULL,
+    "user_agent" text NOT NULL,
+    "status_code" integer NOT NULL CHECK ("status_code" >= 0),
+    "request_data" text NOT NULL,
+    "timestamp" timestamp with time zone NOT NULL,
+    "user_id" uuid NOT NULL
+        CONSTRAINT "audit_auditlog_user_id_fk_users_user_id" REFERENCES "users_user" ("id") DEFERRABLE INITIALLY DEFERRED,
+    CONSTRAINT "audit_auditlog_pkey" PRIMARY KEY ("id", "timestamp")
+) PARTITION BY RANGE ("timestamp");
+CREATE TABLE "audit_auditlog_default" PARTITION OF "audit_auditlog" DEFAULT;
+CREATE INDEX "audit_audit_user_id_e8be02_idx" ON "audit_auditlog" ("user_id", "timestamp");
+CREATE INDEX "audit_audit_action_2a1328_idx" ON "audit_auditlog" ("action", "timestamp");
+CREATE INDEX "audit_audit_resourc_29f1b6_idx" ON "audit_auditlog" ("resource", "timestamp");
+"""
+
+INITIAL_MONTHS_AHEAD = 3
+
+
+def _month_bound(year, month):
+    return datetime(year, month, 1, tzinfo=timezone.utc).isoformat()
+
+
+def create_auditlog_table(apps, schema_editor):
+    AuditLog = apps.get_model('audit', 'AuditLog')
+    if schema_editor.connection.vendor != 'postgresql':
+        schema_editor.create_model(AuditLog)
+        return
+
+    schema_editor.execute(CREATE_PARTITIONED_AUDITLOG)
+    # UTC, like apps.audit.partitions, so both agree on the current month.
+    today = datetime.now(timezone.utc).date()
+    for offset in range(INITIAL_MONTHS_AHEAD + 1):
+        index = today.year * 12 + today.month - 1 + offset
+        year, month = index // 12, index % 12 + 1
+        next_year, next_month = (index + 1) // 12, (index + 1) % 12 + 1
+        schema_editor.execute(
+            f'CREATE TABLE "audit_auditlog_{year:04d}{month:02d}" PARTITION OF "audit_auditlog" '
+            f"FOR VALUES FROM ('{_month_bound(year, month)}') TO ('{_month_bound(next_year, next_month)}')"
+        )
+
+
+def drop_auditlog_table(apps, schema_editor):
+    AuditLog = apps.get_model('audit', 'AuditLog')
+    if schema_editor.connection.vendor != 'postgresql':
+        schema_editor.delete_model(AuditLog)
+        return
+    # Dropping the parent drops every attached partition with it.
+    schema_editor.execute('DROP TABLE "audit_auditlog" CASCADE')
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.CreateModel(
+                    name='AuditLog',
+                    fields=[
+                        ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                        ('action', models.CharField(max_length=50)),
+                        ('resource', models.CharField(max_length=200)),
+                        ('resource_id', models.CharField(blank=True, max_length=100)),
+                        ('ip_address', models.GenericIPAddressField(null=True)),
+                        ('user_agent', models.TextField(blank=True)),
+                        ('status_code', models.PositiveIntegerField()),
+                        ('request_data', models.TextField(blank=True)),
+                        ('timestamp', models.DateTimeField(default=django.utils.timezone.now, editable=False)),
+                        ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='audit_logs', to=settings.AUTH_USER_MODEL)),
+                    ],
+                    options={
+                        'ordering': ['-timestamp'],
+                        'indexes': [
+                            models.Index(fields=['user', 'timestamp'], name='audit_audit_user_id_e8be02_idx'),
+                            models.Index(fields=['action', 'timestamp'], name='audit_audit_action_2a1328_idx'),
+                            models.Index(fields=['resource', 'timestamp'], name='audit_audit_resourc_29f1b6_idx'),
+                        ],
+                    },
+                ),
+            ],
+        ),
+        # Runs after the state operation so the historical AuditLog model is available.
+        migrations.RunPython(create_auditlog_table, drop_auditlog_table),
+        migrations.CreateModel(
+            name='AuditDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('action', models.CharField(max_length=50)),
+                ('resource', models.CharField(max_length=200)),
+                ('status_code', models.PositiveIntegerField()),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('user', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-date'],
+                'indexes': [models.Index(fields=['date', 'action'], name='audit_audit_date_e2ef7d_idx')],
+                'constraints': [models.UniqueConstraint(fields=('date', 'user', 'action', 'resource', 'status_code'), name='audit_rollup_unique_bucket')],
+            },
+        ),
+    ]
@@ -0,0 +1,157 @@
+# Generated by Django 5.0.14 on 2026-10-16 22:42
+
+import hashlib
+import json
+import re
+import zlib
+from urllib.parse import parse_qsl
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+BATCH_SIZE = 2000
+
+# Frozen copy of apps.audit.encoding as of this migration, so later changes to
+# the live module can't change what this migration does.
+REDACTED = '[REDACTED]'
+SENSITIVE_KEY_RE = re.compile(r'pass(word)?|secret|token|authori[sz]ation|api[_-]?key|credential|cookie', re.I)
+MAX_PAYLOAD_BYTES = 8192
+USER_AGENT_MAX_LENGTH = 500
+
+
+def redact(value):
+    if isinstance(value, dict):
+        return {
+            key: REDACTED if isinstance(key, str) and SENSITIVE_KEY_RE.search(key) else redact(item)
+            for key, item in value.items()
+        }
+    if isinstance(value, list):
+        return [redact(item) for item in value]
+    return value
+
+
+def parse_body(body):
+    if not body:
+        return None
+    try:
+        return json.loads(body)
+    except ValueError:
+        pass
+    if '=' in body and '\n' not in body:
+        pairs = parse_qsl(body, keep_blank_values=True)
+        if pairs:
+            return dict(pairs)
+    return {'_omitted': 'unparsed body', '_length': len(body)}
+
+
+def encode_payload(body):
+    data = parse_body(body or '')
+    if data is None:
+        return None
+    serialized = json.dumps(redact(data), separators=(',', ':'), default=str)
+    if len(serialized) > MAX_PAYLOAD_BYTES:
+        serialized = json.dumps({'_truncated': serialized[:MAX_PAYLOAD_BYTES], '_length': len(serialized)})
+    return zlib.compress(serialized.encode('utf-8'))
+
+
+def encode_existing_rows(apps, schema_editor):
+    """Move resource, user_agent and request_data of existing rows into the compact columns."""
+    AuditLog = apps.get_model('audit', 'AuditLog')
+    AuditPath = apps.get_model('audit', 'AuditPath')
+    AuditUserAgent = apps.get_model('audit', 'AuditUserAgent')
+
+    last_id = 0
+    while True:
+        rows = list(
+            AuditLog.objects.filter(id__gt=last_id).order_by('id')
+            .only('id', 'timestamp', 'resource', 'user_agent', 'request_data')[:BATCH_SIZE]
+        )
+        if not rows:
+            break
+        last_id = rows[-1].id
+
+        paths = {row.resource for row in rows if row.resource}
+        AuditPath.objects.bulk_create([AuditPath(path=path) for path in paths], ignore_conflicts=True)
+        path_ids = dict(AuditPath.objects.filter(path__in=paths).values_list('path', 'id'))
+
+        agents = {}
+        for row in rows:
+            if row.user_agent:
+                value = row.user_agent[:USER_AGENT_MAX_LENGTH]
+                agents[hashlib.sha1(value.encode('utf-8')).hexdigest()] = value
+        AuditUserAgent.objects.bulk_create(
+            [AuditUserAgent(digest=digest, value=value) for digest, value in agents.items()],
+            ignore_conflicts=True,
+        )
+        agent_ids = dict(AuditUserAgent.objects.filter(digest__in=agents).values_list('digest', 'id'))
+
+        for row in rows:
+            row.path_id = path_ids.get(row.resource)
+            if row.user_agent:
+                value = row.user_agent[:USER_AGENT_MAX_LENGTH]
+                row.agent_id = agent_ids.get(hashlib.sha1(value.encode('utf-8')).hexdigest())
+            row.payload = encode_payload(row.request_data)
+        AuditLog.objects.bulk_update(rows, ['path', 'agent', 'payload'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('audit', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuditPath',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('path', models.CharField(max_length=200, unique=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='AuditUserAgent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('digest', models.CharField(max_length=40, unique=True)),
+                ('value', models.TextField()),
+            ],
+        ),
+        migrations.AddField(
+            model_name='auditlog',
+            name='payload',
+            field=models.BinaryField(null=True),
+        ),
+        migrations.AddField(
+            model_name='auditlog',
+            name='path',
+            field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='audit.auditpath'),
+        ),
+        migrations.AddField(
+            model_name='auditlog',
+            name='agent',
+            field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='audit.audituseragent'),
+        ),
+        migrations.RunPython(encode_existing_rows, migrations.RunPython.noop),
+        migrations.RemoveIndex(
+            model_name='auditlog',
+            name='audit_audit_resourc_29f1b6_idx',
+        ),
+        migrations.RemoveField(
+            model_name='auditlog',
+            name='request_data',
+        ),
+        migrations.RemoveField(
+            model_name='auditlog',
+            name='resource',
+        ),
+        migrations.RemoveField(
+            model_name='auditlog',
+            name='user_agent',
+        ),
+        migrations.AddIndex(
+            model_name='auditlog',
+            index=models.Index(fields=['path', 'timestamp'], name='audit_audit_path_id_03e480_idx'),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.0.14 on 2026-10-16 22:44
+
+import django.contrib.postgres.indexes
+from django.conf import settings
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('audit', '0002_compact_audit_storage'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='auditlog',
+            index=django.contrib.postgres.indexes.BrinIndex(fields=['timestamp'], name='audit_audit_timesta_347dbe_brin'),
+        ),
+    ]
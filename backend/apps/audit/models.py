@@ -1,26 +1,132 @@
+from django.contrib.postgres.indexes import BrinIndex
 from django.db import models
 from django.conf import settings
+from django.utils import timezone
 from apps.common.models import TimeStampedModel
 
+class AuditPath(models.Model):
+    """Dictionary of audited resource paths (route templates such as ``/api/v1/clients/<uuid:client_id>``)."""
+    path = models.CharField(max_length=200, unique=True)
+
+    def __str__(self):
+        return self.path
+
+
+class AuditUserAgent(models.Model):
+    """Dictionary of user agent strings, looked up by their SHA-1 digest."""
+    digest = models.CharField(max_length=40, unique=True)
+    value = models.TextField()
+
+    def __str__(self):
+        return self.value
+
+
+class AuditLogQuerySet(models.QuerySet):
+    def rehydrated(self):
+        """Join the dictionary tables so ``resource`` and ``user_agent`` read without extra queries."""
+        return self.select_related('path', 'agent')
+
+
 class AuditLog(models.Model):
-    """Audit trail for user actions."""
+    """
+    Audit trail for user actions.
+
+    On PostgreSQL the table is range-partitioned by month on ``timestamp``
+    (see ``apps/audit/partitions.py``); the database primary key is
+    ``(id, timestamp)``, ``id`` alone is still unique per entry.
+
+    Rows are stored compactly: the resource path and user agent are
+    dictionary-encoded into ``AuditPath`` / ``AuditUserAgent`` and the request
+    body is kept as redacted, zlib-compressed JSON (see ``apps/audit/encoding.py``).
+    The ``resource``, ``user_agent`` and ``request_data`` properties read and
+    write the decoded values; the audit writer encodes pending values on save.
+    """
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='audit_logs')
     action = models.CharField(max_length=50)
-    resource = models.CharField(max_length=200)
+    # Composite indexes below cover lookups by path; no separate single-column index.
+    path = models.ForeignKey(AuditPath, on_delete=models.PROTECT, null=True, related_name='+', db_index=False)
     resource_id = models.CharField(max_length=100, blank=True)
     ip_address = models.GenericIPAddressField(null=True)
-    user_agent = models.TextField(blank=True)
+    agent = models.ForeignKey(AuditUserAgent, on_delete=models.PROTECT, null=True, related_name='+', db_index=False)
     status_code = models.PositiveIntegerField()
-    request_data = models.TextField(blank=True)
-    timestamp = models.DateTimeField(auto_now_add=True)
-    
+    payload = models.BinaryField(null=True, editable=False)
+    # Set when the request is recorded, not when the batched writer flushes it.
+    timestamp = models.DateTimeField(default=timezone.now, editable=False)
+
+    objects = AuditLogQuerySet.as_manager()
+
     class Meta:
         ordering = ['-timestamp']
         indexes = [
             models.Index(fields=['user', 'timestamp']),
             models.Index(fields=['action', 'timestamp']),
-            models.Index(fields=['resource', 'timestamp']),
+            models.Index(fields=['path', 'timestamp']),
+            # Tiny block-range index for time-window scans on the append-only table.
+            BrinIndex(fields=['timestamp']),
         ]
-    
+
+    @property
+    def resource(self) -> str:
+        pending = self.__dict__.get('_pending_resource')
+        if pending is not None:
+            return pending
+        return self.path.path if self.path_id else ''
+
+    @resource.setter
+    def resource(self, value: str):
+        self._pending_resource = value
+
+    @property
+    def user_agent(self) -> str:
+        pending = self.__dict__.get('_pending_user_agent')
+        if pending is not None:
+            return pending
+        return self.agent.value if self.agent_id else ''
+
+    @user_agent.setter
+    def user_agent(self, value: str):
+        self._pending_user_agent = value
+
+    @property
+    def request_data(self):
+        """The redacted request body as decoded JSON (``None`` if no body was recorded)."""
+        from .encoding import decode_payload
+        pending = self.__dict__.get('_pending_request_data')
+        if pending is not None:
+            return pending
+        return decode_payload(self.payload)
+
+    @request_data.setter
+    def request_data(self, value):
+        self._pending_request_data = value
+
     def __str__(self):
         return f"{self.user} - {self.action} - {self.resource} - {self.timestamp}"
+
+
+class AuditDailyRollup(models.Model):
+    """Daily request counts per user, action, resource and status, kept after raw partitions are dropped."""
+    date = models.DateField()
+    # No database constraint: rollups outlive both the raw audit rows and the user.
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.DO_NOTHING, db_constraint=False, related_name='+'
+    )
+    action = models.CharField(max_length=50)
+    resource = models.CharField(max_length=200)
+    status_code = models.PositiveIntegerField()
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ['-date']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['date', 'user', 'action', 'resource', 'status_code'],
+                name='audit_rollup_unique_bucket',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['date', 'action']),
+        ]
+
+    def __str__(self):
+        return f"{self.date} - {self.user_id} - {self.action} - {self.resource} - {self.status_code}: {self.count}"
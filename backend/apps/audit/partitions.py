@@ -0,0 +1,214 @@
+"""
+Monthly partition maintenance for the ``AuditLog`` table.
+
+On PostgreSQL ``audit_auditlog`` is declared ``PARTITION BY RANGE (timestamp)``
+with one partition per calendar month (``audit_auditlog_YYYYMM``) and a
+``DEFAULT`` partition that catches rows outside every monthly range. Inserts
+and recent-range queries only touch the current month's indexes, and old
+months are removed by detaching or dropping a whole partition instead of a
+``DELETE`` over the table.
+
+Months are UTC calendar months, whatever ``TIME_ZONE`` is, and the daily
+rollups (``rollups.py``) use UTC days, so every rolled-up day lies inside one
+partition.
+
+Partitions are created ahead of time by the audit writer (at most once per
+``PARTITION_CHECK_INTERVAL``) and by the ``audit_maintenance`` command. Rows
+that still land in the ``DEFAULT`` partition (written before their month's
+partition existed) are moved into monthly partitions by
+``drain_default_partition``. Otherwise they would block creating that month's
+partition and escape retention.
+
+On other database backends the table is not partitioned and these helpers
+do nothing.
+"""
+import logging
+import re
+from datetime import date, datetime, timezone as dt_timezone
+from typing import Dict, List, Optional, Tuple
+
+from django.db import connection, transaction
+
+from .models import AuditLog
+
+logger = logging.getLogger(__name__)
+
+PARENT_TABLE = AuditLog._meta.db_table
+DEFAULT_PARTITION = f'{PARENT_TABLE}_default'
+PARTITION_NAME_RE = re.compile(rf'^{PARENT_TABLE}_(\d{{4}})(\d{{2}})$')
+
+RETENTION_DETACH = 'detach'
+RETENTION_DROP = 'drop'
+
+
+def utc_today() -> date:
+    return datetime.now(dt_timezone.utc).date()
+
+
+def month_start(day: date) -> date:
+    return date(day.year, day.month, 1)
+
+
+def add_months(day: date, months: int) -> date:
+    index = day.year * 12 + (day.month - 1) + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f'{PARENT_TABLE}_{month.year:04d}{month.month:02d}'
+
+
+def _bound(month: date) -> str:
+    return datetime(month.year, month.month, 1, tzinfo=dt_timezone.utc).isoformat()
+
+
+def is_partitioned() -> bool:
+    """True if the audit table is a partitioned PostgreSQL table."""
+    if connection.vendor != 'postgresql':
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM pg_partitioned_table p JOIN pg_class c ON c.oid = p.partrelid WHERE c.relname = %s",
+            [PARENT_TABLE],
+        )
+        return cursor.fetchone() is not None
+
+
+def list_partitions() -> List[Tuple[str, date]]:
+    """Monthly partitions attached to the audit table, oldest first."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT child.relname
+            FROM pg_inherits
+            JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE parent.relname = %s
+            """,
+            [PARENT_TABLE],
+        )
+        names = [row[0] for row in cursor.fetchall()]
+    partitions = []
+    for name in names:
+        match = PARTITION_NAME_RE.match(name)
+        if match:
+            partitions.append((name, date(int(match.group(1)), int(match.group(2)), 1)))
+    return sorted(partitions, key=lambda partition: partition[1])
+
+
+def create_partition(month: date) -> bool:
+    """Create the partition for ``month`` if it doesn't exist. Returns True if it was created."""
+    month = month_start(month)
+    name = partition_name(month)
+    qn = connection.ops.quote_name
+    if _table_exists(name):
+        return False
+    with connection.cursor() as cursor:
+        # Bounds are generated from dates, never user input; DDL can't take bind parameters.
+        cursor.execute(
+            f"CREATE TABLE {qn(name)} PARTITION OF {qn(PARENT_TABLE)} "
+            f"FOR VALUES FROM ('{_bound(month)}') TO ('{_bound(add_months(month, 1))}')"
+        )
+    logger.info(f"Created audit partition {name}")
+    return True
+
+
+def ensure_partitions(months_ahead: int = 3, today: Optional[date] = None) -> List[str]:
+    """Make sure partitions exist for the current month and the next ``months_ahead`` months."""
+    if not is_partitioned():
+        return []
+    current = month_start(today or utc_today())
+    created = []
+    for offset in range(months_ahead + 1):
+        month = add_months(current, offset)
+        try:
+            with transaction.atomic():
+                if create_partition(month):
+                    created.append(partition_name(month))
+        except Exception as e:
+            # Usually rows for this month already landed in the default partition.
+            logger.error(f"Could not create audit partition {partition_name(month)}: {e}")
+    return created
+
+
+def default_partition_months() -> List[date]:
+    """UTC months that have rows in the ``DEFAULT`` partition, oldest first."""
+    qn = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT DISTINCT date_trunc('month', {qn('timestamp')} AT TIME ZONE 'UTC')::date "
+            f"FROM {qn(DEFAULT_PARTITION)}"
+        )
+        return sorted(row[0] for row in cursor.fetchall())
+
+
+def drain_default_partition() -> Dict[str, int]:
+    """
+    Move every row in the ``DEFAULT`` partition into its monthly partition,
+    creating the partition first. A month's partition can't be created while
+    the default partition holds rows for it, so the rows are parked in a
+    temporary table for the duration of one transaction per month. Returns the
+    number of rows moved per partition.
+    """
+    if not is_partitioned():
+        return {}
+    qn = connection.ops.quote_name
+    columns = ', '.join(qn(field.column) for field in AuditLog._meta.concrete_fields)
+    moved = {}
+    for month in default_partition_months():
+        name = partition_name(month)
+        if _table_exists(name):
+            # An attached partition would hold these rows, so this is a detached (archived) one.
+            logger.error(f"Cannot move default-partition rows into {name}: a detached table has that name")
+            continue
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(f"CREATE TEMPORARY TABLE audit_default_rows (LIKE {qn(PARENT_TABLE)})")
+            cursor.execute(
+                f"WITH moved AS (DELETE FROM {qn(DEFAULT_PARTITION)} WHERE {qn('timestamp')} >= %s "
+                f"AND {qn('timestamp')} < %s RETURNING {columns}) "
+                f"INSERT INTO audit_default_rows ({columns}) SELECT {columns} FROM moved",
+                [_bound(month), _bound(add_months(month, 1))],
+            )
+            count = cursor.rowcount
+            create_partition(month)
+            cursor.execute(
+                f"INSERT INTO {qn(PARENT_TABLE)} ({columns}) SELECT {columns} FROM audit_default_rows"
+            )
+            cursor.execute("DROP TABLE audit_default_rows")
+        moved[name] = count
+        logger.info(f"Moved {count} audit rows from the default partition into {name}")
+    return moved
+
+
+def _table_exists(name: str) -> bool:
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT to_regclass(%s)", [name])
+        return cursor.fetchone()[0] is not None
+
+
+def expired_partitions(retain_months: int, today: Optional[date] = None) -> List[Tuple[str, date]]:
+    """Monthly partitions that end before the retention window of ``retain_months`` months."""
+    if retain_months <= 0 or not is_partitioned():
+        return []
+    cutoff = add_months(month_start(today or utc_today()), -retain_months)
+    return [(name, month) for name, month in list_partitions() if month < cutoff]
+
+
+def apply_retention(retain_months: int, action: str = RETENTION_DETACH,
+                    today: Optional[date] = None) -> List[str]:
+    """
+    Detach (or drop) monthly partitions entirely older than ``retain_months``
+    months. Detached partitions remain as standalone tables for archiving.
+    """
+    if action not in (RETENTION_DETACH, RETENTION_DROP):
+        raise ValueError(f"Unknown retention action: {action}")
+    qn = connection.ops.quote_name
+    removed = []
+    for name, month in expired_partitions(retain_months, today):
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(f"ALTER TABLE {qn(PARENT_TABLE)} DETACH PARTITION {qn(name)}")
+            if action == RETENTION_DROP:
+                cursor.execute(f"DROP TABLE {qn(name)}")
+        removed.append(name)
+        logger.info(f"Audit retention: {action} partition {name}")
+    return removed
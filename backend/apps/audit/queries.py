@@ -0,0 +1,121 @@
+"""
+Audit log search with keyset pagination.
+
+Results are ordered by ``(timestamp, id)`` descending and paged with an
+opaque cursor holding the last row's ``(timestamp, id)``. The next page is the
+row comparison ``(timestamp, id) < (cursor)``, so every page is an index range
+scan starting at the cursor no matter how deep the caller pages. A query always has a
+time window (``AUDIT_LOG['QUERY_DEFAULT_WINDOW_HOURS']`` when ``since`` is not
+given), which lets PostgreSQL prune to the matching monthly partitions.
+"""
+import base64
+import binascii
+from dataclasses import dataclass, replace
+from datetime import datetime, timedelta
+from typing import Iterator, List, Optional, Tuple
+from uuid import UUID
+
+from django.conf import settings
+from django.db.models import F, QuerySet, Value
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from apps.common.pagination import RowComparison
+
+from .models import AuditLog, AuditPath
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+DEFAULT_WINDOW_HOURS = 24
+EXPORT_BATCH_SIZE = MAX_PAGE_SIZE
+DEFAULT_EXPORT_MAX_ROWS = 100000
+
+
+class InvalidCursor(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+
+def encode_cursor(timestamp: datetime, pk: int) -> str:
+    raw = f"{timestamp.isoformat()}|{pk}".encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode('utf-8')
+        timestamp, pk = raw.rsplit('|', 1)
+        parsed = parse_datetime(timestamp)
+        if parsed is None:
+            raise ValueError(timestamp)
+        return parsed, int(pk)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise InvalidCursor(f"Invalid cursor: {cursor}") from e
+
+
+@dataclass
+class AuditFilters:
+    user_id: Optional[UUID] = None
+    action: Optional[str] = None
+    resource_prefix: Optional[str] = None
+    status_code: Optional[int] = None
+    since: Optional[datetime] = None
+    until: Optional[datetime] = None
+
+    def window(self) -> Tuple[datetime, datetime]:
+        until = self.until or timezone.now()
+        hours = getattr(settings, 'AUDIT_LOG', {}).get('QUERY_DEFAULT_WINDOW_HOURS', DEFAULT_WINDOW_HOURS)
+        since = self.since or until - timedelta(hours=hours)
+        return since, until
+
+    def apply(self, queryset: QuerySet) -> QuerySet:
+        since, until = self.window()
+        queryset = queryset.filter(timestamp__gte=since, timestamp__lt=until)
+        if self.user_id:
+            queryset = queryset.filter(user_id=self.user_id)
+        if self.action:
+            queryset = queryset.filter(action=self.action.upper())
+        if self.status_code:
+            queryset = queryset.filter(status_code=self.status_code)
+        if self.resource_prefix:
+            # Match against the small path dictionary first, then filter by id.
+            path_ids = AuditPath.objects.filter(path__startswith=self.resource_prefix).values('id')
+            queryset = queryset.filter(path_id__in=path_ids)
+        return queryset
+
+
+def search(filters: AuditFilters, cursor: Optional[str] = None,
+           limit: int = DEFAULT_PAGE_SIZE) -> Tuple[List[AuditLog], Optional[str]]:
+    """Return one page of matching entries, newest first, and the cursor for the next page."""
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    queryset = filters.apply(AuditLog.objects.rehydrated()).order_by('-timestamp', '-id')
+    if cursor:
+        timestamp, pk = decode_cursor(cursor)
+        queryset = queryset.filter(RowComparison(
+            [F('timestamp'), F('id')],
+            [Value(timestamp, output_field=AuditLog._meta.get_field('timestamp')), Value(pk, output_field=AuditLog._meta.get_field('id'))],
+            descending=True,
+        ))
+
+    rows = list(queryset[:limit + 1])
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].timestamp, rows[-1].id)
+    return rows, next_cursor
+
+
+def export(filters: AuditFilters, max_rows: Optional[int] = None) -> Iterator[AuditLog]:
+    """Yield every matching entry, newest first, fetching keyset pages of ``EXPORT_BATCH_SIZE``."""
+    if max_rows is None:
+        max_rows = getattr(settings, 'AUDIT_LOG', {}).get('EXPORT_MAX_ROWS', DEFAULT_EXPORT_MAX_ROWS)
+    if filters.until is None:
+        # Pin the window so it doesn't slide while the export is paging.
+        filters = replace(filters, until=timezone.now())
+    cursor = None
+    produced = 0
+    while produced < max_rows:
+        rows, cursor = search(filters, cursor, limit=min(EXPORT_BATCH_SIZE, max_rows - produced))
+        yield from rows
+        produced += len(rows)
+        if cursor is None:
+            return
@@ -0,0 +1,65 @@
+"""
+Daily audit rollups for the compliance dashboard.
+
+``rollup_day`` counts one day's audit entries per user, action, resource and
+status code into ``AuditDailyRollup``. Days are UTC days, matching the UTC
+monthly partitions, so the aggregate only scans that day's range within a
+single partition on PostgreSQL. It replaces any existing rows for the day, so
+it can be re-run safely.
+"""
+import logging
+from datetime import date, datetime, time, timedelta, timezone as dt_timezone
+from typing import Iterable, Optional
+
+from django.db import transaction
+from django.db.models import Count, F, Value
+from django.db.models.functions import Coalesce
+
+from .models import AuditDailyRollup, AuditLog
+from .partitions import utc_today
+
+logger = logging.getLogger(__name__)
+
+
+def day_bounds(day: date):
+    start = datetime.combine(day, time.min, tzinfo=dt_timezone.utc)
+    return start, start + timedelta(days=1)
+
+
+def rollup_day(day: date) -> int:
+    """Recompute the rollup rows for ``day``. Returns the number of buckets written."""
+    start, end = day_bounds(day)
+    buckets = (
+        AuditLog.objects.filter(timestamp__gte=start, timestamp__lt=end)
+        .order_by()
+        .values('user_id', 'action', 'status_code', resource=Coalesce(F('path__path'), Value('')))
+        .annotate(count=Count('id'))
+    )
+    rows = [AuditDailyRollup(date=day, **bucket) for bucket in buckets]
+    with transaction.atomic():
+        AuditDailyRollup.objects.filter(date=day).delete()
+        AuditDailyRollup.objects.bulk_create(rows, batch_size=1000)
+    logger.info(f"Rolled up {len(rows)} audit buckets for {day}")
+    return len(rows)
+
+
+def rollup_range(days: Iterable[date]) -> int:
+    return sum(rollup_day(day) for day in days)
+
+
+def days_between(first: date, last: date):
+    day = first
+    while day <= last:
+        yield day
+        day += timedelta(days=1)
+
+
+def rollup_missing(until: Optional[date] = None, lookback_days: int = 7) -> int:
+    """Roll up each of the ``lookback_days`` days before ``until`` (default today, UTC) that has no rollup yet."""
+    until = until or utc_today()
+    first = until - timedelta(days=lookback_days)
+    done = set(
+        AuditDailyRollup.objects.filter(date__gte=first, date__lt=until)
+        .values_list('date', flat=True).distinct()
+    )
+    return rollup_range(day for day in days_between(first, until - timedelta(days=1)) if day not in done)
@@ -0,0 +1,24 @@
+from datetime import datetime
+from typing import Any, List, Optional
+from uuid import UUID
+
+from ninja import Schema
+
+
+class AuditLogOut(Schema):
+    """An audit entry with its dictionary-encoded columns and payload decoded."""
+    id: int
+    user_id: UUID
+    action: str
+    resource: str
+    resource_id: str = ""
+    ip_address: Optional[str] = None
+    user_agent: str = ""
+    status_code: int
+    request_data: Optional[Any] = None
+    timestamp: datetime
+
+
+class AuditLogPage(Schema):
+    items: List[AuditLogOut]
+    next_cursor: Optional[str] = None
@@ -0,0 +1,87 @@
+import json
+import zlib
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase
+
+from apps.audit.encoding import (
+    REDACTED, USER_AGENT_MAX_LENGTH, AuditDictionary, decode_payload, encode_payload, parse_body, redact,
+)
+from apps.audit.models import AuditLog, AuditPath, AuditUserAgent
+
+User = get_user_model()
+
+
+class PayloadEncodingTest(SimpleTestCase):
+    def test_redacts_sensitive_keys_recursively(self):
+        data = {
+            "password": "a", "newPassword": "b", "user_pass": "c", "client_secret": "d", "accessToken": "e",
+            "X-API-Key": "f", "Authorization": "g", "nested": [{"refresh_token": "h", "name": "Aroha"}],
+        }
+        self.assertEqual(redact(data), {
+            "password": REDACTED, "newPassword": REDACTED, "user_pass": REDACTED, "client_secret": REDACTED,
+            "accessToken": REDACTED, "X-API-Key": REDACTED, "Authorization": REDACTED,
+            "nested": [{"refresh_token": REDACTED, "name": "Aroha"}],
+        })
+
+    def test_keeps_keys_that_only_contain_pass(self):
+        data = {"passport": "LA123", "passport_number": "LA123", "compass": "N", "passenger_count": 2, "bypass": False}
+        self.assertEqual(redact(data), data)
+
+    def test_parses_json_and_form_bodies(self):
+        self.assertEqual(parse_body('{"a": 1}'), {"a": 1})
+        self.assertEqual(parse_body("a=1&b="), {"a": "1", "b": ""})
+        self.assertEqual(parse_body("--boundary\nbinary"), {"_omitted": "unparsed body", "_length": 17})
+        self.assertIsNone(parse_body(""))
+
+    def test_round_trip(self):
+        payload = encode_payload('{"first_name": "Aroha", "password": "hunter2"}')
+        self.assertEqual(json.loads(zlib.decompress(payload)), {"first_name": "Aroha", "password": REDACTED})
+        self.assertEqual(decode_payload(payload), {"first_name": "Aroha", "password": REDACTED})
+        self.assertIsNone(encode_payload(None))
+        self.assertIsNone(decode_payload(None))
+        with self.assertLogs("apps.audit.encoding", "WARNING"):
+            self.assertIsNone(decode_payload(b"not zlib"))
+
+    def test_truncates_large_payloads(self):
+        body = json.dumps({"notes": "x" * 100})
+        decoded = decode_payload(encode_payload(body, max_bytes=50))
+        self.assertEqual(len(decoded["_truncated"]), 50)
+        self.assertEqual(decoded["_length"], len(json.dumps(json.loads(body), separators=(",", ":"))))
+
+
+class AuditDictionaryTest(TestCase):
+    def setUp(self):
+        self.dictionary = AuditDictionary(max_size=3)
+
+    def test_resolves_in_bulk_and_caches(self):
+        with self.assertNumQueries(2):
+            ids = self.dictionary.path_ids(["/a/", "/b/"])
+        self.assertEqual(ids, dict(AuditPath.objects.values_list("path", "id")))
+        with self.assertNumQueries(0):
+            self.assertEqual(self.dictionary.path_ids(["/a/", "/b/"]), ids)
+        # Rows another process inserted are found rather than duplicated.
+        other = AuditDictionary()
+        self.assertEqual(other.path_ids(["/a/"]), {"/a/": ids["/a/"]})
+        self.assertEqual(AuditPath.objects.count(), 2)
+        self.assertEqual(self.dictionary.stats(), {"paths": 2, "user_agents": 0, "hits": 2, "misses": 2})
+
+    def test_cache_is_bounded(self):
+        self.dictionary.path_ids(["/a/", "/b/"])
+        self.dictionary.path_ids(["/c/", "/d/"])
+        self.assertEqual(self.dictionary.stats()["paths"], 2)
+
+    def test_encode_moves_pending_values(self):
+        user = User.objects.create_user(username="aroha", email="aroha@example.org")
+        long_agent = "Mozilla/5.0 " + "x" * USER_AGENT_MAX_LENGTH
+        entries = [
+            AuditLog(user=user, action="POST", resource="/api/v1/clients/", user_agent=long_agent,
+                     request_data='{"token": "abc"}', status_code=201),
+            AuditLog(user=user, action="GET", resource="/api/v1/clients/", user_agent=long_agent, status_code=200),
+        ]
+        self.dictionary.encode(entries)
+        self.assertEqual(entries[0].path_id, entries[1].path_id)
+        self.assertEqual(entries[0].agent_id, entries[1].agent_id)
+        self.assertEqual(AuditUserAgent.objects.get().value, long_agent[:USER_AGENT_MAX_LENGTH])
+        self.assertEqual(decode_payload(entries[0].payload), {"token": REDACTED})
+        self.assertIsNone(entries[1].payload)
@@ -0,0 +1,96 @@
+import json
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from ninja.testing import TestClient
+
+from apps.audit.api import router
+from apps.audit.encoding import get_audit_dictionary
+from apps.audit.models import AuditLog
+from apps.audit.queries import AuditFilters, encode_cursor, export, search
+
+User = get_user_model()
+
+
+class AuditSearchTest(TestCase):
+    def setUp(self):
+        self.client = TestClient(router)
+        get_audit_dictionary().clear()
+        self.staff = User.objects.create_user(username="kaitiaki", email="kaitiaki@example.org", is_staff=True)
+        self.now = timezone.now().replace(microsecond=0)
+
+    def log(self, count=1, hours_ago=1, action="GET", resource="/api/v1/clients/"):
+        entries = [
+            AuditLog(user=self.staff, action=action, resource=resource, status_code=200,
+                     timestamp=self.now - timedelta(hours=hours_ago))
+            for _ in range(count)
+        ]
+        return AuditLog.objects.bulk_create(get_audit_dictionary().encode(entries))
+
+    def page_ids(self, filters, limit):
+        pages, cursor = [], None
+        while True:
+            rows, cursor = search(filters, cursor, limit)
+            pages.append([row.id for row in rows])
+            if cursor is None:
+                return pages
+
+    def test_cursor_pages_through_equal_timestamps(self):
+        self.log(count=5)
+        self.log(hours_ago=2)
+        pages = self.page_ids(AuditFilters(), limit=2)
+        ids = [pk for page in pages for pk in page]
+        self.assertEqual([len(page) for page in pages], [2, 2, 2])
+        expected = list(AuditLog.objects.order_by("-timestamp", "-id").values_list("id", flat=True))
+        self.assertEqual(ids, expected)
+
+    def test_cursor_is_a_row_comparison(self):
+        entry = self.log()[0]
+        with self.assertNumQueries(1) as captured:
+            search(AuditFilters(), encode_cursor(entry.timestamp, entry.id))
+        table = AuditLog._meta.db_table
+        self.assertIn(f'("{table}"."timestamp", "{table}"."id") < (', captured.captured_queries[0]["sql"])
+
+    def test_default_window(self):
+        recent = self.log(hours_ago=1)[0]
+        old = self.log(hours_ago=30)[0]
+        self.assertEqual([row.id for row in search(AuditFilters())[0]], [recent.id])
+        with override_settings(AUDIT_LOG={"QUERY_DEFAULT_WINDOW_HOURS": 48}):
+            self.assertEqual([row.id for row in search(AuditFilters())[0]], [recent.id, old.id])
+        since = self.now - timedelta(hours=31)
+        self.assertEqual([row.id for row in search(AuditFilters(since=since))[0]], [recent.id, old.id])
+
+    def test_filters(self):
+        self.log(action="POST", resource="/api/v1/referrals/")
+        kept = self.log(action="POST", resource="/api/v1/clients/42/")[0]
+        rows, _ = search(AuditFilters(action="post", resource_prefix="/api/v1/clients/"))
+        self.assertEqual([row.id for row in rows], [kept.id])
+        self.assertEqual(rows[0].resource, "/api/v1/clients/42/")
+
+    def test_export_is_capped(self):
+        self.log(count=5)
+        with mock.patch("apps.audit.queries.EXPORT_BATCH_SIZE", 2):
+            self.assertEqual(len(list(export(AuditFilters(), max_rows=3))), 3)
+            self.assertEqual(len(list(export(AuditFilters(), max_rows=10))), 5)
+
+    @override_settings(AUDIT_LOG={"EXPORT_MAX_ROWS": 2})
+    def test_export_endpoint_streams_ndjson(self):
+        self.log(count=3)
+        response = self.client.get("/logs/export", user=self.staff)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        lines = response.content.decode().splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertEqual(json.loads(lines[0])["resource"], "/api/v1/clients/")
+
+    def test_invalid_cursor_is_a_bad_request(self):
+        response = self.client.get("/logs?cursor=not-a-cursor", user=self.staff)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("Invalid cursor", response.json()["detail"])
+
+    def test_staff_only(self):
+        user = User.objects.create_user(username="aroha", email="aroha@example.org")
+        self.assertEqual(self.client.get("/logs", user=user).status_code, 403)
@@ -0,0 +1,34 @@
+from datetime import date, datetime, timezone
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+
+from apps.audit.encoding import get_audit_dictionary
+from apps.audit.models import AuditDailyRollup, AuditLog
+from apps.audit.rollups import rollup_day
+from apps.audit.writer import MODE_SYNC, AuditWriter
+
+User = get_user_model()
+
+
+@override_settings(TIME_ZONE="Pacific/Auckland")
+class AuditRollupTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="aroha", email="aroha@example.org")
+        get_audit_dictionary().clear()
+        writer = AuditWriter(mode=MODE_SYNC)
+        for hour, day in ((23, 1), (0, 2), (1, 2)):
+            writer.write(AuditLog(user=self.user, action="POST", resource="/api/v1/clients/", status_code=201,
+                                  timestamp=datetime(2026, 3, day, hour, 30, tzinfo=timezone.utc)))
+
+    def test_days_are_utc_days_like_the_partitions(self):
+        self.assertEqual(rollup_day(date(2026, 3, 1)), 1)
+        self.assertEqual(AuditDailyRollup.objects.get(date=date(2026, 3, 1)).count, 1)
+        rollup_day(date(2026, 3, 2))
+        self.assertEqual(AuditDailyRollup.objects.get(date=date(2026, 3, 2)).count, 2)
+
+    def test_rerun_replaces_the_day(self):
+        rollup_day(date(2026, 3, 2))
+        rollup_day(date(2026, 3, 2))
+        rollup = AuditDailyRollup.objects.get(date=date(2026, 3, 2))
+        self.assertEqual((rollup.resource, rollup.count), ("/api/v1/clients/", 2))
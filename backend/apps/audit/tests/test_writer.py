@@ -0,0 +1,86 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+
+from apps.audit.encoding import get_audit_dictionary
+from apps.audit.models import AuditLog
+from apps.audit.writer import MODE_ASYNC, MODE_SYNC, AuditWriter
+
+User = get_user_model()
+
+
+class AuditWriterTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="aroha", email="aroha@example.org")
+        # Dictionary ids cached by an earlier test point at rows that were rolled back.
+        get_audit_dictionary().clear()
+
+    def entry(self, action="POST", **kwargs):
+        return AuditLog(user=self.user, action=action, resource="/api/v1/clients/", status_code=201, **kwargs)
+
+    def test_sync_mode_writes_inline(self):
+        writer = AuditWriter(mode=MODE_SYNC)
+        writer.write(self.entry(request_data='{"first_name": "Aroha", "password": "hunter2"}'))
+        log = AuditLog.objects.rehydrated().get()
+        self.assertEqual(log.resource, "/api/v1/clients/")
+        self.assertEqual(log.request_data["first_name"], "Aroha")
+        self.assertNotEqual(log.request_data["password"], "hunter2")
+        self.assertEqual(writer.stats()["inline_writes"], 1)
+        self.assertEqual(writer.stats()["depth"], 0)
+
+    def test_sync_is_the_default_under_debug_and_tests(self):
+        with override_settings(AUDIT_LOG={}, DEBUG=True, TESTING=False):
+            self.assertEqual(AuditWriter.from_settings().mode, MODE_SYNC)
+        with override_settings(AUDIT_LOG={}, DEBUG=False, TESTING=True):
+            self.assertEqual(AuditWriter.from_settings().mode, MODE_SYNC)
+        with override_settings(AUDIT_LOG={}, DEBUG=False, TESTING=False):
+            self.assertEqual(AuditWriter.from_settings().mode, MODE_ASYNC)
+        with override_settings(AUDIT_LOG={"MODE": MODE_ASYNC}, DEBUG=True):
+            self.assertEqual(AuditWriter.from_settings().mode, MODE_ASYNC)
+
+    def test_async_mode_buffers_until_flushed(self):
+        writer = AuditWriter(mode=MODE_ASYNC, batch_size=10)
+        for _ in range(3):
+            writer.write(self.entry())
+        self.assertEqual(AuditLog.objects.count(), 0)
+        self.assertEqual(writer.flush(), 3)
+        self.assertEqual(AuditLog.objects.count(), 3)
+        self.assertEqual(writer.stats()["flushes"], 1)
+
+    def test_failed_batch_is_retried(self):
+        writer = AuditWriter(mode=MODE_ASYNC, retry_delay=0)
+        writer.write(self.entry())
+        writer.write(self.entry())
+        bulk_create = AuditLog.objects.bulk_create
+        calls = []
+
+        def flaky(objs, **kwargs):
+            calls.append(len(objs))
+            if len(calls) == 1:
+                raise Exception("connection lost")
+            return bulk_create(objs, **kwargs)
+
+        with mock.patch.object(AuditLog.objects, "bulk_create", side_effect=flaky):
+            writer.flush()
+        self.assertEqual(calls, [2, 2])
+        self.assertEqual(AuditLog.objects.count(), 2)
+        stats = writer.stats()
+        self.assertEqual((stats["written"], stats["failed"], stats["retries"]), (2, 0, 1))
+
+    def test_entries_are_written_one_by_one_when_the_retry_fails(self):
+        writer = AuditWriter(mode=MODE_ASYNC, retry_delay=0)
+        for action in ("POST", "BAD", "PUT"):
+            writer.write(self.entry(action=action))
+        bulk_create = AuditLog.objects.bulk_create
+
+        def reject_bad(objs, **kwargs):
+            if any(entry.action == "BAD" for entry in objs):
+                raise Exception("value too long")
+            return bulk_create(objs, **kwargs)
+
+        with mock.patch.object(AuditLog.objects, "bulk_create", side_effect=reject_bad):
+            writer.flush()
+        self.assertEqual(sorted(AuditLog.objects.values_list("action", flat=True)), ["POST", "PUT"])
+        stats = writer.stats()
+        self.assertEqual((stats["written"], stats["failed"]), (2, 1))
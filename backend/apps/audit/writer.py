@@ -0,0 +1,303 @@
+"""
+Batched audit log writer.
+
+``AuditTrailMiddleware`` used to run ``AuditLog.objects.create`` inside every
+mutating API request. The writer moves that insert off the request path:
+- requests only enqueue an unsaved ``AuditLog`` into a bounded in-process buffer
+- a background thread writes the buffer with ``bulk_create`` once ``BATCH_SIZE``
+  entries are waiting or ``FLUSH_INTERVAL`` seconds have passed
+- when the buffer is full, ``OVERFLOW_POLICY`` decides what happens:
+  ``inline`` writes the entry synchronously (never loses a record),
+  ``block`` waits up to ``BLOCK_TIMEOUT`` seconds for room and then drops,
+  ``drop`` discards the entry immediately
+- a batch that fails to insert is retried once on a fresh connection, then
+  written entry by entry, so only entries that fail on their own are lost
+- the buffer is flushed when the worker exits
+- ``MODE = 'sync'`` writes every entry inline; it is the default under
+  ``DEBUG`` and in tests, so audit rows exist as soon as the request returns
+- the flusher also creates upcoming monthly partitions (see ``partitions.py``)
+  at most once per ``PARTITION_CHECK_INTERVAL`` seconds
+
+Settings live in ``settings.AUDIT_LOG``; buffer depth and flush latency are
+reported by ``stats()`` and the ``/audit/metrics`` endpoint.
+"""
+import atexit
+import logging
+import queue
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from django.conf import settings
+from django.db import close_old_connections
+
+from .encoding import get_audit_dictionary
+from .models import AuditLog
+from .partitions import ensure_partitions
+
+logger = logging.getLogger(__name__)
+
+MODE_ASYNC = 'async'
+MODE_SYNC = 'sync'
+OVERFLOW_INLINE = 'inline'
+OVERFLOW_BLOCK = 'block'
+OVERFLOW_DROP = 'drop'
+
+DEFAULT_BATCH_SIZE = 100
+DEFAULT_FLUSH_INTERVAL = 1.0
+DEFAULT_QUEUE_SIZE = 10000
+DEFAULT_BLOCK_TIMEOUT = 0.05
+DEFAULT_RETRY_DELAY = 0.5
+DEFAULT_PARTITION_MONTHS_AHEAD = 3
+DEFAULT_PARTITION_CHECK_INTERVAL = 86400
+
+
+class AuditWriter:
+    """Buffers audit entries and writes them in batches from a background thread."""
+
+    def __init__(self, mode: str = MODE_ASYNC, batch_size: int = DEFAULT_BATCH_SIZE,
+                 flush_interval: float = DEFAULT_FLUSH_INTERVAL, queue_size: int = DEFAULT_QUEUE_SIZE,
+                 overflow_policy: str = OVERFLOW_INLINE, block_timeout: float = DEFAULT_BLOCK_TIMEOUT,
+                 retry_delay: float = DEFAULT_RETRY_DELAY,
+                 partition_months_ahead: int = DEFAULT_PARTITION_MONTHS_AHEAD,
+                 partition_check_interval: float = DEFAULT_PARTITION_CHECK_INTERVAL):
+        if mode not in (MODE_ASYNC, MODE_SYNC):
+            raise ValueError(f"Unknown audit writer mode: {mode}")
+        if overflow_policy not in (OVERFLOW_INLINE, OVERFLOW_BLOCK, OVERFLOW_DROP):
+            raise ValueError(f"Unknown audit overflow policy: {overflow_policy}")
+        self.mode = mode
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.overflow_policy = overflow_policy
+        self.block_timeout = block_timeout
+        self.retry_delay = retry_delay
+        self.partition_months_ahead = partition_months_ahead
+        self.partition_check_interval = partition_check_interval
+        self._last_partition_check: Optional[float] = None
+
+        self._queue: 'queue.Queue[AuditLog]' = queue.Queue(maxsize=queue_size)
+        self._flush_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+        self.enqueued = 0
+        self.written = 0
+        self.inline_writes = 0
+        self.dropped = 0
+        self.failed = 0
+        self.retries = 0
+        self.flushes = 0
+        self.max_depth = 0
+        self.last_flush_ms: Optional[float] = None
+        self.total_flush_ms = 0.0
+
+    @classmethod
+    def from_settings(cls) -> 'AuditWriter':
+        config = getattr(settings, 'AUDIT_LOG', {})
+        return cls(
+            mode=config.get('MODE') or default_mode(),
+            batch_size=config.get('BATCH_SIZE', DEFAULT_BATCH_SIZE),
+            flush_interval=config.get('FLUSH_INTERVAL', DEFAULT_FLUSH_INTERVAL),
+            queue_size=config.get('QUEUE_SIZE', DEFAULT_QUEUE_SIZE),
+            overflow_policy=config.get('OVERFLOW_POLICY', OVERFLOW_INLINE),
+            block_timeout=config.get('BLOCK_TIMEOUT', DEFAULT_BLOCK_TIMEOUT),
+            retry_delay=config.get('RETRY_DELAY', DEFAULT_RETRY_DELAY),
+            partition_months_ahead=config.get('PARTITION_MONTHS_AHEAD', DEFAULT_PARTITION_MONTHS_AHEAD),
+            partition_check_interval=config.get('PARTITION_CHECK_INTERVAL', DEFAULT_PARTITION_CHECK_INTERVAL),
+        )
+
+    # --- Request path ---
+
+    def write(self, entry: AuditLog) -> None:
+        """Record ``entry``. In async mode this only enqueues it."""
+        if self.mode == MODE_SYNC:
+            self._write_inline(entry)
+            return
+
+        try:
+            self._queue.put_nowait(entry)
+        except queue.Full:
+            self._overflow(entry)
+            return
+        with self._stats_lock:
+            self.enqueued += 1
+            self.max_depth = max(self.max_depth, self._queue.qsize())
+
+    def _overflow(self, entry: AuditLog) -> None:
+        if self.overflow_policy == OVERFLOW_INLINE:
+            self._write_inline(entry)
+            return
+        if self.overflow_policy == OVERFLOW_BLOCK:
+            try:
+                self._queue.put(entry, timeout=self.block_timeout)
+                with self._stats_lock:
+                    self.enqueued += 1
+                return
+            except queue.Full:
+                pass
+        with self._stats_lock:
+            self.dropped += 1
+        logger.warning(f"Audit buffer full, dropped audit entry for {entry.action} {entry.resource}")
+
+    def _write_inline(self, entry: AuditLog) -> None:
+        try:
+            get_audit_dictionary().encode([entry])
+            entry.save()
+        except Exception as e:
+            with self._stats_lock:
+                self.failed += 1
+            logger.error(f"Failed to write audit entry: {e}")
+            return
+        with self._stats_lock:
+            self.inline_writes += 1
+            self.written += 1
+
+    # --- Flushing ---
+
+    def _drain(self, limit: int) -> List[AuditLog]:
+        batch = []
+        while len(batch) < limit:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _insert(self, batch: List[AuditLog]) -> None:
+        get_audit_dictionary().encode(batch)
+        AuditLog.objects.bulk_create(batch, batch_size=self.batch_size)
+
+    def _insert_each(self, batch: List[AuditLog]) -> int:
+        """Insert entries one at a time so a bad entry doesn't take the batch with it."""
+        written = 0
+        for entry in batch:
+            try:
+                self._insert([entry])
+                written += 1
+            except Exception as e:
+                logger.error(f"Dropped audit entry for {entry.action} by user {entry.user_id}: {e}")
+        return written
+
+    def _write_batch(self, batch: List[AuditLog]) -> None:
+        started = time.monotonic()
+        written = len(batch)
+        try:
+            self._insert(batch)
+        except Exception as e:
+            logger.warning(f"Failed to write {len(batch)} audit entries, retrying: {e}")
+            with self._stats_lock:
+                self.retries += 1
+            # A broken connection is the usual cause; retry on a fresh one.
+            close_old_connections()
+            time.sleep(self.retry_delay)
+            try:
+                self._insert(batch)
+            except Exception as e:
+                logger.error(f"Retry of {len(batch)} audit entries failed, writing them one by one: {e}")
+                written = self._insert_each(batch)
+        failed = len(batch) - written
+        elapsed = round((time.monotonic() - started) * 1000, 2)
+        with self._stats_lock:
+            self.written += written
+            self.failed += failed
+            self.flushes += 1
+            self.last_flush_ms = elapsed
+            self.total_flush_ms += elapsed
+
+    def flush(self) -> int:
+        """Write everything currently buffered. Returns the number of entries taken."""
+        total = 0
+        with self._flush_lock:
+            while True:
+                batch = self._drain(self.batch_size)
+                if not batch:
+                    return total
+                self._write_batch(batch)
+                total += len(batch)
+
+    def _maintain_partitions(self) -> None:
+        now = time.monotonic()
+        if self._last_partition_check is not None and now - self._last_partition_check < self.partition_check_interval:
+            return
+        self._last_partition_check = now
+        try:
+            ensure_partitions(self.partition_months_ahead)
+        except Exception as e:
+            logger.error(f"Audit partition maintenance failed: {e}")
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            deadline = time.monotonic() + self.flush_interval
+            # Wait until a full batch is buffered or the interval elapses.
+            while self._queue.qsize() < self.batch_size and not self._stop.is_set():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._stop.wait(min(remaining, 0.05))
+            if self._queue.qsize():
+                close_old_connections()
+                self._maintain_partitions()
+                self.flush()
+        self.flush()
+
+    # --- Lifecycle ---
+
+    def start(self) -> None:
+        """Start the background flusher (idempotent; no-op in sync mode)."""
+        if self.mode == MODE_SYNC or (self._thread is not None and self._thread.is_alive()):
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='audit-writer', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop the flusher and write whatever is still buffered."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self.flush()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            return {
+                'mode': self.mode,
+                'overflow_policy': self.overflow_policy,
+                'depth': self._queue.qsize(),
+                'capacity': self._queue.maxsize,
+                'max_depth': self.max_depth,
+                'enqueued': self.enqueued,
+                'written': self.written,
+                'inline_writes': self.inline_writes,
+                'dropped': self.dropped,
+                'failed': self.failed,
+                'retries': self.retries,
+                'flushes': self.flushes,
+                'last_flush_ms': self.last_flush_ms,
+                'avg_flush_ms': round(self.total_flush_ms / self.flushes, 2) if self.flushes else None,
+                'running': self._thread is not None and self._thread.is_alive(),
+            }
+
+
+def default_mode() -> str:
+    """Sync under DEBUG and in tests, where entries should be visible at once; async otherwise."""
+    if settings.DEBUG or getattr(settings, 'TESTING', False):
+        return MODE_SYNC
+    return MODE_ASYNC
+
+
+_audit_writer: Optional[AuditWriter] = None
+_audit_writer_lock = threading.Lock()
+
+
+def get_audit_writer() -> AuditWriter:
+    """Return the process-wide audit writer, starting its flusher on first use."""
+    global _audit_writer
+    if _audit_writer is None:
+        with _audit_writer_lock:
+            if _audit_writer is None:
+                writer = AuditWriter.from_settings()
+                writer.start()
+                atexit.register(writer.stop)
+                _audit_writer = writer
+    return _audit_writer
@@ -5,8 +5,18 @@ from ninja import Router, Schema
 from ninja.responses import Response
 from ninja.security import HttpBearer
 from typing import Dict, Any
+from django.http import HttpResponse
+
+from apps.common.http import etag_matches, not_modified, set_validators
+from apps.users.permission_matrix import get_permission_matrix
+from apps.users.profile_snapshot import get_profile_cache, get_profile_snapshot, render_auth_user
 
 from .decorators import auth_required
+from .context import request_stats
+from .graph_groups import get_graph_group_resolver
+from .jwks import get_jwks_manager
+from .principal import get_principal_cache
+from .token_cache import get_token_cache
 
 class ErrorSchema(Schema):
     detail: str
@@ -14,10 +24,11 @@ class ErrorSchema(Schema):
 router = Router()
 
 @router.get("/me", response={200: Dict[str, Any], 401: ErrorSchema, 500: ErrorSchema}, auth=auth_required)
-def get_current_user(request):
+def get_current_user(request, response: HttpResponse):
     """
     Returns the current authenticated user's information and role.
     Requires authentication (via middleware in auth bypass mode or JWT token).
+    Served from the cached profile snapshot; honours If-None-Match.
     """
     # In auth bypass mode, user comes from middleware
     # In normal mode, user comes from JWT authentication
@@ -29,21 +40,34 @@ def get_current_user(request):
     
     # Get user profile and role
     try:
-        profile = user.userprofile
-        role = {
-            "id": profile.role.id if profile.role else None,
-            "name": profile.role.name if profile.role else None,
-            "level": profile.role.level if profile.role else None,
-        } if hasattr(user, 'userprofile') and hasattr(user.userprofile, 'role') else None
-        
-        return {
-            "username": user.username,
-            "email": user.email,
-            "first_name": user.first_name,
-            "last_name": user.last_name,
-            "role": role,
-            "is_staff": user.is_staff,
-            "is_superuser": user.is_superuser,
-        }
+        snapshot = get_profile_snapshot(user)
+        etag = snapshot.etag('auth.me')
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        set_validators(response, etag)
+        return render_auth_user(snapshot)
     except Exception as e:
         return 500, ErrorSchema(detail=f"Error retrieving user profile: {str(e)}")
+
+
+@router.get("/metrics", response={200: Dict[str, Any], 401: ErrorSchema, 403: ErrorSchema}, auth=auth_required)
+def get_auth_metrics(request):
+    """
+    Returns authentication cache counters for this worker process.
+    Restricted to staff users.
+    """
+    user = request.user if hasattr(request, 'user') else request.auth
+    if not user or not getattr(user, 'is_authenticated', False):
+        return 401, ErrorSchema(detail="Authentication required")
+    if not (user.is_staff or user.is_superuser):
+        return 403, ErrorSchema(detail="Staff access required")
+
+    return {
+        "token_cache": get_token_cache().stats(),
+        "principal_cache": get_principal_cache().stats(),
+        "permission_matrix": get_permission_matrix().stats(),
+        "profile_cache": get_profile_cache().stats(),
+        "request_auth": request_stats.stats(),
+        "jwks": get_jwks_manager().stats(),
+        "graph_groups": get_graph_group_resolver().stats(),
+    }
@@ -3,3 +3,8 @@ from django.apps import AppConfig
 class AuthenticationConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.authentication'
+
+    def ready(self):
+        from . import principal, token_cache
+        token_cache.connect_signals()
+        principal.connect_signals()
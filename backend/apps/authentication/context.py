@@ -0,0 +1,115 @@
+"""
+Request-scoped authentication memo.
+
+``JWTAuthenticationMiddleware`` and Ninja routes declared with ``auth=JWTAuth()``
+both authenticate the same bearer token. The first call stores its outcome on
+the request; any later call with the same token reuses it instead of running
+another authentication pass.
+
+The context also counts the authentication passes, memo hits and database
+queries spent on authentication for each request, and keeps process-wide
+totals for the ``/auth/metrics`` endpoint.
+"""
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Optional
+
+from django.db import connection
+
+REQUEST_ATTR = '_auth_context'
+
+
+class AuthContext:
+    """Authentication outcome and cost for a single request."""
+
+    def __init__(self):
+        self.token: Optional[str] = None
+        self.user = None
+        self.error: Optional[Exception] = None
+        self.auth_passes = 0
+        self.memo_hits = 0
+        self.queries = 0
+
+    def recall(self, token: str) -> bool:
+        """Return True if ``token`` has already been authenticated on this request."""
+        if self.token is not None and self.token == token:
+            self.memo_hits += 1
+            return True
+        return False
+
+    def result(self):
+        """Return the memoised user, or re-raise the memoised authentication error."""
+        if self.error is not None:
+            raise self.error
+        return self.user
+
+    def remember(self, token: str, user=None, error: Optional[Exception] = None) -> None:
+        self.token = token
+        self.user = user
+        self.error = error
+
+    def _count_query(self, execute, sql, params, many, context):
+        self.queries += 1
+        return execute(sql, params, many, context)
+
+    @contextmanager
+    def measure(self, authentication_pass: bool = False):
+        """Count the queries executed inside the block against this request's auth cost."""
+        if authentication_pass:
+            self.auth_passes += 1
+        with connection.execute_wrapper(self._count_query):
+            yield self
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            'auth_passes': self.auth_passes,
+            'memo_hits': self.memo_hits,
+            'queries': self.queries,
+        }
+
+
+def get_auth_context(request) -> AuthContext:
+    """Return the authentication context for ``request``, creating it on first use."""
+    context = getattr(request, REQUEST_ATTR, None)
+    if context is None:
+        context = AuthContext()
+        setattr(request, REQUEST_ATTR, context)
+    return context
+
+
+class AuthRequestStats:
+    """Process-wide totals of per-request authentication cost."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        self.requests = 0
+        self.auth_passes = 0
+        self.memo_hits = 0
+        self.queries = 0
+        self.max_passes_per_request = 0
+
+    def record(self, context: AuthContext) -> None:
+        with self._lock:
+            self.requests += 1
+            self.auth_passes += context.auth_passes
+            self.memo_hits += context.memo_hits
+            self.queries += context.queries
+            self.max_passes_per_request = max(self.max_passes_per_request, context.auth_passes)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'requests': self.requests,
+                'auth_passes': self.auth_passes,
+                'memo_hits': self.memo_hits,
+                'queries': self.queries,
+                'avg_passes_per_request': round(self.auth_passes / self.requests, 4) if self.requests else 0.0,
+                'avg_queries_per_request': round(self.queries / self.requests, 4) if self.requests else 0.0,
+                'max_passes_per_request': self.max_passes_per_request,
+            }
+
+
+request_stats = AuthRequestStats()
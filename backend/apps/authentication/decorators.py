@@ -1,8 +1,9 @@
 from functools import wraps
 from ninja.responses import Response
-from django.contrib.auth.models import Group
 import logging
 
+from apps.users.permission_matrix import get_user_permissions
+
 logger = logging.getLogger(__name__)
 
 def auth_required(func):
@@ -43,7 +44,7 @@ def require_role(role_name):
             if not hasattr(request, 'auth') or not request.auth:
                 return Response({"error": "Authentication required"}, status=401)
             
-            if not request.auth.groups.filter(name=role_name).exists():
+            if not get_user_permissions(request.auth).has_role(role_name):
                 logger.warning(f"User {request.auth.username} attempted to access {func.__name__} without required role: {role_name}")
                 return Response({"error": f"Role '{role_name}' required"}, status=403)
             
@@ -66,8 +67,7 @@ def require_any_role(*role_names):
             if not hasattr(request, 'auth') or not request.auth:
                 return Response({"error": "Authentication required"}, status=401)
             
-            user_groups = request.auth.groups.values_list('name', flat=True)
-            if not any(role in user_groups for role in role_names):
+            if not get_user_permissions(request.auth).has_any_role(*role_names):
                 logger.warning(f"User {request.auth.username} attempted to access {func.__name__} without required roles: {role_names}")
                 return Response({"error": f"One of these roles required: {role_names}"}, status=403)
             
@@ -87,8 +87,10 @@ def check_task_access(user, task, action='view'):
     Returns:
         bool: True if user has access, False otherwise
     """
+    permissions = get_user_permissions(user)
+
     # Admin can do everything
-    if user.groups.filter(name='Administrator').exists():
+    if permissions.has_role('Administrator'):
         return True
     
     # Manager can manage department tasks
@@ -102,10 +104,10 @@ def check_task_access(user, task, action='view'):
     
     # Provider/Staff can only access assigned tasks
     if action == 'view':
-        return (task.assigned_to == user or 
-                task.assigned_group in user.groups.all())
+        return (task.assigned_to_id == user.pk or
+                (task.assigned_group_id is not None and task.assigned_group.name in permissions.group_names))
     elif action in ['edit', 'delete']:
-        return task.assigned_to == user
+        return task.assigned_to_id == user.pk
     
     return False
 
@@ -133,7 +135,7 @@ def require_task_access(action='view'):
             
             try:
                 from apps.tasks.models import Task
-                task = Task.objects.get(id=task_id)
+                task = Task.objects.select_related('assigned_group').get(id=task_id)
                 
                 if not check_task_access(request.auth, task, action):
                     logger.warning(f"User {request.auth.username} denied access to task {task_id} for action: {action}")
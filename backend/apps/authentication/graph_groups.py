@@ -0,0 +1,213 @@
+"""
+Microsoft Graph group resolver for tokens without a ``groups`` claim.
+
+Azure AD omits the ``groups`` claim when a user belongs to too many groups
+(group overage). ``JWTAuth`` then asks Microsoft Graph for the memberships.
+This resolver makes that lookup cheap:
+- one pooled HTTP session with strict connect/read timeouts
+- ``@odata.nextLink`` paging so large memberships are complete; links are
+  only followed on the configured Graph host, since they carry the user's token
+- a per-OID TTL cache, serving the last known list if Graph is unavailable
+- single-flight deduplication: concurrent requests for the same OID share one fetch
+- a pluggable transport, so tests can point it at a local fake Graph server
+"""
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BASE_URL = 'https://graph.microsoft.com/v1.0'
+DEFAULT_TTL = 300
+DEFAULT_CACHE_SIZE = 4096
+DEFAULT_CONNECT_TIMEOUT = 2.0
+DEFAULT_READ_TIMEOUT = 5.0
+DEFAULT_MAX_PAGES = 20
+
+# A transport takes (url, headers, timeout) and returns (status_code, parsed JSON body).
+Transport = Callable[[str, Dict[str, str], Tuple[float, float]], Tuple[int, Dict[str, Any]]]
+
+
+class GraphError(Exception):
+    """Raised when Microsoft Graph returns an error or an unexpected payload."""
+
+
+class RequestsTransport:
+    """Default transport: a pooled ``requests.Session`` shared by all threads."""
+
+    def __init__(self, pool_size: int = 10):
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def __call__(self, url: str, headers: Dict[str, str], timeout: Tuple[float, float]) -> Tuple[int, Dict[str, Any]]:
+        response = self.session.get(url, headers=headers, timeout=timeout)
+        try:
+            body = response.json()
+        except ValueError:
+            body = {}
+        return response.status_code, body
+
+
+class _InFlight:
+    __slots__ = ('event', 'groups')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.groups: Optional[List[str]] = None
+
+
+class GraphGroupResolver:
+    """Resolves a user's group ids from Microsoft Graph with caching and deduplication."""
+
+    def __init__(self, transport: Optional[Transport] = None, base_url: str = DEFAULT_BASE_URL,
+                 ttl: int = DEFAULT_TTL, max_size: int = DEFAULT_CACHE_SIZE,
+                 timeout: Tuple[float, float] = (DEFAULT_CONNECT_TIMEOUT, DEFAULT_READ_TIMEOUT),
+                 max_pages: int = DEFAULT_MAX_PAGES):
+        self.transport = transport or RequestsTransport()
+        self.base_url = base_url.rstrip('/')
+        self.origin = self._origin(self.base_url)
+        self.ttl = ttl
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_pages = max_pages
+
+        self._cache: 'OrderedDict[str, Tuple[float, List[str]]]' = OrderedDict()
+        self._inflight: Dict[str, _InFlight] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.shared_fetches = 0
+        self.fetches = 0
+        self.failures = 0
+        self.pages = 0
+        self.total_latency_ms = 0.0
+
+    @classmethod
+    def from_settings(cls) -> 'GraphGroupResolver':
+        config = getattr(settings, 'JWT_AUTH', {})
+        return cls(
+            base_url=config.get('GRAPH_API_BASE_URL', DEFAULT_BASE_URL),
+            ttl=config.get('GRAPH_GROUPS_CACHE_TTL', DEFAULT_TTL),
+            timeout=(
+                config.get('GRAPH_CONNECT_TIMEOUT', DEFAULT_CONNECT_TIMEOUT),
+                config.get('GRAPH_READ_TIMEOUT', DEFAULT_READ_TIMEOUT),
+            ),
+            max_pages=config.get('GRAPH_MAX_PAGES', DEFAULT_MAX_PAGES),
+        )
+
+    def resolve(self, azure_oid: str, access_token: str) -> List[str]:
+        """
+        Return the group ids for ``azure_oid``. Errors are logged and the last
+        known list (or an empty list) is returned, matching the previous inline call.
+        """
+        now = time.monotonic()
+        with self._lock:
+            cached = self._cache.get(azure_oid)
+            if cached is not None and cached[0] > now:
+                self._cache.move_to_end(azure_oid)
+                self.hits += 1
+                return list(cached[1])
+            call = self._inflight.get(azure_oid)
+            leader = call is None
+            if leader:
+                call = self._inflight[azure_oid] = _InFlight()
+                self.misses += 1
+            else:
+                self.shared_fetches += 1
+
+        if not leader:
+            call.event.wait(sum(self.timeout) * self.max_pages)
+            return list(call.groups or [])
+
+        groups = None
+        try:
+            groups = self._fetch(access_token)
+            with self._lock:
+                self._cache[azure_oid] = (time.monotonic() + self.ttl, groups)
+                self._cache.move_to_end(azure_oid)
+                while len(self._cache) > self.max_size:
+                    self._cache.popitem(last=False)
+            logger.info(f"Fetched {len(groups)} groups from Microsoft Graph API")
+        except Exception as e:
+            self.failures += 1
+            logger.error(f"Failed to fetch groups from Microsoft Graph: {e}")
+            groups = list(cached[1]) if cached is not None else []
+        finally:
+            call.groups = groups
+            call.event.set()
+            with self._lock:
+                self._inflight.pop(azure_oid, None)
+        return list(groups)
+
+    @staticmethod
+    def _origin(url: str) -> Tuple[str, str, Optional[int]]:
+        parts = urlsplit(url)
+        return parts.scheme.lower(), (parts.hostname or '').lower(), parts.port
+
+    def _fetch(self, access_token: str) -> List[str]:
+        headers = {'Authorization': f'Bearer {access_token}'}
+        url: Optional[str] = f"{self.base_url}/me/memberOf?$select=id&$top=999"
+        groups: List[str] = []
+        started = time.monotonic()
+        self.fetches += 1
+        try:
+            for _ in range(self.max_pages):
+                status, body = self.transport(url, headers, self.timeout)
+                self.pages += 1
+                if status != 200:
+                    raise GraphError(f"Graph returned HTTP {status}")
+                groups.extend(str(g['id']) for g in body.get('value', []) if 'id' in g)
+                url = body.get('@odata.nextLink')
+                if not url:
+                    return groups
+                if self._origin(url) != self.origin:
+                    logger.warning(f"Not following Graph memberOf nextLink to another host: {urlsplit(url).netloc}")
+                    return groups
+            logger.warning(f"Stopped following Graph memberOf pages after {self.max_pages} pages")
+            return groups
+        finally:
+            self.total_latency_ms += (time.monotonic() - started) * 1000
+
+    def invalidate(self, azure_oid: str) -> None:
+        with self._lock:
+            self._cache.pop(azure_oid, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'size': len(self._cache),
+                'hits': self.hits,
+                'misses': self.misses,
+                'shared_fetches': self.shared_fetches,
+                'fetches': self.fetches,
+                'failures': self.failures,
+                'pages': self.pages,
+                'avg_fetch_ms': round(self.total_latency_ms / self.fetches, 2) if self.fetches else None,
+            }
+
+
+_graph_resolver: Optional[GraphGroupResolver] = None
+_graph_resolver_lock = threading.Lock()
+
+
+def get_graph_group_resolver() -> GraphGroupResolver:
+    """Return the process-wide Graph group resolver, creating it from settings on first use."""
+    global _graph_resolver
+    if _graph_resolver is None:
+        with _graph_resolver_lock:
+            if _graph_resolver is None:
+                _graph_resolver = GraphGroupResolver.from_settings()
+    return _graph_resolver
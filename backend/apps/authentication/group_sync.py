@@ -0,0 +1,105 @@
+"""
+Set-based reconciliation of Azure AD groups onto Django ``auth.Group`` memberships.
+
+Replaces the per-group ``Group.objects.get_or_create`` + ``user.groups.add``
+loop. Regardless of how many groups a token carries, a sync costs at most:
+- one query to read the user's current memberships
+- one ``bulk_create`` (conflict-ignore) for missing ``Group`` rows
+- one query to resolve the ids of the groups to add
+- one multi-row insert into the user/group through table
+- one delete for stale memberships (only when ``remove_stale`` is set)
+
+The through-table rows are written directly, so ``m2m_changed`` is not sent
+for these memberships. ``invalidate_membership_caches`` stands in for the
+receivers that would otherwise drop the user's cached principal, profile
+snapshot and per-instance permission lookups; it runs once the sync commits.
+The permission matrix is built from roles and group mappings only, so a
+membership change leaves it (and every other user's caches) alone.
+"""
+import logging
+from dataclasses import dataclass, field
+from typing import Iterable, List
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.db import transaction
+
+from apps.users.profile_snapshot import get_profile_cache
+
+from .principal import get_principal_cache
+
+logger = logging.getLogger(__name__)
+
+# auth.Group.name is limited to 150 characters.
+GROUP_NAME_MAX_LENGTH = Group._meta.get_field('name').max_length
+
+
+def invalidate_membership_caches(user) -> None:
+    """Drop everything cached from ``user``'s Django group memberships."""
+    get_principal_cache().invalidate_user(user.pk)
+    get_profile_cache().invalidate_user(user.pk)
+    # Per-instance caches kept by get_user_permissions() and ModelBackend.
+    for attr in ('_principal_permissions', '_perm_cache', '_group_perm_cache'):
+        user.__dict__.pop(attr, None)
+
+
+@dataclass
+class GroupSyncResult:
+    """Outcome of reconciling one user's group memberships."""
+    added: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    groups_created: int = 0
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.added or self.removed)
+
+
+def sync_user_groups(user, group_names: Iterable[str], remove_stale: bool = False) -> GroupSyncResult:
+    """
+    Make ``user``'s Django group memberships match ``group_names``.
+
+    Missing groups are created and memberships added in bulk. Memberships not
+    present in ``group_names`` are only removed when ``remove_stale`` is True.
+    """
+    wanted = {str(name) for name in group_names if name}
+    too_long = {name for name in wanted if len(name) > GROUP_NAME_MAX_LENGTH}
+    if too_long:
+        logger.warning(f"Ignoring Azure AD groups longer than {GROUP_NAME_MAX_LENGTH} characters: {too_long}")
+        wanted -= too_long
+
+    User = get_user_model()
+    Membership = User.groups.through
+    result = GroupSyncResult()
+
+    current = set(user.groups.values_list('name', flat=True))
+    to_add = wanted - current
+    to_remove = current - wanted if remove_stale else set()
+    if not to_add and not to_remove:
+        return result
+
+    with transaction.atomic():
+        if to_add:
+            created = Group.objects.bulk_create(
+                [Group(name=name) for name in sorted(to_add)],
+                ignore_conflicts=True,
+            )
+            # With ignore_conflicts the returned objects have no pk; count is an upper bound.
+            result.groups_created = len(created)
+            group_ids = Group.objects.filter(name__in=to_add).values_list('id', flat=True)
+            Membership.objects.bulk_create(
+                [Membership(user_id=user.pk, group_id=group_id) for group_id in group_ids],
+                ignore_conflicts=True,
+            )
+            result.added = sorted(to_add)
+
+        if to_remove:
+            Membership.objects.filter(user_id=user.pk, group__name__in=to_remove).delete()
+            result.removed = sorted(to_remove)
+
+        transaction.on_commit(lambda: invalidate_membership_caches(user))
+
+    logger.info(
+        f"Synced groups for user '{user.username}': added {len(result.added)}, removed {len(result.removed)}"
+    )
+    return result
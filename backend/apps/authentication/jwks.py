@@ -0,0 +1,305 @@
+"""
+Non-blocking JWKS key manager.
+
+Replaces ``jwt.PyJWKClient``, which fetches the key set inline on the first
+request, again whenever its lifespan expires and on every unknown ``kid``,
+stalling every worker thread at the same moment.
+
+Behaviour:
+- the key set is refreshed by a background daemon thread, started in each
+  process on its first key lookup (not at import, so ``manage.py`` commands
+  don't start it) and restarted in a child process after a fork
+- the last good key set keeps being served while a refresh runs or fails
+- refetches triggered by an unknown ``kid`` are single-flight and rate limited
+- a key set can be loaded from a local JWKS file (``JWT_AUTH['JWKS_FILE']``)
+  for startup without network access, or for tests
+- refresh latency, failures and key counts are exposed through ``stats()``
+"""
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import jwt
+import requests
+from django.conf import settings
+from jwt.exceptions import PyJWKClientError
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REFRESH_INTERVAL = 3600
+DEFAULT_UNKNOWN_KID_INTERVAL = 60
+DEFAULT_FETCH_TIMEOUT = 5
+# Retry a failed background refresh sooner than the regular interval.
+FAILURE_RETRY_INTERVAL = 60
+
+
+class JWKSManager:
+    """Serves signing keys from memory and keeps them fresh in the background."""
+
+    def __init__(self, jwks_uri: str, refresh_interval: int = DEFAULT_REFRESH_INTERVAL,
+                 unknown_kid_interval: int = DEFAULT_UNKNOWN_KID_INTERVAL,
+                 fetch_timeout: float = DEFAULT_FETCH_TIMEOUT, key_file: Optional[str] = None,
+                 background_refresh: bool = True):
+        self.jwks_uri = jwks_uri
+        self.refresh_interval = refresh_interval
+        self.unknown_kid_interval = unknown_kid_interval
+        self.fetch_timeout = fetch_timeout
+        self.key_file = key_file
+        self.background_refresh = background_refresh
+
+        self._keys: Dict[str, jwt.PyJWK] = {}
+        self._keys_lock = threading.Lock()
+        self._fetch_lock = threading.Lock()
+        self._session = requests.Session()
+        self._thread: Optional[threading.Thread] = None
+        # Process the refresher was started in; threads don't survive a fork.
+        self._pid: Optional[int] = None
+        self._start_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+
+        self.loaded_at: Optional[float] = None
+        self.source: Optional[str] = None
+        self._last_unknown_kid_fetch = 0.0
+        self._last_attempt: Optional[float] = None
+        self.refreshes = 0
+        self.failures = 0
+        self.unknown_kid_refetches = 0
+        self.rate_limited = 0
+        self.last_latency_ms: Optional[float] = None
+        self.total_latency_ms = 0.0
+        self.last_error: Optional[str] = None
+        self.last_success_at: Optional[float] = None
+
+        if key_file:
+            try:
+                self.load_file(key_file)
+            except Exception as e:
+                logger.error(f"Failed to load JWKS file '{key_file}': {e}")
+
+    @classmethod
+    def from_settings(cls) -> 'JWKSManager':
+        config = settings.JWT_AUTH
+        return cls(
+            jwks_uri=config['JWKS_URI'],
+            refresh_interval=config.get('JWKS_REFRESH_INTERVAL', DEFAULT_REFRESH_INTERVAL),
+            unknown_kid_interval=config.get('JWKS_UNKNOWN_KID_INTERVAL', DEFAULT_UNKNOWN_KID_INTERVAL),
+            fetch_timeout=config.get('JWKS_FETCH_TIMEOUT', DEFAULT_FETCH_TIMEOUT),
+            key_file=config.get('JWKS_FILE') or None,
+            background_refresh=config.get('JWKS_BACKGROUND_REFRESH', True),
+        )
+
+    # --- Loading ---
+
+    def _install(self, jwk_set_dict: Dict[str, Any], source: str) -> int:
+        jwk_set = jwt.PyJWKSet.from_dict(jwk_set_dict)
+        keys = {key.key_id: key for key in jwk_set.keys if key.key_id}
+        if not keys:
+            raise PyJWKClientError("The JWKS endpoint did not contain any signing keys")
+        with self._keys_lock:
+            self._keys = keys
+            self.loaded_at = time.time()
+            self.source = source
+        return len(keys)
+
+    def load_file(self, path: str) -> int:
+        """Load a key set from a local JWKS JSON file."""
+        with open(path) as f:
+            count = self._install(json.load(f), source=f"file:{path}")
+        logger.info(f"Loaded {count} signing key(s) from JWKS file {path}")
+        return count
+
+    def refresh(self) -> bool:
+        """
+        Fetch the key set from ``jwks_uri``. On failure the previous key set is
+        kept. Concurrent callers share a single fetch.
+        """
+        acquired = self._fetch_lock.acquire(blocking=False)
+        if not acquired:
+            # Another thread is already fetching; wait for it and use its result.
+            with self._fetch_lock:
+                return self.last_error is None
+
+        try:
+            started = self._last_attempt = time.monotonic()
+            try:
+                response = self._session.get(self.jwks_uri, timeout=self.fetch_timeout)
+                response.raise_for_status()
+                count = self._install(response.json(), source=self.jwks_uri)
+            except Exception as e:
+                self.failures += 1
+                self.last_error = str(e)
+                logger.error(f"JWKS refresh from {self.jwks_uri} failed, keeping last good key set: {e}")
+                return False
+            finally:
+                self.last_latency_ms = round((time.monotonic() - started) * 1000, 2)
+            self.refreshes += 1
+            self.total_latency_ms += self.last_latency_ms
+            self.last_error = None
+            self.last_success_at = time.time()
+            logger.info(f"Refreshed JWKS ({count} keys) in {self.last_latency_ms}ms")
+            return True
+        finally:
+            self._fetch_lock.release()
+
+    # --- Background refresh ---
+
+    def _refresher_running(self) -> bool:
+        return self._pid == os.getpid() and self._thread is not None and self._thread.is_alive()
+
+    def ensure_started(self) -> None:
+        """Start the refresher if background refresh is enabled and it isn't running in this process."""
+        if self.background_refresh and not self._refresher_running():
+            self.start()
+
+    def start(self) -> None:
+        """Start the background refresh thread in this process (idempotent)."""
+        if self._pid is not None and self._pid != os.getpid():
+            self._reset_after_fork()
+        with self._start_lock:
+            if self._refresher_running():
+                return
+            self._pid = os.getpid()
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='jwks-refresh', daemon=True)
+            self._thread.start()
+        logger.info(f"Started JWKS refresher in process {self._pid}")
+
+    def _reset_after_fork(self) -> None:
+        """
+        Replace state a fork may have copied mid-use: locks held by threads that
+        no longer exist and the parent's pooled HTTP connections. The inherited
+        key set is kept and served until the new refresher replaces it.
+        """
+        self._keys_lock = threading.Lock()
+        self._fetch_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._session = requests.Session()
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread = None
+        self._pid = None
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wake.set()
+
+    def _retry_delay(self) -> float:
+        """Seconds until another attempt is allowed after the last one (bounds retries on failure)."""
+        if self._last_attempt is None:
+            return 0.0
+        retry_interval = min(FAILURE_RETRY_INTERVAL, self.refresh_interval)
+        return max(0.0, retry_interval - (time.monotonic() - self._last_attempt))
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            if self.is_stale():
+                delay = self._retry_delay()
+                if delay == 0.0:
+                    self.refresh()
+                    delay = self._retry_delay()
+                wait = delay if self.is_stale() else self.refresh_interval
+            else:
+                wait = self.refresh_interval - (time.time() - (self.loaded_at or 0))
+            self._wake.wait(max(1.0, wait))
+            self._wake.clear()
+
+    def is_stale(self) -> bool:
+        if self.loaded_at is None:
+            return True
+        if self.source and self.source.startswith('file:') and self.last_success_at is None:
+            # A file-loaded set is replaced by the live set as soon as it can be fetched.
+            return True
+        return time.time() - self.loaded_at >= self.refresh_interval
+
+    # --- Key lookup ---
+
+    def get_signing_key(self, kid: str) -> jwt.PyJWK:
+        self.ensure_started()
+        with self._keys_lock:
+            key = self._keys.get(kid)
+            have_keys = bool(self._keys)
+        if key is not None:
+            if self.is_stale() and self._refresher_running():
+                # Stale-while-revalidate: serve the current key, nudge the refresher.
+                self._wake.set()
+            return key
+
+        if not have_keys:
+            # Cold start with no file: wait for an in-flight fetch, or start one
+            # unless a failed attempt was made too recently.
+            if self._fetch_lock.locked() or self._retry_delay() == 0.0:
+                self.refresh()
+            else:
+                self.rate_limited += 1
+        elif self._allow_unknown_kid_refetch():
+            self.unknown_kid_refetches += 1
+            logger.info(f"Unknown signing key id '{kid}', refetching JWKS")
+            self.refresh()
+        else:
+            self.rate_limited += 1
+
+        with self._keys_lock:
+            key = self._keys.get(kid)
+        if key is None:
+            raise PyJWKClientError(f'Unable to find a signing key that matches: "{kid}"')
+        return key
+
+    def _allow_unknown_kid_refetch(self) -> bool:
+        now = time.monotonic()
+        with self._keys_lock:
+            if now - self._last_unknown_kid_fetch < self.unknown_kid_interval:
+                return False
+            self._last_unknown_kid_fetch = now
+            return True
+
+    def get_signing_key_from_jwt(self, token: str) -> jwt.PyJWK:
+        """Drop-in replacement for ``PyJWKClient.get_signing_key_from_jwt``."""
+        try:
+            header = jwt.get_unverified_header(token)
+        except jwt.DecodeError as e:
+            raise PyJWKClientError(f"Invalid token header: {e}")
+        kid = header.get('kid')
+        if not kid:
+            raise PyJWKClientError("Token header does not contain a 'kid'")
+        return self.get_signing_key(kid)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._keys_lock:
+            key_count = len(self._keys)
+        return {
+            'keys': key_count,
+            'source': self.source,
+            'loaded_at': self.loaded_at,
+            'stale': self.is_stale(),
+            'refreshes': self.refreshes,
+            'failures': self.failures,
+            'last_error': self.last_error,
+            'last_success_at': self.last_success_at,
+            'last_latency_ms': self.last_latency_ms,
+            'avg_latency_ms': round(self.total_latency_ms / self.refreshes, 2) if self.refreshes else None,
+            'unknown_kid_refetches': self.unknown_kid_refetches,
+            'rate_limited': self.rate_limited,
+            'background_refresh': self._refresher_running(),
+        }
+
+
+_jwks_manager: Optional[JWKSManager] = None
+_jwks_manager_lock = threading.Lock()
+
+
+def get_jwks_manager() -> JWKSManager:
+    """
+    Return the process-wide JWKS manager. Its background refresher starts on
+    the first key lookup in each process.
+    """
+    global _jwks_manager
+    if _jwks_manager is None:
+        with _jwks_manager_lock:
+            if _jwks_manager is None:
+                _jwks_manager = JWKSManager.from_settings()
+                logger.info(f"Initializing JWKS manager with URI: {_jwks_manager.jwks_uri}")
+    return _jwks_manager
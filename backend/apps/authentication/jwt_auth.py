@@ -1,9 +1,7 @@
 # /home/amj/dev/mtk-care/backend/apps/authentication/jwt_auth.py
 import jwt
-# import requests # Not directly used here if PyJWKClient handles HTTP
 from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.contrib.auth.models import Group
 from ninja.security import HttpBearer
 from ninja.errors import AuthenticationError # Import for proper error handling
 import logging
@@ -12,33 +10,20 @@ from datetime import timedelta # Import for leeway
 
 # Assuming UserProfile is in the same app's models.py
 from .models import UserProfile 
+from .token_cache import get_token_cache
+from .group_sync import sync_user_groups
+from .context import get_auth_context
+from .jwks import get_jwks_manager
+from .graph_groups import get_graph_group_resolver
 
 logger = logging.getLogger(__name__)
 User = get_user_model()
 
 class JWTAuth(HttpBearer):
-    _jwks_client_instance = None # Class attribute to hold the singleton client
-
     def __init__(self):
-        if not hasattr(JWTAuth, '_jwks_client_instance') or JWTAuth._jwks_client_instance is None:
-            logger.info(f"Initializing PyJWKClient with URI: {settings.JWT_AUTH['JWKS_URI']}")
-            JWTAuth._jwks_client_instance = jwt.PyJWKClient(
-                settings.JWT_AUTH['JWKS_URI'],
-                cache_keys=True, 
-                lifespan=3600 # Cache keys for 1 hour
-            )
-            try:
-                # Eagerly fetch keys to validate configuration and prime cache
-                JWTAuth._jwks_client_instance.get_jwk_set(refresh=True)
-                logger.info("Successfully fetched initial JWKS.")
-            except Exception as e:
-                logger.error(f"Failed to fetch initial JWKS during __init__: {e}. "
-                             f"Check JWKS_URI, network connectivity, and Azure AD config.")
-                # Depending on policy, you might want to raise an error here to prevent startup
-                # For now, it will log and potentially fail on first auth attempt.
-        
-        # Assign the class instance to the instance variable
-        self._jwks_client = JWTAuth._jwks_client_instance
+        # Keys are served from memory and refreshed by a background thread, so
+        # instantiating JWTAuth never blocks on a network fetch.
+        self._jwks_client = get_jwks_manager()
 
     def authenticate(self, request, token):
         if not token:
@@ -48,6 +33,30 @@ class JWTAuth(HttpBearer):
             # raise AuthenticationError("Authorization credentials were not provided.")
             return None # Or let Ninja handle it based on endpoint config
 
+        # The middleware and Ninja's auth= both authenticate the same token;
+        # whichever runs first stores its result on the request for the other.
+        context = get_auth_context(request) if request is not None else None
+        if context is None:
+            return self._authenticate(token)
+        if context.recall(token):
+            return context.result()
+
+        with context.measure(authentication_pass=True):
+            try:
+                user = self._authenticate(token)
+            except AuthenticationError as e:
+                context.remember(token, error=e)
+                raise
+        context.remember(token, user=user)
+        return user
+
+    def _authenticate(self, token):
+        # A token we have already validated skips the JWKS lookup, decode and user queries.
+        token_cache = get_token_cache()
+        cached = token_cache.get(token)
+        if cached is not None:
+            return cached.get_user()
+
         # Commented out debug logging for token authentication
         # logger.debug(f"Attempting to authenticate with token: {token[:30]}...")
         try:
@@ -182,46 +191,26 @@ class JWTAuth(HttpBearer):
         
         # If no groups found in standard claims, try to fetch them using Microsoft Graph
         if not azure_groups and 'access_token' in payload:
-            try:
-                import requests
-                graph_url = 'https://graph.microsoft.com/v1.0/me/memberOf'
-                headers = {'Authorization': f'Bearer {payload["access_token"]}'}
-                response = requests.get(graph_url, headers=headers)
-                if response.status_code == 200:
-                    groups_data = response.json().get('value', [])
-                    azure_groups = [g['id'] for g in groups_data if 'id' in g]
-                    logger.info(f"Fetched {len(azure_groups)} groups from Microsoft Graph API")
-            except Exception as e:
-                logger.error(f"Failed to fetch groups from Microsoft Graph: {e}")
+            azure_groups = get_graph_group_resolver().resolve(azure_oid, payload['access_token'])
         
         # Attach Azure AD groups to the user object as a temporary attribute
         # The middleware will handle persisting this to the UserProfile.
         user._azure_ad_groups_from_token = azure_groups
+        user._azure_oid = azure_oid
         logger.info(f"Attaching temporary _azure_ad_groups_from_token to user {user.username}: {azure_groups}")
         
         # Sync with Django groups if needed (optional)
         if azure_groups:
-            current_user_group_ids = set(user.groups.values_list('name', flat=True))
-            
-            # Add user to groups they should be in
-            for group_id in azure_groups:
-                if group_id not in current_user_group_ids:
-                    try:
-                        group, created = Group.objects.get_or_create(name=group_id)
-                        user.groups.add(group)
-                        logger.info(f"Added user '{user.username}' to group '{group_id}' (created: {created})")
-                    except Exception as e:
-                        logger.error(f"Failed to add user to group {group_id}: {e}")
-            
-            # Optionally remove from groups not in Azure AD (uncomment if needed)
-            # for group_id in current_user_group_ids - set(azure_groups):
-            #     try:
-            #         group = Group.objects.get(name=group_id)
-            #         user.groups.remove(group)
-            #         logger.info(f"Removed user '{user.username}' from group '{group_id}'")
-            #     except Group.DoesNotExist:
-            #         pass
+            try:
+                sync_user_groups(
+                    user,
+                    azure_groups,
+                    remove_stale=settings.JWT_AUTH.get('SYNC_REMOVE_STALE_GROUPS', False),
+                )
+            except Exception as e:
+                logger.error(f"Failed to sync groups for user '{user.username}': {e}")
 
+        token_cache.set(token, payload, user, azure_groups)
         return user
 
         # The broad except Exception at the end of user's original provisioning logic is removed.
@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand
+from apps.authentication.group_sync import sync_user_groups
+from apps.users.models import UserProfile
+
+# python manage.py sync_azure_groups [--username alice@example.com] [--remove-stale]
+class Command(BaseCommand):
+    help = 'Reconcile Django group memberships with the Azure AD groups stored on each UserProfile'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--username', help='Only sync this user')
+        parser.add_argument(
+            '--remove-stale',
+            action='store_true',
+            help='Also remove memberships of groups that are no longer in the Azure AD group list',
+        )
+
+    def handle(self, *args, **options):
+        profiles = UserProfile.objects.select_related('user').exclude(azure_ad_groups=[])
+        if options['username']:
+            profiles = profiles.filter(user__username=options['username'])
+
+        users_changed = added = removed = 0
+        for profile in profiles.iterator():
+            try:
+                result = sync_user_groups(
+                    profile.user,
+                    profile.azure_ad_groups or [],
+                    remove_stale=options['remove_stale'],
+                )
+            except Exception as e:
+                self.stderr.write(self.style.ERROR(f'Error syncing groups for {profile.user.username}: {e}'))
+                continue
+            if result.changed:
+                users_changed += 1
+                added += len(result.added)
+                removed += len(result.removed)
+                self.stdout.write(
+                    f'{profile.user.username}: +{len(result.added)} / -{len(result.removed)}'
+                )
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Synced {users_changed} user(s): {added} membership(s) added, {removed} removed.'
+        ))
@@ -7,7 +7,8 @@ from django.contrib.auth import get_user_model
 from django.contrib.auth.models import AnonymousUser
 from django.utils.functional import SimpleLazyObject
 from .jwt_auth import JWTAuth
-from apps.users.models import UserProfile, GroupRoleMapping
+from .principal import get_principal_cache
+from .context import get_auth_context, request_stats, REQUEST_ATTR
 
 logger = logging.getLogger(__name__)
 User = get_user_model()
@@ -34,71 +35,15 @@ def get_user_from_token(request):
             logger.warning("JWT authentication failed or user not authenticated")
             return AnonymousUser()
             
-        # Get or create user profile
-        profile, created = UserProfile.objects.get_or_create(user=user)
-        if created:
-            logger.info(f"Created new user profile for {user.username}")
-        
-        # TODO: Recommendation: For initial deployment, simplify by disabling group-based role mapping if it's not immediately essential.
-        # Retrieve Azure AD groups attached to the user object by the auth backend
+        # Profile, group list and highest role are cached per Azure OID and only
+        # rebuilt when the token's groups or the role mapping tables change.
         retrieved_groups_from_token = getattr(user, '_azure_ad_groups_from_token', [])
-        logger.info(f"Retrieved temporary _azure_ad_groups_from_token for user {user.username}: {retrieved_groups_from_token}")
-
-        # Persist these groups to the UserProfile if they differ
-        if profile.azure_ad_groups != retrieved_groups_from_token:
-            profile.azure_ad_groups = retrieved_groups_from_token
-            profile.save(update_fields=['azure_ad_groups'])
-            logger.info(f"UserProfile {profile.id} for {user.username} updated in DB with Azure AD groups: {profile.azure_ad_groups}")
-        
-        # Use the (now persisted) groups from the profile for role mapping
-        azure_groups = profile.azure_ad_groups
-        logger.info(f"User {user.email} using Azure AD groups from profile for role mapping: {azure_groups}")
+        with get_auth_context(request).measure():
+            principal = get_principal_cache().resolve(user, retrieved_groups_from_token)
 
-        # Find the highest role from the user's Azure AD groups
-        highest_role = None
-        matched_groups = []
-        
-        if azure_groups:
-            # Get all group mappings in one query for better performance
-            group_mappings = GroupRoleMapping.objects.filter(
-                azure_ad_group_id__in=azure_groups
-            ).select_related('role').order_by('role__level')
-            
-            for mapping in group_mappings:
-                try:
-                    logger.info(f"Processing role mapping - Group ID: {mapping.azure_ad_group_id} -> "
-                                f"Role: {mapping.role.name} (Level: {mapping.role.level})")
-                    
-                    matched_groups.append(mapping.azure_ad_group_id)
-                    
-                    if highest_role is None or mapping.role.level < highest_role.level:
-                        highest_role = mapping.role
-                        logger.info(f"New highest role: {highest_role.name} (Level: {highest_role.level})")
-                        
-                except Exception as e:
-                    logger.error(f"Error processing role mapping for group {mapping.azure_ad_group_id}: {e}")
-                    continue
-            
-            # Log any groups that didn't have role mappings
-            unmatched_groups = set(azure_groups) - set(matched_groups)
-            if unmatched_groups:
-                logger.debug(f"No role mappings found for Azure AD groups: {', '.join(unmatched_groups)}")
-        else:
-            logger.warning(f"No Azure AD groups found for user {user.email}")
-        
-        # Set the user's role if a mapping was found
-        if highest_role:
-            if not hasattr(profile, 'role') or profile.role_id != highest_role.id:
-                profile.role = highest_role
-                profile.save()
-                logger.info(f"Updated user {user.username} role to {highest_role.name}")
-            else:
-                logger.debug(f"User {user.username} already has role {highest_role.name}")
-        else:
-            logger.warning(f"No role mapping found for user {user.email}'s Azure AD groups")
-            
-        # Add the role to the user object for easy access in views
-        user.role = highest_role
+        # Add the principal and role to the user object for easy access in views
+        user.principal = principal
+        user.role = principal.role
         
         return user
         
@@ -131,4 +76,18 @@ class JWTAuthenticationMiddleware:
                 request.user = user
                 request.role = getattr(user, 'role', None) if hasattr(user, 'role') else None
         
-        return self.get_response(request)
+        response = self.get_response(request)
+        self._record_auth_cost(request, response)
+        return response
+
+    def _record_auth_cost(self, request, response):
+        context = getattr(request, REQUEST_ATTR, None)
+        if context is None:
+            return
+        request_stats.record(context)
+        if context.auth_passes > 1:
+            logger.debug(f"Request {request.path} ran {context.auth_passes} authentication passes")
+        if settings.JWT_AUTH.get('EXPOSE_AUTH_COST_HEADERS', settings.DEBUG):
+            response['X-Auth-Passes'] = str(context.auth_passes)
+            response['X-Auth-Memo-Hits'] = str(context.memo_hits)
+            response['X-Auth-Queries'] = str(context.queries)
@@ -0,0 +1,269 @@
+"""
+Resolved-principal cache for JWTAuthenticationMiddleware.
+
+A principal bundles everything the middleware used to recompute on every
+request: the Django user, their ``apps.users`` profile, the Azure AD group
+list from the token, the highest ``Role`` mapped from those groups and the
+user's Django group names (what ``require_role`` checks).
+
+Principals are cached per Azure OID and rebuilt only when:
+- the token's group claim differs from the cached group list
+- a ``GroupRoleMapping`` or ``Role`` row is saved or deleted (bumps the version)
+- the permission matrix is rebuilt (e.g. role changes made by another process)
+- the user's profile or Django group memberships change
+- the entry is older than ``JWT_AUTH['PRINCIPAL_CACHE_TTL']`` seconds
+"""
+import copy
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, FrozenSet, Iterable, Optional, Tuple
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+from apps.users.models import GroupRoleMapping, Role, UserProfile
+from apps.users.permission_matrix import PrincipalPermissions, get_permission_matrix
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_SIZE = 2048
+DEFAULT_TTL = 300
+
+
+class Principal:
+    """The authenticated user together with their resolved profile, groups and role."""
+    __slots__ = ('user', 'profile', 'azure_groups', 'group_names', 'role', 'version', 'matrix_version',
+                 'built_at', '_permissions')
+
+    def __init__(self, user, profile: UserProfile, azure_groups: Tuple[str, ...], group_names: FrozenSet[str],
+                 role: Optional[Role], version: int, matrix_version: int):
+        self.user = user
+        self.profile = profile
+        # Prime the reverse one-to-one cache so ``user.profile`` doesn't query again.
+        UserProfile.user.field.remote_field.set_cached_value(user, profile)
+        self.azure_groups = azure_groups
+        self.group_names = group_names
+        self.role = role
+        self.version = version
+        self.matrix_version = matrix_version
+        self.built_at = time.monotonic()
+        self._permissions: Optional[PrincipalPermissions] = None
+
+    @property
+    def role_level(self) -> Optional[int]:
+        return self.role.level if self.role else None
+
+    @property
+    def permissions(self) -> PrincipalPermissions:
+        """Roles and permissions from the in-memory matrix, resolved once per principal."""
+        matrix = get_permission_matrix()
+        if self._permissions is None or self._permissions.version != matrix.version:
+            self._permissions = matrix.resolve(self.group_names, extra_role_ids=[self.role.id] if self.role else (),
+                                               mapped_groups=self.azure_groups)
+        return self._permissions
+
+    def copy_for(self, user) -> 'Principal':
+        """A principal for one request, with its own copy of the (cached) profile."""
+        return Principal(user, copy_profile(self.profile, user), self.azure_groups, self.group_names,
+                         self.role, self.version, self.matrix_version)
+
+    def __repr__(self):
+        return f"<Principal {self.user.username} role={self.role.name if self.role else None}>"
+
+
+def copy_profile(profile: UserProfile, user) -> UserProfile:
+    """
+    Return a per-request copy of a cached profile, so a view that edits or saves
+    it doesn't change the instance other requests and threads are reading.
+    """
+    profile = copy.copy(profile)  # Model.__getstate__ gives the copy its own _state
+    profile.azure_ad_groups = list(profile.azure_ad_groups or [])
+    profile.preferences = copy.deepcopy(profile.preferences)
+    UserProfile.user.field.set_cached_value(profile, user)
+    return profile
+
+
+def resolve_highest_role(azure_groups: Iterable[str]) -> Optional[Role]:
+    """Return the highest (lowest level number) role mapped from ``azure_groups`` in one query."""
+    azure_groups = list(azure_groups)
+    if not azure_groups:
+        return None
+    mapping = GroupRoleMapping.objects.filter(
+        azure_ad_group_id__in=azure_groups
+    ).select_related('role').order_by('role__level').first()
+    return mapping.role if mapping else None
+
+
+def build_principal(user, azure_groups: Iterable[str], version: int, matrix_version: int) -> Principal:
+    """
+    Resolve profile and role for ``user`` from the database, persisting the
+    group list and role onto the profile when they have changed.
+    """
+    azure_groups = tuple(azure_groups)
+
+    profile, created = UserProfile.objects.select_related('role').get_or_create(user=user)
+    if created:
+        logger.info(f"Created new user profile for {user.username}")
+
+    update_fields = []
+    if list(profile.azure_ad_groups or []) != list(azure_groups):
+        profile.azure_ad_groups = list(azure_groups)
+        update_fields.append('azure_ad_groups')
+
+    highest_role = resolve_highest_role(azure_groups)
+    if highest_role:
+        if profile.role_id != highest_role.id:
+            profile.role = highest_role
+            update_fields.append('role')
+            logger.info(f"Updated user {user.username} role to {highest_role.name}")
+    elif azure_groups:
+        logger.warning(f"No role mapping found for user {user.email}'s Azure AD groups")
+    else:
+        logger.warning(f"No Azure AD groups found for user {user.email}")
+
+    if update_fields:
+        profile.save(update_fields=update_fields + ['updated_at'])
+
+    group_names = frozenset(user.groups.values_list('name', flat=True))
+    return Principal(user, profile, azure_groups, group_names, highest_role, version, matrix_version)
+
+
+class PrincipalCache:
+    """Thread-safe, versioned LRU of principals keyed by Azure OID."""
+
+    def __init__(self, max_size: int = DEFAULT_CACHE_SIZE, ttl: int = DEFAULT_TTL):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.version = 0
+        self._entries: 'OrderedDict[str, Principal]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.rebuilds = 0
+
+    @classmethod
+    def from_settings(cls) -> 'PrincipalCache':
+        config = getattr(settings, 'JWT_AUTH', {})
+        return cls(
+            max_size=config.get('PRINCIPAL_CACHE_SIZE', DEFAULT_CACHE_SIZE),
+            ttl=config.get('PRINCIPAL_CACHE_TTL', DEFAULT_TTL),
+        )
+
+    @staticmethod
+    def cache_key(user) -> str:
+        return getattr(user, '_azure_oid', None) or f"user:{user.pk}"
+
+    def _is_fresh(self, principal: Principal, azure_groups: Tuple[str, ...], matrix_version: int) -> bool:
+        return (
+            principal.version == self.version
+            and principal.matrix_version == matrix_version
+            and principal.azure_groups == azure_groups
+            and time.monotonic() - principal.built_at < self.ttl
+        )
+
+    def resolve(self, user, azure_groups: Iterable[str]) -> Principal:
+        """Return the principal for ``user``, rebuilding it only when it is stale."""
+        azure_groups = tuple(azure_groups)
+        key = self.cache_key(user)
+        matrix_version = get_permission_matrix().version
+
+        with self._lock:
+            principal = self._entries.get(key)
+            if principal is not None and self._is_fresh(principal, azure_groups, matrix_version):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return principal.copy_for(user)
+            if principal is None:
+                self.misses += 1
+            else:
+                self.rebuilds += 1
+            version = self.version
+
+        principal = build_principal(user, azure_groups, version, matrix_version)
+        if self.max_size > 0:
+            with self._lock:
+                # A signal may have bumped the version while we were building; don't cache stale data.
+                if principal.version == self.version:
+                    self._entries[key] = principal
+                    self._entries.move_to_end(key)
+                    while len(self._entries) > self.max_size:
+                        self._entries.popitem(last=False)
+                    return principal.copy_for(user)
+        return principal
+
+    def invalidate_all(self) -> None:
+        """Mark every cached principal stale (role tables changed)."""
+        with self._lock:
+            self.version += 1
+            self._entries.clear()
+
+    def invalidate_user(self, user_pk) -> None:
+        with self._lock:
+            stale = [key for key, principal in self._entries.items() if principal.user.pk == user_pk]
+            for key in stale:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.rebuilds = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'version': self.version,
+                'hits': self.hits,
+                'misses': self.misses,
+                'rebuilds': self.rebuilds,
+            }
+
+
+_principal_cache: Optional[PrincipalCache] = None
+_principal_cache_lock = threading.Lock()
+
+
+def get_principal_cache() -> PrincipalCache:
+    """Return the process-wide principal cache, creating it from settings on first use."""
+    global _principal_cache
+    if _principal_cache is None:
+        with _principal_cache_lock:
+            if _principal_cache is None:
+                _principal_cache = PrincipalCache.from_settings()
+    return _principal_cache
+
+
+def _invalidate_all_principals(sender, **kwargs):
+    get_principal_cache().invalidate_all()
+
+
+def _invalidate_profile_principal(sender, instance, **kwargs):
+    get_principal_cache().invalidate_user(instance.user_id)
+
+
+def _invalidate_membership_principals(sender, instance, action, reverse, pk_set, **kwargs):
+    if not action.startswith('post_'):
+        return
+    cache = get_principal_cache()
+    if not reverse:
+        cache.invalidate_user(instance.pk)
+    elif pk_set:
+        for user_pk in pk_set:
+            cache.invalidate_user(user_pk)
+    else:
+        cache.invalidate_all()
+
+
+def connect_signals() -> None:
+    """Rebuild principals whenever the role tables, a user's profile or their Django groups change."""
+    for model in (GroupRoleMapping, Role):
+        post_save.connect(_invalidate_all_principals, sender=model, dispatch_uid=f'principal_cache_{model.__name__}_saved')
+        post_delete.connect(_invalidate_all_principals, sender=model, dispatch_uid=f'principal_cache_{model.__name__}_deleted')
+    post_save.connect(_invalidate_profile_principal, sender=UserProfile, dispatch_uid='principal_cache_profile_saved')
+    post_delete.connect(_invalidate_profile_principal, sender=UserProfile, dispatch_uid='principal_cache_profile_deleted')
+    m2m_changed.connect(_invalidate_membership_principals, sender=get_user_model().groups.through,
+                        dispatch_uid='principal_cache_groups_changed')
@@ -0,0 +1 @@
+# Test package for the authentication app
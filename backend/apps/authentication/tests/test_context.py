@@ -0,0 +1,120 @@
+import time
+from unittest import mock
+
+import jwt
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.test import RequestFactory, TestCase, override_settings
+from ninja.errors import AuthenticationError
+
+from apps.authentication.context import AuthContext, get_auth_context, request_stats
+from apps.authentication.jwt_auth import JWTAuth
+from apps.authentication.models import UserProfile
+from apps.authentication.principal import get_principal_cache
+from apps.authentication.token_cache import get_token_cache
+from apps.users.profile_snapshot import get_profile_cache
+
+User = get_user_model()
+
+
+class AuthContextTest(TestCase):
+    def test_recalls_only_the_same_token(self):
+        context = AuthContext()
+        self.assertFalse(context.recall("token-a"))
+        context.remember("token-a", user="aroha")
+        self.assertTrue(context.recall("token-a"))
+        self.assertFalse(context.recall("token-b"))
+        self.assertEqual(context.result(), "aroha")
+        self.assertEqual(context.memo_hits, 1)
+
+    def test_result_reraises_the_remembered_error(self):
+        context = AuthContext()
+        error = ValueError("bad token")
+        context.remember("token-a", error=error)
+        with self.assertRaises(ValueError) as raised:
+            context.result()
+        self.assertIs(raised.exception, error)
+
+    def test_measure_counts_queries_and_passes(self):
+        context = AuthContext()
+        with context.measure(authentication_pass=True):
+            User.objects.count()
+            User.objects.exists()
+        with context.measure():
+            User.objects.count()
+        self.assertEqual(context.as_dict(), {"auth_passes": 1, "memo_hits": 0, "queries": 3})
+
+
+@override_settings(JWT_AUTH={**settings.JWT_AUTH, 'EXPOSE_AUTH_COST_HEADERS': True})
+class RequestAuthenticationTest(TestCase):
+    """The middleware and the Ninja ``auth=JWTAuth()`` on /profile share one authentication pass."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="aroha@example.org", email="aroha@example.org")
+        UserProfile.objects.create(user=self.user, azure_oid="oid-1")
+        for cache in (get_token_cache(), get_principal_cache(), get_profile_cache()):
+            cache.clear()
+            self.addCleanup(cache.clear)
+        request_stats.reset()
+        self.addCleanup(request_stats.reset)
+
+        claims = {"oid": "oid-1", "upn": "aroha@example.org", "groups": [], "exp": time.time() + 600}
+        signing_key = mock.patch(
+            "apps.authentication.jwks.JWKSManager.get_signing_key_from_jwt",
+            return_value=mock.Mock(key="secret"),
+        )
+        decode = mock.patch("apps.authentication.jwt_auth.jwt.decode", return_value=claims)
+        self.get_signing_key = signing_key.start()
+        self.decode = decode.start()
+        self.addCleanup(signing_key.stop)
+        self.addCleanup(decode.stop)
+
+    def get_profile(self, token="token-a"):
+        return self.client.get("/api/v1/profile", HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    def test_one_decode_and_lookup_per_request(self):
+        with mock.patch.object(JWTAuth, "_authenticate", autospec=True, side_effect=JWTAuth._authenticate) as authenticate:
+            response = self.get_profile()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["username"], "aroha@example.org")
+        self.assertEqual(authenticate.call_count, 1)
+        self.assertEqual(self.get_signing_key.call_count, 1)
+        self.assertEqual(self.decode.call_count, 1)
+        # The Ninja auth reused the middleware's result without consulting the token cache.
+        self.assertEqual(get_token_cache().stats()["hits"], 0)
+
+        self.assertEqual(response["X-Auth-Passes"], "1")
+        self.assertEqual(response["X-Auth-Memo-Hits"], "1")
+        self.assertGreater(int(response["X-Auth-Queries"]), 0)
+        stats = request_stats.stats()
+        self.assertEqual(stats["requests"], 1)
+        self.assertEqual(stats["auth_passes"], 1)
+        self.assertEqual(stats["max_passes_per_request"], 1)
+
+    def test_failed_authentication_is_not_retried(self):
+        self.decode.side_effect = jwt.DecodeError("Not enough segments")
+        request = RequestFactory().get("/api/v1/profile")
+        auth = JWTAuth()
+        with self.assertRaises(AuthenticationError) as first:
+            auth.authenticate(request, "token-a")
+        with self.assertRaises(AuthenticationError) as second:
+            auth.authenticate(request, "token-a")
+        self.assertIs(second.exception, first.exception)
+        self.assertEqual(self.decode.call_count, 1)
+        self.assertEqual(get_auth_context(request).as_dict(), {"auth_passes": 1, "memo_hits": 1, "queries": 0})
+
+    def test_each_request_gets_its_own_context(self):
+        self.get_profile()
+        response = self.get_profile()
+        self.assertEqual(response["X-Auth-Passes"], "1")
+        # The second request's pass is answered by the verified-token cache.
+        self.assertEqual(self.decode.call_count, 1)
+        self.assertEqual(response["X-Auth-Queries"], "0")
+        self.assertEqual(request_stats.stats()["requests"], 2)
+
+    @override_settings(JWT_AUTH={**settings.JWT_AUTH, 'EXPOSE_AUTH_COST_HEADERS': False})
+    def test_cost_headers_are_opt_in(self):
+        response = self.get_profile()
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("X-Auth-Passes", response)
+        self.assertEqual(request_stats.stats()["requests"], 1)
@@ -0,0 +1,45 @@
+from django.test import SimpleTestCase
+
+from apps.authentication.graph_groups import GraphGroupResolver
+
+
+class FakeGraph:
+    """Transport serving canned pages keyed by URL."""
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.calls = []
+
+    def __call__(self, url, headers, timeout):
+        self.calls.append((url, headers["Authorization"]))
+        return self.pages[url]
+
+
+BASE = "https://graph.microsoft.com/v1.0"
+FIRST = f"{BASE}/me/memberOf?$select=id&$top=999"
+
+
+class GraphGroupResolverTest(SimpleTestCase):
+    def test_follows_next_links_on_the_graph_host(self):
+        transport = FakeGraph({
+            FIRST: (200, {"value": [{"id": "g1"}], "@odata.nextLink": f"{BASE}/me/memberOf?$skiptoken=2"}),
+            f"{BASE}/me/memberOf?$skiptoken=2": (200, {"value": [{"id": "g2"}]}),
+        })
+        resolver = GraphGroupResolver(transport=transport)
+        self.assertEqual(resolver.resolve("oid-1", "secret"), ["g1", "g2"])
+        self.assertEqual(resolver.resolve("oid-1", "secret"), ["g1", "g2"])
+        self.assertEqual(len(transport.calls), 2)
+
+    def test_does_not_send_the_token_to_another_host(self):
+        for next_link in ("https://evil.example.com/v1.0/me/memberOf", "http://graph.microsoft.com/v1.0/me/memberOf",
+                          "https://graph.microsoft.com.evil.example.com/v1.0/me/memberOf"):
+            transport = FakeGraph({FIRST: (200, {"value": [{"id": "g1"}], "@odata.nextLink": next_link})})
+            resolver = GraphGroupResolver(transport=transport)
+            with self.assertLogs("apps.authentication.graph_groups", "WARNING"):
+                self.assertEqual(resolver.resolve("oid-1", "secret"), ["g1"])
+            self.assertEqual([url for url, _ in transport.calls], [FIRST])
+
+    def test_error_serves_empty_list(self):
+        resolver = GraphGroupResolver(transport=FakeGraph({FIRST: (503, {})}))
+        self.assertEqual(resolver.resolve("oid-1", "secret"), [])
+        self.assertEqual(resolver.stats()["failures"], 1)
@@ -0,0 +1,62 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.test import TestCase
+
+from apps.authentication.group_sync import sync_user_groups
+from apps.authentication.principal import get_principal_cache
+from apps.users.permission_matrix import get_permission_matrix, get_user_permissions
+
+User = get_user_model()
+
+
+class SyncUserGroupsTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="aroha", email="aroha@example.org")
+        self.existing = Group.objects.create(name="group-existing")
+
+    def group_names(self):
+        return sorted(self.user.groups.values_list("name", flat=True))
+
+    def test_adds_memberships_and_creates_missing_groups(self):
+        result = sync_user_groups(self.user, ["group-existing", "group-new", ""])
+        self.assertEqual(result.added, ["group-existing", "group-new"])
+        self.assertEqual(result.removed, [])
+        self.assertTrue(result.changed)
+        self.assertEqual(self.group_names(), ["group-existing", "group-new"])
+        self.assertTrue(Group.objects.filter(name="group-new").exists())
+
+    def test_in_sync_user_costs_one_query(self):
+        self.user.groups.add(self.existing)
+        with self.assertNumQueries(1):
+            result = sync_user_groups(self.user, ["group-existing"])
+        self.assertFalse(result.changed)
+
+    def test_stale_memberships_kept_unless_requested(self):
+        self.user.groups.add(self.existing)
+        result = sync_user_groups(self.user, ["group-new"])
+        self.assertEqual(result.removed, [])
+        self.assertEqual(self.group_names(), ["group-existing", "group-new"])
+
+        result = sync_user_groups(self.user, ["group-new"], remove_stale=True)
+        self.assertEqual(result.added, [])
+        self.assertEqual(result.removed, ["group-existing"])
+        self.assertEqual(self.group_names(), ["group-new"])
+        self.assertTrue(Group.objects.filter(name="group-existing").exists())
+
+    def test_overlong_group_names_are_ignored(self):
+        result = sync_user_groups(self.user, ["x" * 151, "group-existing"])
+        self.assertEqual(result.added, ["group-existing"])
+
+    def test_caches_are_invalidated_after_commit(self):
+        cache = get_principal_cache()
+        cache.clear()
+        self.addCleanup(cache.clear)
+        cache.resolve(self.user, [])
+        self.assertFalse(get_user_permissions(self.user).in_group("group-existing"))
+        version = get_permission_matrix().version
+
+        with self.captureOnCommitCallbacks(execute=True):
+            sync_user_groups(self.user, ["group-existing"])
+        self.assertEqual(cache.stats()["size"], 0)
+        self.assertEqual(get_permission_matrix().version, version)
+        self.assertTrue(get_user_permissions(self.user).in_group("group-existing"))
@@ -0,0 +1,120 @@
+import json
+import os
+import tempfile
+from unittest import mock
+
+from django.test import SimpleTestCase
+from jwt.exceptions import PyJWKClientError
+
+from apps.authentication.jwks import JWKSManager
+
+JWKS_URI = "https://login.example.com/discovery/keys"
+
+
+def jwk_set(*kids):
+    return {"keys": [{"kty": "oct", "kid": kid, "k": "c2VjcmV0LWtleS1mb3ItdGVzdHM"} for kid in kids]}
+
+
+class FakeResponse:
+    def __init__(self, payload):
+        self.payload = payload
+
+    def raise_for_status(self):
+        if isinstance(self.payload, Exception):
+            raise self.payload
+
+    def json(self):
+        return self.payload
+
+
+class FakeSession:
+    """Serves whatever key set ``payload`` holds; an exception payload fails the fetch."""
+
+    def __init__(self, payload):
+        self.payload = payload
+        self.calls = 0
+
+    def get(self, url, timeout):
+        self.calls += 1
+        return FakeResponse(self.payload)
+
+
+class JWKSManagerTest(SimpleTestCase):
+    def manager(self, payload, **kwargs):
+        kwargs.setdefault("background_refresh", False)
+        manager = JWKSManager(JWKS_URI, **kwargs)
+        manager._session = FakeSession(payload)
+        self.addCleanup(manager.stop)
+        return manager
+
+    def test_loads_key_file_without_fetching(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as f:
+            json.dump(jwk_set("file-key"), f)
+        self.addCleanup(os.unlink, f.name)
+        manager = JWKSManager(JWKS_URI, key_file=f.name, background_refresh=False)
+        manager._session = FakeSession(jwk_set("live-key"))
+
+        self.assertEqual(manager.get_signing_key("file-key").key_id, "file-key")
+        self.assertEqual(manager._session.calls, 0)
+        self.assertEqual(manager.source, f"file:{f.name}")
+        # The file set stays stale until the live set has been fetched once.
+        self.assertTrue(manager.is_stale())
+        self.assertTrue(manager.refresh())
+        self.assertFalse(manager.is_stale())
+
+    def test_stale_keys_are_served_while_refresher_is_nudged(self):
+        manager = self.manager(jwk_set("a"), refresh_interval=60)
+        manager.refresh()
+        manager.loaded_at -= 120
+        with mock.patch.object(manager, "_refresher_running", return_value=True):
+            self.assertEqual(manager.get_signing_key("a").key_id, "a")
+        self.assertEqual(manager._session.calls, 1)
+        self.assertTrue(manager._wake.is_set())
+
+    def test_unknown_kid_refetches_are_rate_limited(self):
+        manager = self.manager(jwk_set("a"), unknown_kid_interval=60)
+        manager.refresh()
+        with self.assertRaises(PyJWKClientError):
+            manager.get_signing_key("b")
+        self.assertEqual((manager._session.calls, manager.unknown_kid_refetches), (2, 1))
+
+        manager._session.payload = jwk_set("a", "b")
+        with self.assertRaises(PyJWKClientError):
+            manager.get_signing_key("b")
+        self.assertEqual((manager._session.calls, manager.rate_limited), (2, 1))
+
+        manager._last_unknown_kid_fetch -= 60
+        self.assertEqual(manager.get_signing_key("b").key_id, "b")
+        self.assertEqual(manager._session.calls, 3)
+
+    def test_cold_start_fetches_inline_and_backs_off_on_failure(self):
+        manager = self.manager(ConnectionError("unreachable"))
+        with self.assertLogs("apps.authentication.jwks", "ERROR"), self.assertRaises(PyJWKClientError):
+            manager.get_signing_key("a")
+        with self.assertRaises(PyJWKClientError):
+            manager.get_signing_key("a")
+        self.assertEqual((manager._session.calls, manager.failures, manager.rate_limited), (1, 1, 1))
+
+        manager._session.payload = jwk_set("a")
+        manager._last_attempt -= 60
+        self.assertEqual(manager.get_signing_key("a").key_id, "a")
+        self.assertEqual(manager.stats()["keys"], 1)
+
+    def test_refresher_restarts_after_fork(self):
+        manager = self.manager(jwk_set("a"), background_refresh=True)
+        manager.refresh()
+        manager.get_signing_key("a")
+        parent_thread = manager._thread
+        # Stop the "parent" refresher too; the reset gives the child new events.
+        self.addCleanup(manager._wake.set)
+        self.addCleanup(manager._stop.set)
+        self.assertTrue(manager._refresher_running())
+
+        with mock.patch("apps.authentication.jwks.os.getpid", return_value=os.getpid() + 1):
+            self.assertFalse(manager._refresher_running())
+            self.assertEqual(manager.get_signing_key("a").key_id, "a")
+            self.assertTrue(manager._refresher_running())
+            self.assertIsNot(manager._thread, parent_thread)
+            self.assertEqual(manager._pid, os.getpid())
+        # The child keeps serving the inherited key set.
+        self.assertEqual(manager.stats()["keys"], 1)
@@ -0,0 +1,74 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from apps.authentication.principal import PrincipalCache, get_principal_cache
+from apps.users.models import GroupRoleMapping, Role, UserProfile
+
+User = get_user_model()
+
+
+class PrincipalCacheTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="aroha", email="aroha@example.org")
+        self.admin = Role.objects.create(name="Admin", level=1)
+        self.staff = Role.objects.create(name="Staff", level=3)
+        GroupRoleMapping.objects.create(azure_ad_group_id="group-staff", role=self.staff, created_by=self.user)
+        # The signal receivers act on the process-wide cache.
+        self.cache = get_principal_cache()
+        self.cache.clear()
+        self.addCleanup(self.cache.clear)
+
+    def test_build_resolves_and_persists_the_role(self):
+        principal = self.cache.resolve(self.user, ["group-staff"])
+        self.assertEqual(principal.role, self.staff)
+        profile = UserProfile.objects.get(user=self.user)
+        self.assertEqual(profile.role_id, self.staff.id)
+        self.assertEqual(profile.azure_ad_groups, ["group-staff"])
+
+    def test_hit_needs_no_queries_and_copies_the_profile(self):
+        first = self.cache.resolve(self.user, ["group-staff"])
+        with self.assertNumQueries(0):
+            second = self.cache.resolve(self.user, ["group-staff"])
+        self.assertEqual(second.profile.pk, first.profile.pk)
+        self.assertIsNot(second.profile, first.profile)
+        self.assertIs(second.user.profile, second.profile)
+
+        second.profile.title = "Kaimahi"
+        second.profile.azure_ad_groups.append("edited")
+        third = self.cache.resolve(self.user, ["group-staff"])
+        self.assertIsNone(third.profile.title)
+        self.assertEqual(third.profile.azure_ad_groups, ["group-staff"])
+        self.assertEqual(self.cache.stats()["hits"], 2)
+
+    def test_changed_group_claim_rebuilds(self):
+        self.cache.resolve(self.user, ["group-staff"])
+        principal = self.cache.resolve(self.user, [])
+        self.assertIsNone(principal.role)
+        self.assertEqual(self.cache.stats()["rebuilds"], 1)
+
+    def test_profile_save_invalidates_the_user(self):
+        principal = self.cache.resolve(self.user, ["group-staff"])
+        principal.profile.title = "Kaimahi"
+        principal.profile.save()
+        self.assertEqual(self.cache.stats()["size"], 0)
+        self.assertEqual(self.cache.resolve(self.user, ["group-staff"]).profile.title, "Kaimahi")
+
+    def test_role_and_mapping_changes_invalidate_everyone(self):
+        self.cache.resolve(self.user, ["group-staff"])
+        version = self.cache.stats()["version"]
+        GroupRoleMapping.objects.create(azure_ad_group_id="group-staff", role=self.admin, created_by=self.user)
+        self.assertGreater(self.cache.stats()["version"], version)
+        self.assertEqual(self.cache.resolve(self.user, ["group-staff"]).role, self.admin)
+
+        version = self.cache.stats()["version"]
+        self.admin.description = "Administrators"
+        self.admin.save()
+        self.assertGreater(self.cache.stats()["version"], version)
+        self.assertEqual(self.cache.stats()["size"], 0)
+
+    def test_zero_size_cache_stores_nothing(self):
+        cache = PrincipalCache(max_size=0)
+        first = cache.resolve(self.user, ["group-staff"])
+        second = cache.resolve(self.user, ["group-staff"])
+        self.assertIsNot(first, second)
+        self.assertEqual(cache.stats()["misses"], 2)
@@ -0,0 +1,85 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from apps.authentication.token_cache import VerifiedTokenCache, get_token_cache
+
+User = get_user_model()
+
+NOW = 1_700_000_000.0
+
+
+class VerifiedTokenCacheTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="aroha", email="aroha@example.org")
+        self.other = User.objects.create_user(username="tama", email="tama@example.org")
+        self.clock = mock.patch("apps.authentication.token_cache.time.time", return_value=NOW)
+        self.time = self.clock.start()
+        self.addCleanup(self.clock.stop)
+
+    def claims(self, exp):
+        return {"oid": "oid-1", "exp": exp}
+
+    def test_hit_returns_a_copy_of_the_user(self):
+        cache = VerifiedTokenCache(max_size=4)
+        cache.set("token-a", self.claims(NOW + 600), self.user, ["group-1"])
+        user = cache.get("token-a").get_user()
+        self.assertEqual(user.pk, self.user.pk)
+        self.assertIsNot(user, self.user)
+        self.assertEqual(user._azure_ad_groups_from_token, ["group-1"])
+        self.assertEqual(cache.stats()["hits"], 1)
+
+    def test_entry_expires_with_the_token(self):
+        cache = VerifiedTokenCache(max_size=4, max_ttl=3600)
+        cache.set("token-a", self.claims(NOW + 60), self.user, [])
+        self.time.return_value = NOW + 59
+        self.assertIsNotNone(cache.get("token-a"))
+        self.time.return_value = NOW + 60
+        self.assertIsNone(cache.get("token-a"))
+        self.assertEqual(cache.stats()["size"], 0)
+
+    def test_entry_is_trusted_for_at_most_max_ttl(self):
+        cache = VerifiedTokenCache(max_size=4, max_ttl=30)
+        cache.set("token-a", self.claims(NOW + 3600), self.user, [])
+        self.time.return_value = NOW + 31
+        self.assertIsNone(cache.get("token-a"))
+
+    def test_expired_token_is_not_cached(self):
+        cache = VerifiedTokenCache(max_size=4)
+        cache.set("token-a", self.claims(NOW - 1), self.user, [])
+        cache.set("token-b", {"oid": "oid-1"}, self.user, [])
+        self.assertEqual(cache.stats()["size"], 0)
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = VerifiedTokenCache(max_size=2)
+        cache.set("token-a", self.claims(NOW + 600), self.user, [])
+        cache.set("token-b", self.claims(NOW + 600), self.user, [])
+        cache.get("token-a")
+        cache.set("token-c", self.claims(NOW + 600), self.user, [])
+        self.assertIsNotNone(cache.get("token-a"))
+        self.assertIsNone(cache.get("token-b"))
+        self.assertIsNotNone(cache.get("token-c"))
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    def test_invalidate_user_drops_only_their_tokens(self):
+        cache = VerifiedTokenCache(max_size=4)
+        cache.set("token-a", self.claims(NOW + 600), self.user, [])
+        cache.set("token-b", self.claims(NOW + 600), self.other, [])
+        self.assertEqual(cache.invalidate_user(self.user.pk), 1)
+        self.assertIsNone(cache.get("token-a"))
+        self.assertIsNotNone(cache.get("token-b"))
+
+    def test_disabled_cache_stores_nothing(self):
+        cache = VerifiedTokenCache(max_size=0)
+        cache.set("token-a", self.claims(NOW + 600), self.user, [])
+        self.assertIsNone(cache.get("token-a"))
+
+    def test_saving_the_user_evicts_their_tokens(self):
+        cache = get_token_cache()
+        cache.clear()
+        self.addCleanup(cache.clear)
+        cache.set("token-a", self.claims(NOW + 600), self.user, [])
+        self.user.is_active = False
+        self.user.save()
+        self.assertIsNone(cache.get("token-a"))
@@ -0,0 +1,226 @@
+"""
+Verified-token cache for JWT authentication.
+
+A bearer token that has already passed signature, audience and issuer checks
+is remembered (keyed on a SHA-256 of the raw token) until the token's own
+``exp``. Repeat requests with the same token then skip the JWKS lookup, the
+RS256 decode and the user provisioning queries in ``JWTAuth.authenticate``.
+
+Two tiers are used:
+- a process-local LRU holding the decoded claims and a snapshot of the user
+- an optional shared Django cache (``JWT_AUTH['TOKEN_CACHE_BACKEND']``) holding
+  the claims and the user's primary key, so other workers can skip the decode
+"""
+import copy
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db.models.signals import post_delete, post_save
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_SIZE = 1024
+# Upper bound on how long a process-local entry is trusted, so that changes to
+# the user row (e.g. deactivation) in another worker are picked up eventually.
+DEFAULT_MAX_TTL = 300
+SHARED_KEY_PREFIX = 'jwt:verified:'
+
+
+def hash_token(token: str) -> str:
+    """Return the cache key for a raw bearer token. The token itself is never stored."""
+    return hashlib.sha256(token.encode('utf-8')).hexdigest()
+
+
+class VerifiedToken:
+    """Cached result of a successful token validation."""
+    __slots__ = ('claims', 'user', 'azure_groups', 'expires_at')
+
+    def __init__(self, claims: Dict[str, Any], user, azure_groups: List[str], expires_at: float):
+        self.claims = claims
+        self.user = user
+        self.azure_groups = azure_groups
+        self.expires_at = expires_at
+
+    def get_user(self):
+        """Return a per-request copy of the cached user so callers can set attributes on it."""
+        user = copy.copy(self.user)
+        user._azure_ad_groups_from_token = list(self.azure_groups)
+        user._azure_oid = self.claims.get('oid')
+        return user
+
+
+class VerifiedTokenCache:
+    """Thread-safe LRU of verified tokens with an optional shared backend."""
+
+    def __init__(self, max_size: int = DEFAULT_CACHE_SIZE, max_ttl: int = DEFAULT_MAX_TTL,
+                 backend_alias: Optional[str] = None):
+        self.max_size = max_size
+        self.max_ttl = max_ttl
+        self.backend_alias = backend_alias
+        self._entries: 'OrderedDict[str, VerifiedToken]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.shared_hits = 0
+        self.evictions = 0
+
+    @classmethod
+    def from_settings(cls) -> 'VerifiedTokenCache':
+        config = getattr(settings, 'JWT_AUTH', {})
+        return cls(
+            max_size=config.get('TOKEN_CACHE_SIZE', DEFAULT_CACHE_SIZE),
+            max_ttl=config.get('TOKEN_CACHE_MAX_TTL', DEFAULT_MAX_TTL),
+            backend_alias=config.get('TOKEN_CACHE_BACKEND') or None,
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0
+
+    def _shared_backend(self):
+        if not self.backend_alias:
+            return None
+        try:
+            return caches[self.backend_alias]
+        except Exception as e:
+            logger.warning(f"Shared token cache backend '{self.backend_alias}' unavailable: {e}")
+            return None
+
+    def get(self, token: str) -> Optional[VerifiedToken]:
+        """Return the cached validation for ``token`` or None if it is unknown or expired."""
+        if not self.enabled:
+            return None
+        key = hash_token(token)
+        now = time.time()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry.expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry
+                del self._entries[key]
+
+        entry = self._get_shared(key, now)
+        with self._lock:
+            if entry is not None:
+                self.shared_hits += 1
+                self._store(key, entry)
+            else:
+                self.misses += 1
+        return entry
+
+    def _get_shared(self, key: str, now: float) -> Optional[VerifiedToken]:
+        backend = self._shared_backend()
+        if backend is None:
+            return None
+        try:
+            data = backend.get(SHARED_KEY_PREFIX + key)
+        except Exception as e:
+            logger.warning(f"Shared token cache read failed: {e}")
+            return None
+        if not data or data.get('exp', 0) <= now:
+            return None
+
+        User = get_user_model()
+        try:
+            user = User.objects.get(pk=data['user_id'], is_active=True)
+        except User.DoesNotExist:
+            return None
+        return VerifiedToken(data['claims'], user, data.get('azure_groups', []),
+                             self._local_expiry(data['exp'], now))
+
+    def _local_expiry(self, exp: float, now: float) -> float:
+        return min(exp, now + self.max_ttl)
+
+    def set(self, token: str, claims: Dict[str, Any], user, azure_groups: List[str]) -> None:
+        """Remember a successfully validated token until its ``exp`` claim."""
+        if not self.enabled:
+            return
+        exp = claims.get('exp')
+        now = time.time()
+        if not isinstance(exp, (int, float)) or exp <= now:
+            return
+        key = hash_token(token)
+        entry = VerifiedToken(claims, copy.copy(user), list(azure_groups), self._local_expiry(exp, now))
+        with self._lock:
+            self._store(key, entry)
+
+        backend = self._shared_backend()
+        if backend is not None:
+            try:
+                backend.set(
+                    SHARED_KEY_PREFIX + key,
+                    {'claims': claims, 'user_id': str(user.pk), 'azure_groups': list(azure_groups), 'exp': exp},
+                    timeout=max(1, int(exp - now)),
+                )
+            except Exception as e:
+                logger.warning(f"Shared token cache write failed: {e}")
+
+    def _store(self, key: str, entry: VerifiedToken) -> None:
+        # Caller must hold self._lock.
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate_user(self, user_pk) -> int:
+        """Drop every process-local entry that belongs to ``user_pk``."""
+        with self._lock:
+            stale = [key for key, entry in self._entries.items() if entry.user.pk == user_pk]
+            for key in stale:
+                del self._entries[key]
+        return len(stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.shared_hits = self.evictions = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.shared_hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'shared_hits': self.shared_hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_ratio': round((self.hits + self.shared_hits) / lookups, 4) if lookups else 0.0,
+                'shared_backend': self.backend_alias,
+            }
+
+
+_token_cache: Optional[VerifiedTokenCache] = None
+_token_cache_lock = threading.Lock()
+
+
+def get_token_cache() -> VerifiedTokenCache:
+    """Return the process-wide verified-token cache, creating it from settings on first use."""
+    global _token_cache
+    if _token_cache is None:
+        with _token_cache_lock:
+            if _token_cache is None:
+                _token_cache = VerifiedTokenCache.from_settings()
+    return _token_cache
+
+
+def _invalidate_user_tokens(sender, instance, **kwargs):
+    get_token_cache().invalidate_user(instance.pk)
+
+
+def connect_signals() -> None:
+    """Evict cached tokens whenever the underlying user row changes."""
+    User = get_user_model()
+    post_save.connect(_invalidate_user_tokens, sender=User, dispatch_uid='jwt_token_cache_user_saved')
+    post_delete.connect(_invalidate_user_tokens, sender=User, dispatch_uid='jwt_token_cache_user_deleted')
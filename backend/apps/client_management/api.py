@@ -2,8 +2,7 @@ from typing import List
 from django.shortcuts import get_object_or_404
 from django.core.exceptions import ValidationError
 from django.http import Http404
-from django.db import models
-from ninja import Router
+from ninja import Query, Router
 from ninja.pagination import paginate
 from ninja.errors import HttpError
 
@@ -17,7 +16,10 @@ from .schemas import (
     ClientStatsSchema
 )
 from .services import ClientService
+from apps.common.changes import add_changes_endpoint
+from apps.common.pagination import KeysetPagination
 from apps.common.schemas import MessageSchema
+from apps.authentication.decorators import auth_required
 
 
 def serialize_client_for_detail(client: Client) -> dict:
@@ -83,12 +85,20 @@ def serialize_client_for_list(client: Client) -> dict:
 # Create the main router for client management
 router = Router(tags=["Clients"])
 
+# Registered first so "/changes" isn't captured by "/{client_id}".
+add_changes_endpoint(
+    router, Client, ClientListSchema,
+    queryset=lambda: Client.all_objects.select_related('status', 'primary_language'),
+    auth=auth_required,
+)
+
 
 @router.get("/", response=List[ClientListSchema], summary="List clients")
-@paginate
-def list_clients(request, filters: ClientSearchSchema = None):
+@paginate(KeysetPagination)
+def list_clients(request, filters: ClientSearchSchema = Query(default=ClientSearchSchema())):
     """
-    List clients with optional filtering and pagination.
+    List clients with optional filtering, one page at a time (``limit``, ``cursor``).
+    Results are ordered by name, or best match first when searching.
     
     Supports filtering by:
     - Text search (name, email, phone)
@@ -96,17 +106,7 @@ def list_clients(request, filters: ClientSearchSchema = None):
     - Age range
     - Boolean flags (interpreter needed, consent required, etc.)
     """
-    if filters is None:
-        filters = ClientSearchSchema()
-    
-    # Get pagination parameters from request
-    limit = int(request.GET.get('limit', 25))
-    offset = int(request.GET.get('offset', 0))
-    
-    clients, total_count = ClientService.search_clients(filters, limit, offset)
-    
-    # The @paginate decorator will handle the pagination wrapper
-    return clients
+    return ClientService.search_clients(filters)
 
 
 @router.post("/", response=ClientDetailSchema, summary="Create client")
@@ -238,15 +238,8 @@ def get_search_suggestions(request, query: str = ""):
     if len(query) < 2:
         return []
     
-    # Search for clients matching the query
-    clients = Client.objects.filter(
-        models.Q(first_name__icontains=query) |
-        models.Q(last_name__icontains=query) |
-        models.Q(preferred_name__icontains=query)
-    ).distinct()[:10]
-    
     suggestions = []
-    for client in clients:
+    for client in ClientService.search_suggestions(query):
         suggestions.append(f"{client.display_name} ({client.id})")
     
     return suggestions
\ No newline at end of file
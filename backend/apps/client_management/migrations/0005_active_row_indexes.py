@@ -0,0 +1,19 @@
+# Generated by Django 5.0.14 on 2026-10-16 22:47
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('client_management', '0004_update_primary_language_to_reference_data'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='client',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['last_name', 'first_name'], name='client_management_a9eef662_act'),
+        ),
+    ]
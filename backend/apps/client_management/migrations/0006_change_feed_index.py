@@ -0,0 +1,17 @@
+# Generated by Django 5.0.14 on 2026-10-16 23:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('client_management', '0005_active_row_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='client',
+            index=models.Index(fields=['updated_at', 'id'], name='client_management_f4f7fc85_chg'),
+        ),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 5.0.14 on 2026-10-16 23:40
+
+import re
+import unicodedata
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+
+BACKFILL_BATCH_SIZE = 2000
+
+# Frozen copy of apps.client_management.search as of this migration, so later
+# changes to the live normaliser can't change what this migration does.
+NON_DIGIT_RE = re.compile(r'\D')
+
+
+def normalise(value):
+    if not value:
+        return ''
+    decomposed = unicodedata.normalize('NFKD', value)
+    stripped = ''.join(char for char in decomposed if not unicodedata.combining(char))
+    return ' '.join(stripped.lower().split())
+
+
+def build_search_text(first_name=None, last_name=None, preferred_name=None, email=None, phone=None):
+    words = normalise(' '.join(filter(None, [first_name, last_name, preferred_name, email]))).split()
+    digits = NON_DIGIT_RE.sub('', phone or '')
+    if digits:
+        words.append(digits)
+    return ''.join(f' {word}' for word in words)
+
+
+def backfill_search_text(apps, schema_editor):
+    Client = apps.get_model('client_management', 'Client')
+    fields = ['first_name', 'last_name', 'preferred_name', 'email', 'phone']
+    batch = []
+    for client in Client._base_manager.only('id', *fields).iterator(chunk_size=BACKFILL_BATCH_SIZE):
+        client.search_text = build_search_text(*(getattr(client, field) for field in fields))
+        batch.append(client)
+        if len(batch) >= BACKFILL_BATCH_SIZE:
+            Client._base_manager.bulk_update(batch, ['search_text'])
+            batch = []
+    if batch:
+        Client._base_manager.bulk_update(batch, ['search_text'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('client_management', '0006_change_feed_index'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name='client',
+            name='search_text',
+            field=models.TextField(blank=True, default='', editable=False, help_text='Normalised names, email and phone digits used by client search', verbose_name='Search Text'),
+        ),
+        migrations.RunPython(backfill_search_text, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='client',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_text'], name='client_search_text_trgm', opclasses=['gin_trgm_ops']),
+        ),
+    ]
@@ -1,9 +1,12 @@
+from django.contrib.postgres.indexes import GinIndex
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 from apps.common.models import UUIDPKBaseModel
 from apps.optionlists.models import OptionListItem
 from apps.reference_data.models import Language
 
+from .search import SEARCH_SOURCE_FIELDS, build_search_text
+
 
 class Client(UUIDPKBaseModel):
     """
@@ -137,6 +140,15 @@ class Client(UUIDPKBaseModel):
         help_text=_('Additional data fields for future extensions')
     )
 
+    # Maintained by save(); see apps.client_management.search
+    search_text = models.TextField(
+        blank=True,
+        default='',
+        editable=False,
+        verbose_name=_('Search Text'),
+        help_text=_('Normalised names, email and phone digits used by client search')
+    )
+
     def __str__(self) -> str:
         if self.preferred_name:
             return f"{self.preferred_name} {self.last_name}"
@@ -154,6 +166,19 @@ class Client(UUIDPKBaseModel):
             return f"{self.preferred_name} {self.last_name}"
         return self.full_name
 
+    def refresh_search_text(self) -> None:
+        """Rebuild ``search_text``; needed before ``bulk_create``/``bulk_update``, which bypass save()."""
+        self.search_text = build_search_text(
+            self.first_name, self.last_name, self.preferred_name, self.email, self.phone,
+        )
+
+    def save(self, *args, **kwargs):
+        self.refresh_search_text()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and SEARCH_SOURCE_FIELDS.intersection(update_fields):
+            kwargs['update_fields'] = {*update_fields, 'search_text'}
+        super().save(*args, **kwargs)
+
     def get_age(self) -> int:
         """Calculate current age based on date of birth."""
         from datetime import date
@@ -172,4 +197,6 @@ class Client(UUIDPKBaseModel):
             models.Index(fields=['date_of_birth']),
             models.Index(fields=['primary_language']),
             models.Index(fields=['risk_level']),
+            # Trigram index for substring and word-prefix search (needs pg_trgm).
+            GinIndex(fields=['search_text'], opclasses=['gin_trgm_ops'], name='client_search_text_trgm'),
         ]
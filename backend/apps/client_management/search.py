@@ -0,0 +1,97 @@
+"""
+Ranked client search over a normalised search column.
+
+``Client.search_text`` holds every searchable value of a client in one
+lower-case, accent-free string. Each word is prefixed by a space, and phone
+numbers are stored as bare digits:
+
+    " aroha te whatu aroha.tewhatu@example.org 0215550123"
+
+The model keeps the column up to date on save. On PostgreSQL it carries a
+``pg_trgm`` GIN index, which serves both query shapes used here from the index
+instead of scanning the table:
+
+* Substring match: ``search_text LIKE '%term%'``, for terms of three or more
+  characters. Trigrams need three characters to be selective.
+* Word prefix (typeahead): ``search_text LIKE '% te%'``. The leading space
+  anchors the term to the start of a word, and pg_trgm indexes word starts, so
+  one- and two-character prefixes are indexed too.
+
+Every word of the term must match. Phone-like terms ("021 555-0123",
+"+64 21 555") are reduced to their digits first. Matches are ranked by
+``word_similarity()`` on PostgreSQL, and by name on other backends.
+"""
+import re
+import unicodedata
+from typing import Iterable, List, Optional
+
+from django.contrib.postgres.search import TrigramWordSimilarity
+from django.db import connection
+from django.db.models import Q, QuerySet
+
+# Client fields folded into ``search_text``; saving any of them rebuilds it.
+SEARCH_SOURCE_FIELDS = frozenset({'first_name', 'last_name', 'preferred_name', 'email', 'phone'})
+
+# Terms shorter than this match word prefixes only.
+MIN_SUBSTRING_LENGTH = 3
+# Phone-like terms with fewer digits than this are searched as text.
+MIN_PHONE_DIGITS = 3
+
+PHONE_TERM_RE = re.compile(r'^[\d\s()+.-]+$')
+NON_DIGIT_RE = re.compile(r'\D')
+
+
+def normalise(value: Optional[str]) -> str:
+    """Lower-case ``value``, strip accents and macrons, and collapse whitespace."""
+    if not value:
+        return ''
+    decomposed = unicodedata.normalize('NFKD', value)
+    stripped = ''.join(char for char in decomposed if not unicodedata.combining(char))
+    return ' '.join(stripped.lower().split())
+
+
+def phone_digits(value: Optional[str]) -> str:
+    return NON_DIGIT_RE.sub('', value or '')
+
+
+def build_search_text(first_name=None, last_name=None, preferred_name=None, email=None, phone=None) -> str:
+    words = normalise(' '.join(filter(None, [first_name, last_name, preferred_name, email]))).split()
+    digits = phone_digits(phone)
+    if digits:
+        words.append(digits)
+    return ''.join(f' {word}' for word in words)
+
+
+def search_terms(term: Optional[str]) -> List[str]:
+    """The words of a search term as stored in ``search_text``; a phone number is one word of digits."""
+    term = (term or '').strip()
+    if PHONE_TERM_RE.match(term) and len(phone_digits(term)) >= MIN_PHONE_DIGITS:
+        return [phone_digits(term)]
+    return normalise(term).split()
+
+
+def _term_filter(words: Iterable[str], prefix_only: bool) -> Q:
+    condition = Q()
+    for word in words:
+        if prefix_only or len(word) < MIN_SUBSTRING_LENGTH:
+            condition &= Q(search_text__contains=f' {word}')
+        else:
+            condition &= Q(search_text__contains=word)
+    return condition
+
+
+def search(queryset: QuerySet, term: Optional[str], prefix_only: bool = False) -> QuerySet:
+    """
+    Filter ``queryset`` (of clients) to those matching every word of ``term``,
+    best matches first. ``prefix_only`` matches word starts only, for typeahead.
+    An empty term returns ``queryset`` unchanged.
+    """
+    words = search_terms(term)
+    if not words:
+        return queryset
+    queryset = queryset.filter(_term_filter(words, prefix_only))
+    if connection.vendor != 'postgresql':
+        return queryset.order_by('last_name', 'first_name')
+    return queryset.annotate(
+        search_rank=TrigramWordSimilarity(' '.join(words), 'search_text'),
+    ).order_by('-search_rank', 'last_name', 'first_name')
@@ -1,14 +1,19 @@
 from typing import List, Optional, Dict, Any, Tuple
 from datetime import date, timedelta
 from django.db import transaction
-from django.db.models import Q, Count
+from django.db.models import Count, QuerySet
 from django.core.exceptions import ValidationError
+from . import search
 from .models import Client
 from .schemas import ClientCreateSchema, ClientUpdateSchema, ClientSearchSchema
 from apps.optionlists.models import OptionListItem
+from apps.optionlists.validation import InvalidOptionItems, OptionFieldValidator
 from apps.reference_data.models import Language
 
 
+CLIENT_OPTION_FIELDS = OptionFieldValidator({'status': 'client-statuses'})
+
+
 class ClientService:
     """Service layer for client management operations."""
     
@@ -18,11 +23,8 @@ class ClientService:
         with transaction.atomic():
             # Validate status
             try:
-                status = OptionListItem.objects.get(
-                    id=data.status_id,
-                    option_list__slug='client-statuses'
-                )
-            except OptionListItem.DoesNotExist:
+                status = CLIENT_OPTION_FIELDS.resolve({'status': data.status_id})['status']
+            except InvalidOptionItems:
                 raise ValidationError("Invalid status ID provided")
             
             # Validate primary language if provided
@@ -52,12 +54,8 @@ class ClientService:
             # Handle status update
             if data.status_id is not None:
                 try:
-                    status = OptionListItem.objects.get(
-                        id=data.status_id,
-                        option_list__slug='client-statuses'
-                    )
-                    client.status = status
-                except OptionListItem.DoesNotExist:
+                    client.status = CLIENT_OPTION_FIELDS.resolve({'status': data.status_id})['status']
+                except InvalidOptionItems:
                     raise ValidationError("Invalid status ID provided")
             
             # Handle primary language update
@@ -78,20 +76,12 @@ class ClientService:
             return client
     
     @staticmethod
-    def search_clients(search_params: ClientSearchSchema, limit: int = 50, offset: int = 0) -> Tuple[List[Client], int]:
-        """Search clients with filters and pagination."""
+    def search_clients(search_params: ClientSearchSchema) -> QuerySet:
+        """Search clients with filters; the caller paginates the returned queryset."""
         queryset = Client.objects.select_related('status', 'primary_language')
         
-        # Text search across name, email, phone
-        if search_params.search:
-            search_term = search_params.search.strip()
-            queryset = queryset.filter(
-                Q(first_name__icontains=search_term) |
-                Q(last_name__icontains=search_term) |
-                Q(preferred_name__icontains=search_term) |
-                Q(email__icontains=search_term) |
-                Q(phone__icontains=search_term)
-            )
+        # Text search across name, email, phone; ranked best match first
+        queryset = search.search(queryset, search_params.search)
         
         # Status filter
         if search_params.status_id:
@@ -115,14 +105,14 @@ class ClientService:
         if search_params.incomplete_documentation is not None:
             queryset = queryset.filter(incomplete_documentation=search_params.incomplete_documentation)
         
-        # Get total count before pagination
-        total_count = queryset.count()
-        
-        # Apply pagination
-        clients = list(queryset[offset:offset + limit])
-        
-        return clients, total_count
+        return queryset
     
+    @staticmethod
+    def search_suggestions(query: str, limit: int = 10) -> List[Client]:
+        """Typeahead: clients with a name, email or phone starting with each word of ``query``, best first."""
+        queryset = Client.objects.only('id', 'first_name', 'last_name', 'preferred_name')
+        return list(search.search(queryset, query, prefix_only=True)[:limit])
+
     @staticmethod
     def get_client_stats() -> Dict[str, Any]:
         """Get client statistics for dashboard."""
@@ -1,3 +1,143 @@
-from django.test import TestCase
+from datetime import date
 
-# Create your tests here.
+from django.test import TestCase, override_settings
+from ninja.errors import HttpError
+
+from apps.common.pagination import KeysetPagination, encode_cursor, keyset_filter, sort_keys
+from apps.optionlists.models import OptionList, OptionListItem
+
+from .models import Client
+from .schemas import ClientSearchSchema
+from .search import build_search_text, search_terms
+from .services import ClientService
+
+
+class ClientSearchTextTest(TestCase):
+    def test_normalises_names_email_and_phone(self):
+        self.assertEqual(
+            build_search_text("Mere", "Tāwhiri", None, "Mere@Example.org", "+64 (21) 555-0123"),
+            " mere tawhiri mere@example.org 64215550123",
+        )
+
+    def test_phone_terms_become_digits(self):
+        self.assertEqual(search_terms("021 555-0123"), ["0215550123"])
+        self.assertEqual(search_terms("  Te  Whatu "), ["te", "whatu"])
+        self.assertEqual(search_terms("12"), ["12"])
+
+
+class ClientSearchTest(TestCase):
+    def setUp(self):
+        statuses = OptionList.objects.create(name="Client Statuses", slug="client-statuses")
+        status = OptionListItem.objects.create(option_list=statuses, slug="active", name="active", label="Active")
+
+        def client(first_name, last_name, **fields):
+            return Client.objects.create(
+                first_name=first_name, last_name=last_name, date_of_birth=date(1990, 1, 1), status=status, **fields,
+            )
+
+        self.aroha = client("Aroha", "Te Whatu", email="aroha@example.org", phone="021 555 0123")
+        self.mere = client("Mere", "Tāwhiri", preferred_name="Mei")
+        self.john = client("John", "Smith", email="john.smith@mail.example")
+
+    def search(self, term):
+        return [client.first_name for client in ClientService.search_clients(ClientSearchSchema(search=term))]
+
+    def test_substring_and_word_prefix(self):
+        self.assertEqual(self.search("mith"), ["John"])
+        self.assertEqual(self.search("ta"), ["Mere"])  # Short terms match word starts only
+        self.assertEqual(self.search("tawhiri"), ["Mere"])
+        self.assertEqual(self.search("whatu aroha"), ["Aroha"])
+        self.assertEqual(self.search("mei"), ["Mere"])
+
+    def test_phone_digits(self):
+        self.assertEqual(self.search("(021) 555-0123"), ["Aroha"])
+        self.assertEqual(self.search("5550"), ["Aroha"])
+
+    def test_suggestions_match_word_starts(self):
+        self.assertEqual([client.id for client in ClientService.search_suggestions("jo")], [self.john.id])
+        self.assertEqual(ClientService.search_suggestions("ohn"), [])
+
+    def test_search_text_follows_updates(self):
+        self.john.last_name = "Ngata"
+        self.john.save()
+        self.assertEqual(self.search("ngata"), ["John"])
+        self.mere.phone = "09 123 4567"
+        self.mere.save(update_fields=["phone"])
+        self.mere.refresh_from_db()
+        self.assertIn(" 091234567", self.mere.search_text)
+
+
+class ClientKeysetPaginationTest(TestCase):
+    def setUp(self):
+        statuses = OptionList.objects.create(name="Client Statuses", slug="client-statuses")
+        status = OptionListItem.objects.create(option_list=statuses, slug="active", name="active", label="Active")
+        for last_name, first_name in [("Brown", "Ana"), ("Brown", "Ben"), ("Brown", "Cal"), ("Ngata", "Ari"), ("Smith", "Jo")]:
+            Client.objects.create(first_name=first_name, last_name=last_name, date_of_birth=date(1990, 1, 1), status=status)
+        self.paginator = KeysetPagination()
+
+    def page(self, limit=2, cursor=None):
+        return self.paginator.paginate_queryset(Client.objects.all(), KeysetPagination.Input(limit=limit, cursor=cursor))
+
+    def names(self, page):
+        return [client.first_name for client in page["items"]]
+
+    def test_forward_and_backward(self):
+        first = self.page()
+        self.assertEqual(self.names(first), ["Ana", "Ben"])
+        self.assertIsNone(first["previous_cursor"])
+        second = self.page(cursor=first["next_cursor"])
+        self.assertEqual(self.names(second), ["Cal", "Ari"])
+        third = self.page(cursor=second["next_cursor"])
+        self.assertEqual(self.names(third), ["Jo"])
+        self.assertIsNone(third["next_cursor"])
+
+        back = self.page(cursor=third["previous_cursor"])
+        self.assertEqual(self.names(back), ["Cal", "Ari"])
+        back = self.page(cursor=back["previous_cursor"])
+        self.assertEqual(self.names(back), ["Ana", "Ben"])
+        self.assertIsNone(back["previous_cursor"])
+        self.assertEqual(back["next_cursor"], first["next_cursor"])
+
+    def boundary_sql(self, ordering, values, reverse=False):
+        queryset, keys = sort_keys(Client.objects.all(), ordering)
+        return str(queryset.filter(keyset_filter(keys, values, reverse)).query)
+
+    def test_boundary_is_a_row_comparison(self):
+        client = Client.objects.get(first_name="Ben")
+        values = [client.last_name, client.first_name, client.pk]
+        table = Client._meta.db_table
+        columns = f'("{table}"."last_name", "{table}"."first_name", "{table}"."id")'
+        self.assertIn(f"{columns} > (Brown, Ben, ", self.boundary_sql(None, values))
+        self.assertIn(f"{columns} < (Brown, Ben, ", self.boundary_sql(None, values, reverse=True))
+        self.assertNotIn(" OR ", self.boundary_sql(None, values))
+
+    def test_mixed_directions_bound_the_first_column(self):
+        client = Client.objects.get(first_name="Ben")
+        values = [client.last_name, client.first_name, client.pk]
+        table = Client._meta.db_table
+        sql = self.boundary_sql(['last_name', '-first_name'], values)
+        self.assertIn(f'"{table}"."last_name" >= Brown', sql)
+        self.assertIn(" OR ", sql)
+        self.assertIn(f'"{table}"."last_name" <= Brown', self.boundary_sql(['last_name', '-first_name'], values, reverse=True))
+
+        paginator = KeysetPagination(ordering=['last_name', '-first_name'])
+        first = paginator.paginate_queryset(Client.objects.all(), KeysetPagination.Input(limit=2))
+        self.assertEqual(self.names(first), ["Cal", "Ben"])
+        second = paginator.paginate_queryset(Client.objects.all(), KeysetPagination.Input(limit=2, cursor=first["next_cursor"]))
+        self.assertEqual(self.names(second), ["Ana", "Ari"])
+
+    def test_page_is_one_query(self):
+        cursor = self.page()["next_cursor"]
+        with self.assertNumQueries(1):
+            self.page(cursor=cursor)
+
+    @override_settings(PAGINATION={'PAGE_SIZE': 2, 'MAX_PAGE_SIZE': 3})
+    def test_page_size_is_clamped(self):
+        self.assertEqual(len(self.page(limit=None)["items"]), 2)
+        self.assertEqual(len(self.page(limit=100)["items"]), 3)
+
+    def test_invalid_cursor(self):
+        for cursor in ["not-a-cursor", encode_cursor("n", ["Brown"])]:
+            with self.assertRaises(HttpError) as raised:
+                self.page(cursor=cursor)
+            self.assertEqual(raised.exception.status_code, 400)
@@ -3,9 +3,13 @@ from .models import Document
 from .schemas import DocumentSchema, DocumentCreateSchema, DocumentUpdateSchema
 from typing import List
 from django.shortcuts import get_object_or_404
+from apps.authentication.decorators import auth_required
+from .changes import add_changes_endpoint
 
 documents_router = Router()
 
+add_changes_endpoint(documents_router, Document, DocumentSchema, auth=auth_required)
+
 @documents_router.get("/", response=List[DocumentSchema])
 def list_documents(request, client_id: str = None):
     qs = Document.objects.all()
@@ -0,0 +1,145 @@
+"""
+Incremental "changes since" feeds for ``UUIDPKBaseModel`` resources.
+
+A feed walks a model's rows in ``(updated_at, id)`` order, soft-deleted rows
+included, behind an opaque cursor holding the last row's ``(updated_at, id)``.
+A client that keeps its last cursor gets every row whose ``updated_at`` moved
+past it, in its current state. A row changed several times between polls
+comes back once:
+
+    GET /clients/changes                 -> first page, from the beginning
+    GET /clients/changes?cursor=<next>   -> everything changed since
+
+Each page is one range scan on the ``(updated_at, id)`` index that the base
+model adds, starting at the row comparison ``(updated_at, id) > (cursor)``.
+
+The feed only sees what stamps ``updated_at``: ``save()``, soft deletes and
+the audited bulk helpers do. A plain ``QuerySet.update()`` that doesn't set
+``updated_at``, raw SQL and hard deletes are invisible to it.
+
+``updated_at`` is stamped when the row is written, not when the transaction
+commits. Rows stamped within the last ``CHANGE_FEED['SETTLE_SECONDS']`` are
+held back until a later poll, so a transaction that commits within that
+window is still picked up. One that commits later than that can be skipped
+by a client that has already read past its ``updated_at``. Raise the setting
+if long transactions write to a feed's model.
+"""
+import base64
+import binascii
+from datetime import datetime, timedelta
+from typing import Generic, List, Optional, Tuple, TypeVar
+from uuid import UUID
+
+from django.conf import settings
+from django.db.models import F, QuerySet, Value
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from ninja import Schema
+
+from .pagination import RowComparison
+
+DEFAULT_PAGE_SIZE = 200
+DEFAULT_MAX_PAGE_SIZE = 1000
+DEFAULT_SETTLE_SECONDS = 2.0
+
+T = TypeVar('T')
+
+
+class InvalidCursor(ValueError):
+    """Raised when a change-feed cursor cannot be decoded."""
+
+
+def encode_cursor(updated_at: datetime, pk: UUID) -> str:
+    raw = f"{updated_at.isoformat()}|{pk}".encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode('utf-8')
+        updated_at, pk = raw.rsplit('|', 1)
+        parsed = parse_datetime(updated_at)
+        if parsed is None:
+            raise ValueError(updated_at)
+        return parsed, UUID(pk)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise InvalidCursor(f"Invalid cursor: {cursor}") from e
+
+
+class ErrorSchema(Schema):
+    detail: str
+
+
+class Tombstone(Schema):
+    id: UUID
+    deleted_at: Optional[datetime] = None
+    updated_at: datetime
+
+
+class ChangeFeed(Schema, Generic[T]):
+    changes: List[T]
+    tombstones: List[Tombstone]
+    next_cursor: Optional[str] = None
+    has_more: bool
+
+
+def changes_since(queryset: QuerySet, cursor: Optional[str] = None,
+                  limit: Optional[int] = None) -> Tuple[list, list, Optional[str], bool]:
+    """
+    Return ``(changed, deleted, next_cursor, has_more)`` for the rows of
+    ``queryset`` changed after ``cursor``. ``queryset`` must include soft-deleted
+    rows (e.g. ``Model.all_objects``). ``next_cursor`` is the cursor to poll with
+    next; it equals ``cursor`` when nothing has changed.
+    """
+    config = getattr(settings, 'CHANGE_FEED', {})
+    max_size = config.get('MAX_PAGE_SIZE', DEFAULT_MAX_PAGE_SIZE)
+    limit = max(1, min(limit or config.get('PAGE_SIZE', DEFAULT_PAGE_SIZE), max_size))
+    settled = timezone.now() - timedelta(seconds=config.get('SETTLE_SECONDS', DEFAULT_SETTLE_SECONDS))
+
+    queryset = queryset.filter(updated_at__lte=settled).order_by('updated_at', 'id')
+    if cursor:
+        updated_at, pk = decode_cursor(cursor)
+        meta = queryset.model._meta
+        queryset = queryset.filter(RowComparison(
+            [F('updated_at'), F('id')],
+            [Value(updated_at, output_field=meta.get_field('updated_at')), Value(pk, output_field=meta.get_field('id'))],
+        ))
+
+    rows = list(queryset[:limit + 1])
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if rows:
+        cursor = encode_cursor(rows[-1].updated_at, rows[-1].id)
+    changed = [row for row in rows if not row.is_deleted]
+    deleted = [row for row in rows if row.is_deleted]
+    return changed, deleted, cursor, has_more
+
+
+def add_changes_endpoint(router, model, schema, queryset=None, path: str = '/changes', **route_kwargs):
+    """
+    Register ``GET <path>`` on ``router``, serving ``model``'s change feed with
+    live rows rendered by ``schema``. Register it before any catch-all
+    ``/{id}`` route on the same router.
+    """
+    def get_queryset() -> QuerySet:
+        return queryset() if callable(queryset) else (queryset if queryset is not None else model.all_objects.all())
+
+    def list_changes(request, cursor: Optional[str] = None, limit: Optional[int] = None):
+        try:
+            changed, deleted, next_cursor, has_more = changes_since(get_queryset(), cursor, limit)
+        except InvalidCursor as e:
+            return 400, ErrorSchema(detail=str(e))
+        return 200, {
+            'changes': changed,
+            'tombstones': deleted,
+            'next_cursor': next_cursor,
+            'has_more': has_more,
+        }
+
+    list_changes.__name__ = f"list_{model._meta.model_name}_changes"
+    return router.get(
+        path,
+        response={200: ChangeFeed[schema], 400: ErrorSchema},
+        summary=f"List {model._meta.verbose_name_plural} changed since a cursor",
+        **route_kwargs,
+    )(list_changes)
@@ -0,0 +1,72 @@
+"""
+Conditional GET helpers for Ninja endpoints.
+
+Usage:
+    @router.get("/thing")
+    def get_thing(request, response: HttpResponse):
+        etag = make_etag(version)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        set_validators(response, etag)
+        return payload
+
+Pass ``last_modified`` (a Unix timestamp) to ``is_not_modified``,
+``set_validators`` and ``not_modified`` to honour ``If-Modified-Since`` as well.
+"""
+import hashlib
+import json
+from typing import Any, Optional
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponseNotModified
+from django.utils.cache import parse_etags
+from django.utils.http import http_date, parse_http_date_safe
+
+DEFAULT_CACHE_CONTROL = 'private, no-cache'
+
+
+def make_etag(*parts: Any) -> str:
+    """Build a quoted, strong ETag from ``parts`` (any JSON-serialisable values)."""
+    raw = json.dumps(parts, sort_keys=True, cls=DjangoJSONEncoder, separators=(',', ':'))
+    return '"%s"' % hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+
+def etag_matches(request, etag: str) -> bool:
+    """True if the request's ``If-None-Match`` header matches ``etag`` (weak comparison)."""
+    header = request.headers.get('If-None-Match')
+    if not header:
+        return False
+    candidates = parse_etags(header)
+    if '*' in candidates:
+        return True
+    target = etag.removeprefix('W/')
+    return any(candidate.removeprefix('W/') == target for candidate in candidates)
+
+
+def is_not_modified(request, etag: str, last_modified: Optional[float] = None) -> bool:
+    """
+    True if the client's copy is current. ``If-None-Match`` wins when present;
+    ``If-Modified-Since`` is only consulted without it (RFC 9110, section 13.2.2).
+    """
+    if request.headers.get('If-None-Match'):
+        return etag_matches(request, etag)
+    if last_modified is None:
+        return False
+    since = parse_http_date_safe(request.headers.get('If-Modified-Since', ''))
+    return since is not None and int(last_modified) <= since
+
+
+def set_validators(response, etag: str, cache_control: Optional[str] = DEFAULT_CACHE_CONTROL,
+                   last_modified: Optional[float] = None) -> None:
+    response['ETag'] = etag
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified)
+    if cache_control:
+        response['Cache-Control'] = cache_control
+
+
+def not_modified(etag: str, cache_control: Optional[str] = DEFAULT_CACHE_CONTROL,
+                 last_modified: Optional[float] = None) -> HttpResponseNotModified:
+    response = HttpResponseNotModified()
+    set_validators(response, etag, cache_control, last_modified)
+    return response
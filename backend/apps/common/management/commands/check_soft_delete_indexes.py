@@ -0,0 +1,69 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError, connections
+
+from apps.common.models import SoftDeleteModel, is_active_index, ordering_index_fields
+
+
+# python manage.py check_soft_delete_indexes [--database default] [--skip-db] [--fail]
+class Command(BaseCommand):
+    help = 'Report soft-delete models without a partial "WHERE is_deleted = false" index for their default ordering'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default='default', help='Database to inspect for unapplied indexes')
+        parser.add_argument('--skip-db', action='store_true', help='Only check the model declarations')
+        parser.add_argument('--fail', action='store_true', help='Exit with an error if anything is reported')
+
+    def handle(self, *args, **options):
+        models = [
+            model for model in apps.get_models()
+            if issubclass(model, SoftDeleteModel) and model._meta.managed and not model._meta.proxy
+        ]
+        existing = None if options['skip_db'] else self._existing_indexes(options['database'], models)
+
+        problems = 0
+        for model in sorted(models, key=lambda m: m._meta.label):
+            active = [index for index in model._meta.indexes if is_active_index(index)]
+            ordering = ordering_index_fields(model)
+            label = model._meta.label
+
+            if not active:
+                problems += 1
+                self.stdout.write(self.style.ERROR(f'{label}: no partial is_deleted index'))
+                continue
+            if not ordering or len(ordering) < len(model._meta.ordering):
+                self.stdout.write(self.style.WARNING(
+                    f'{label}: default ordering {list(model._meta.ordering)} cannot be fully served by an index'
+                ))
+            elif not any(list(index.fields[:len(ordering)]) == ordering for index in active):
+                problems += 1
+                self.stdout.write(self.style.ERROR(f'{label}: no partial index matches ordering {ordering}'))
+
+            if existing is not None:
+                table_indexes = existing.get(model._meta.db_table, set())
+                for index in active:
+                    if index.name not in table_indexes:
+                        problems += 1
+                        self.stdout.write(self.style.ERROR(
+                            f'{label}: index {index.name} ({", ".join(index.fields)}) is not in the database; run migrate'
+                        ))
+
+        if problems and options['fail']:
+            raise CommandError(f'{problems} soft-delete index problem(s) found.')
+        if problems:
+            self.stdout.write(self.style.WARNING(f'{problems} soft-delete index problem(s) found.'))
+        else:
+            self.stdout.write(self.style.SUCCESS(f'All {len(models)} soft-delete models have active-row indexes.'))
+
+    def _existing_indexes(self, alias, models):
+        connection = connections[alias]
+        try:
+            with connection.cursor() as cursor:
+                tables = set(connection.introspection.table_names(cursor))
+                return {
+                    model._meta.db_table: set(connection.introspection.get_constraints(cursor, model._meta.db_table))
+                    for model in models if model._meta.db_table in tables
+                }
+        except DatabaseError as e:
+            self.stderr.write(self.style.WARNING(f'Could not inspect database "{alias}", checking declarations only: {e}'))
+            return None
@@ -0,0 +1,23 @@
+# Generated by Django 5.0.14 on 2026-10-16 22:47
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common', '0003_alter_document_type'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='document',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['-created_at'], name='common_document_8005755c_act'),
+        ),
+        migrations.AddIndex(
+            model_name='organisation',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['-created_at'], name='common_organisati_d0938353_act'),
+        ),
+    ]
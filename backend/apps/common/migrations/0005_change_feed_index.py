@@ -0,0 +1,21 @@
+# Generated by Django 5.0.14 on 2026-10-16 22:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common', '0004_active_row_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='document',
+            index=models.Index(fields=['updated_at', 'id'], name='common_document_4c2a002f_chg'),
+        ),
+        migrations.AddIndex(
+            model_name='organisation',
+            index=models.Index(fields=['updated_at', 'id'], name='common_organisati_b298c091_chg'),
+        ),
+    ]
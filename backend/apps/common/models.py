@@ -1,29 +1,149 @@
 # apps/core/models.py
+import copy
 import uuid
-from django.db import models
+from django.db import connections, models, router, transaction
 from django.utils.translation import gettext_lazy as _
 from django.utils import timezone # Added for soft delete
 from django.conf import settings
 from django.contrib.auth.models import AnonymousUser
+from django.core.exceptions import FieldDoesNotExist
+from django.db.backends.utils import names_digest
+from django.db.models.query_utils import DeferredAttribute
+from django.db.models.signals import class_prepared, post_save, pre_save
 import uuid
 
 
+DEFAULT_BULK_BATCH_SIZE = 500
+
+
+def _audit_user(user):
+    """The user to stamp into audit columns, or None for anonymous/missing users."""
+    if user and not isinstance(user, AnonymousUser):
+        return user
+    return None
+
+
+def _has_field(model, name):
+    try:
+        model._meta.get_field(name)
+        return True
+    except FieldDoesNotExist:
+        return False
+
+
 class SoftDeleteQuerySet(models.QuerySet):
-    def delete(self, user=None):
-        return super().update(
+    """
+    Soft-delete aware queryset with audit-stamping bulk helpers. Each helper
+    writes in one statement per batch and fills created_by/updated_by/deleted_by
+    and the timestamps the way ``SoftDeleteModel.save(user=...)`` would.
+    """
+
+    def _stamp_values(self, user, **values):
+        """Column values for a queryset UPDATE, keyed by attname, including the audit stamps."""
+        user = _audit_user(user)
+        if _has_field(self.model, 'updated_at'):
+            values['updated_at'] = timezone.now()
+        if user is not None and _has_field(self.model, 'updated_by'):
+            values['updated_by_id'] = user.pk
+        return values
+
+    def soft_delete(self, user=None, returning=False):
+        """
+        Mark every row in the queryset deleted. Returns the number of rows, or
+        their ids with ``returning=True``.
+        """
+        user = _audit_user(user)
+        values = self._stamp_values(
+            user,
             is_deleted=True,
             deleted_at=timezone.now(),
-            # deleted_by=user # Ensure deleted_by is handled if user is passed
+            deleted_by_id=user.pk if user is not None else None,
         )
+        if returning:
+            return self._update_returning(values)
+        return super().update(**values)
+
+    def delete(self, user=None):
+        return self.soft_delete(user=user)
 
     def undelete(self, user=None):
-        return super().update(
+        return super().update(**self._stamp_values(
+            user,
             is_deleted=False,
             deleted_at=None,
-            deleted_by=None,
-            # updated_at=timezone.now(), # Handled by model's save
-            # updated_by=user
+            deleted_by_id=None,
+        ))
+
+    def _update_returning(self, values):
+        """UPDATE ... RETURNING the primary keys, falling back to select-then-update."""
+        connection = connections[self.db]
+        meta = self.model._meta
+        if not connection.features.can_return_columns_from_insert:
+            with transaction.atomic(using=self.db):
+                ids = list(self.select_for_update().values_list('pk', flat=True))
+                self.model._base_manager.using(self.db).filter(pk__in=ids).update(**values)
+            return ids
+
+        quote = connection.ops.quote_name
+        assignments, params = [], []
+        for attname, value in values.items():
+            field = meta.get_field(attname)
+            assignments.append(f"{quote(field.column)} = %s")
+            params.append(field.get_db_prep_save(value, connection))
+        subquery, subquery_params = self.order_by().values('pk').query.sql_with_params()
+        pk_column = quote(meta.pk.column)
+        sql = (
+            f"UPDATE {quote(meta.db_table)} SET {', '.join(assignments)} "
+            f"WHERE {pk_column} IN ({subquery}) RETURNING {pk_column}"
         )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [*params, *subquery_params])
+            return [meta.pk.to_python(row[0]) for row in cursor.fetchall()]
+
+    def bulk_create_audited(self, objs, user=None, batch_size=DEFAULT_BULK_BATCH_SIZE, returning=False, **kwargs):
+        """
+        ``bulk_create`` that stamps created_by/updated_by. Extra keyword arguments
+        (``ignore_conflicts``, ``update_conflicts``, ...) are passed through.
+        With ``returning=True`` the new primary keys are returned instead of the
+        objects; integer keys are only available on backends that can return rows
+        from bulk inserts (PostgreSQL, SQLite).
+        """
+        objs = list(objs)
+        user = _audit_user(user)
+        if user is not None:
+            stamp_created = _has_field(self.model, 'created_by')
+            stamp_updated = _has_field(self.model, 'updated_by')
+            for obj in objs:
+                if stamp_created and not obj.created_by_id:
+                    obj.created_by = user
+                if stamp_updated:
+                    obj.updated_by = user
+        created = self.bulk_create(objs, batch_size=batch_size, **kwargs)
+        for obj in created:
+            if obj.pk is not None:
+                obj._snapshot_fields()
+        if returning:
+            return [obj.pk for obj in created]
+        return created
+
+    def bulk_update_audited(self, objs, fields, user=None, batch_size=DEFAULT_BULK_BATCH_SIZE):
+        """``bulk_update`` of ``fields`` that also writes updated_at/updated_by. Returns the row count."""
+        objs = list(objs)
+        fields = set(fields)
+        user = _audit_user(user)
+        if _has_field(self.model, 'updated_at'):
+            now = timezone.now()
+            for obj in objs:
+                obj.updated_at = now
+            fields.add('updated_at')
+        if user is not None and _has_field(self.model, 'updated_by'):
+            for obj in objs:
+                obj.updated_by = user
+            fields.add('updated_by')
+        rows = self.bulk_update(objs, list(fields), batch_size=batch_size)
+        for obj in objs:
+            obj._snapshot_fields(fields)
+        return rows
 
     def active(self):
         return self.filter(is_deleted=False)
@@ -43,6 +163,15 @@ class SoftDeleteManager(models.Manager):
     def deleted_records(self):
         return self.get_queryset().deleted()
 
+    def bulk_create_audited(self, objs, user=None, **kwargs):
+        return self.get_queryset().bulk_create_audited(objs, user=user, **kwargs)
+
+    def bulk_update_audited(self, objs, fields, user=None, **kwargs):
+        return self.get_queryset().bulk_update_audited(objs, fields, user=user, **kwargs)
+
+    def soft_delete(self, user=None, **kwargs):
+        return self.get_queryset().soft_delete(user=user, **kwargs)
+
 
 class AuditBaseModel(models.Model):
     """
@@ -97,10 +226,140 @@ class TimeStampedModel(models.Model):
     class Meta:
         abstract = True
 
+ACTIVE_INDEX_CONDITION = models.Q(is_deleted=False)
+
+
+def active_index_name(model, fields):
+    """Deterministic name (<= 30 chars) for a partial index over active rows."""
+    table = model._meta.db_table
+    return f"{table[:17]}_{names_digest(table, *fields, 'active', length=8)}_act"
+
+
+def ordering_index_fields(model):
+    """
+    The leading part of the model's default ordering that a plain index can serve:
+    local fields only, stopping at the first related lookup or expression.
+    """
+    fields = []
+    for item in model._meta.ordering:
+        if not isinstance(item, str) or item == '?':
+            break
+        name = item.lstrip('-')
+        if '__' in name:
+            break
+        try:
+            model._meta.get_field(name)
+        except FieldDoesNotExist:
+            break
+        fields.append(item)
+    return fields
+
+
+def is_active_index(index):
+    return index.condition is not None and index.condition == ACTIVE_INDEX_CONDITION
+
+
+def add_active_indexes(sender, **kwargs):
+    """
+    Give every concrete soft-delete model partial indexes ``WHERE is_deleted = false``:
+    one matching its default ``Meta.ordering`` and one per entry in ``active_indexes``.
+    ``SoftDeleteManager`` always filters on ``is_deleted=False``, so these are the
+    indexes list queries can actually use. ``UUIDPKBaseModel`` subclasses also get
+    a full ``(updated_at, id)`` index for their change feed.
+    """
+    if sender._meta.abstract or not issubclass(sender, SoftDeleteModel):
+        return
+    wanted = []
+    ordering = ordering_index_fields(sender)
+    if ordering:
+        wanted.append(ordering)
+    wanted.extend(list(fields) for fields in sender.active_indexes)
+
+    indexes = list(sender._meta.indexes)
+    existing = {tuple(index.fields) for index in indexes if is_active_index(index)}
+    for fields in wanted:
+        if tuple(fields) in existing:
+            continue
+        existing.add(tuple(fields))
+        indexes.append(models.Index(
+            fields=fields,
+            condition=ACTIVE_INDEX_CONDITION,
+            name=active_index_name(sender, fields),
+        ))
+    if issubclass(sender, UUIDPKBaseModel):
+        # Keyset index for the "changes since" feed (see apps/common/changes.py); covers deleted rows too.
+        change_fields = ['updated_at', 'id']
+        if not any(list(index.fields) == change_fields and index.condition is None for index in indexes):
+            indexes.append(models.Index(
+                fields=change_fields,
+                name=f"{sender._meta.db_table[:17]}_{names_digest(sender._meta.db_table, *change_fields, length=8)}_chg",
+            ))
+    # Assign a new list: Meta.indexes may be shared with other models through Meta inheritance.
+    # original_attrs is what the migration autodetector reads.
+    sender._meta.indexes = indexes
+    sender._meta.original_attrs['indexes'] = indexes
+
+
+class_prepared.connect(add_active_indexes)
+
+
+class MutableFieldAttribute(DeferredAttribute):
+    """
+    Descriptor for JSON fields of soft-delete models. A loaded JSON value can be
+    edited in place, so its snapshot is copied the first time it is read (or
+    kept as-is when it is replaced unread) rather than on every load.
+    """
+
+    def __get__(self, instance, cls=None):
+        if instance is None:
+            return self
+        value = super().__get__(instance, cls)
+        data = instance.__dict__
+        if '_loaded_values' in data:
+            snapshot = data.setdefault('_field_snapshot', {})
+            if self.field.attname not in snapshot:
+                snapshot[self.field.attname] = copy.deepcopy(value)
+        return value
+
+    def __set__(self, instance, value):
+        data = instance.__dict__
+        attname = self.field.attname
+        if '_loaded_values' in data and attname in data:
+            # Never read, so never edited: the current value is still the loaded one.
+            data.setdefault('_field_snapshot', {}).setdefault(attname, data[attname])
+        data[attname] = value
+
+
+def track_mutable_fields(sender, **kwargs):
+    """Install ``MutableFieldAttribute`` on the JSON fields of concrete soft-delete models."""
+    if sender._meta.abstract or not issubclass(sender, SoftDeleteModel):
+        return
+    for field in sender._meta.concrete_fields:
+        if isinstance(field, models.JSONField):
+            setattr(sender, field.attname, MutableFieldAttribute(field))
+
+
+class_prepared.connect(track_mutable_fields)
+
+
 class SoftDeleteModel(models.Model):
     """
     Base model that adds soft delete capability.
+
+    Concrete subclasses get partial indexes over active rows (see
+    ``add_active_indexes``); list extra field tuples that are commonly filtered
+    on in ``active_indexes``, e.g. ``active_indexes = [('status', '-referral_date')]``.
+
+    Instances loaded from the database keep the loaded column values (a reference
+    to the row, not a copy); a JSON field is copied the first time it is read.
+    A plain ``save()`` only updates the columns that changed (plus the audit
+    stamps), and re-inserts the row if it has been deleted meanwhile. It writes
+    nothing when only the audit stamps would change, but still sends
+    ``pre_save``/``post_save``. Pass ``update_fields`` explicitly to force
+    specific columns to be written.
     """
+    active_indexes = ()
+
     is_deleted = models.BooleanField(default=False, db_index=True, verbose_name=_("Is Deleted")) # Added db_index for performance
     deleted_at = models.DateTimeField(null=True, blank=True, verbose_name=_("Deleted At"))
     deleted_by = models.ForeignKey(
@@ -139,14 +398,82 @@ class SoftDeleteModel(models.Model):
 
         self.save(user=user, update_fields=update_fields_list + (['updated_by', 'updated_at'] if hasattr(self, 'updated_by') else []))
         
+    # Fields save() stamps itself; on their own they don't make an instance dirty.
+    AUDIT_STAMP_FIELDS = ('updated_at', 'updated_by')
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Compared against at save(); JSON values are copied lazily by MutableFieldAttribute.
+        instance.__dict__['_loaded_values'] = (field_names, values)
+        instance.__dict__['_snapshot_pk'] = instance.pk
+        return instance
+
+    def refresh_from_db(self, using=None, fields=None, **kwargs):
+        super().refresh_from_db(using=using, fields=fields, **kwargs)
+        self._snapshot_fields(fields)
+
+    def _tracked_fields(self):
+        return [field for field in self._meta.concrete_fields if not field.primary_key]
+
+    def _snapshot_fields(self, names=None):
+        """Remember the current column values (all, or ``names``) as the saved state."""
+        snapshot = self.__dict__.setdefault('_field_snapshot', {})
+        self.__dict__['_snapshot_pk'] = self.pk
+        for field in self._tracked_fields():
+            if names is not None and field.name not in names and field.attname not in names:
+                continue
+            if field.attname in self.__dict__:  # deferred fields are not loaded
+                value = self.__dict__[field.attname]
+                # JSON values are mutated in place, so compare against a copy.
+                snapshot[field.attname] = copy.deepcopy(value) if isinstance(value, (dict, list)) else value
+
+    def _saved_values(self):
+        """Column values as last loaded or saved, by attname; None if never loaded or saved."""
+        loaded = self.__dict__.get('_loaded_values')
+        snapshot = self.__dict__.get('_field_snapshot')
+        if loaded is None and snapshot is None:
+            return None
+        values = dict(zip(*loaded)) if loaded is not None else {}
+        if snapshot:
+            values.update(snapshot)
+        return values
+
+    def get_dirty_fields(self):
+        """
+        Names of fields whose value differs from what was loaded from the database,
+        or None if this instance wasn't loaded from the database (everything is written).
+        """
+        if self._state.adding or self.pk is None or self.pk != self.__dict__.get('_snapshot_pk'):
+            return None
+        snapshot = self._saved_values()
+        if snapshot is None:
+            return None
+        dirty = set()
+        for field in self._tracked_fields():
+            if field.attname not in self.__dict__:
+                continue
+            if field.attname not in snapshot or snapshot[field.attname] != self.__dict__[field.attname]:
+                dirty.add(field.name)
+        return dirty
+
     def save(self, *args, **kwargs):
         user = kwargs.pop('user', None)
 
-        if self._state.adding and hasattr(self, 'created_by') and not self.created_by:
+        # Only write what changed when the caller didn't choose the columns.
+        dirty = None
+        if not args and kwargs.get('update_fields') is None and not kwargs.get('force_insert'):
+            dirty = self.get_dirty_fields()
+            if dirty is not None and not dirty.difference(self.AUDIT_STAMP_FIELDS):
+                self._send_save_signals(kwargs.get('using'))
+                return
+
+        # Check the *_id attributes: hasattr() on a relation would fetch the related row.
+        if self._state.adding and hasattr(self, 'created_by_id') and not self.created_by_id:
             if user and not isinstance(user, AnonymousUser):
                 self.created_by = user
         
-        if hasattr(self, 'updated_by'):
+        if hasattr(self, 'updated_by_id'):
             if user and not isinstance(user, AnonymousUser):
                 self.updated_by = user
 
@@ -156,13 +483,37 @@ class SoftDeleteModel(models.Model):
         update_fields = kwargs.get('update_fields')
         if update_fields is not None:
             update_fields = set(update_fields)
-            if hasattr(self, 'updated_by') and self.updated_by and 'updated_by' not in update_fields:
+            if hasattr(self, 'updated_by_id') and self.updated_by_id and 'updated_by' not in update_fields:
                 update_fields.add('updated_by')
             if hasattr(self, 'updated_at') and 'updated_at' not in update_fields:
                 update_fields.add('updated_at')
             kwargs['update_fields'] = list(update_fields)
 
-        super().save(*args, **kwargs)
+        if dirty is None:
+            super().save(*args, **kwargs)
+            self._snapshot_fields(update_fields)
+            return
+
+        # _do_update() narrows the UPDATE to these columns. update_fields stays None, so
+        # if the UPDATE finds no row Django inserts it, as a plain save() always did.
+        self.__dict__['_update_only'] = dirty.union(self.AUDIT_STAMP_FIELDS)
+        try:
+            super().save(*args, **kwargs)
+        finally:
+            del self.__dict__['_update_only']
+        self._snapshot_fields()
+
+    def _do_update(self, base_qs, using, pk_val, values, update_fields, forced_update):
+        only = self.__dict__.get('_update_only')
+        if only is not None:
+            values = [value for value in values if value[0].name in only]
+        return super()._do_update(base_qs, using, pk_val, values, update_fields, forced_update)
+
+    def _send_save_signals(self, using=None):
+        """Send the signals of a save() that had nothing to write, for receivers that act on every save."""
+        using = using or router.db_for_write(self.__class__, instance=self)
+        pre_save.send(sender=self.__class__, instance=self, raw=False, using=using, update_fields=None)
+        post_save.send(sender=self.__class__, instance=self, created=False, raw=False, using=using, update_fields=None)
 
     class Meta:
         abstract = True
@@ -0,0 +1,255 @@
+"""
+Keyset (cursor) pagination for Ninja list endpoints.
+
+    @router.get("/", response=List[ClientListSchema])
+    @paginate(KeysetPagination)
+    def list_clients(request):
+        return Client.objects.all()
+
+The view returns a queryset. Pages follow its ordering (the model's
+``Meta.ordering`` when it has none) with the primary key appended, so the
+order is total and stable even when the ordering values repeat. Each page is
+a range condition on those values starting after the previous page's
+boundary row, ``WHERE (last_name, first_name, id) > (...)``, which an index
+on the ordering columns serves by starting its scan at the boundary. Page
+1000 therefore costs the same as page 1, and no ``COUNT`` is run:
+
+    GET /clients/?limit=50                  -> first page
+    GET /clients/?cursor=<next_cursor>      -> the page after it
+    GET /clients/?cursor=<previous_cursor>  -> the page before it
+
+Responses are ``{"items": [...], "next_cursor": ..., "previous_cursor": ...}``.
+A cursor is ``None`` when there is nothing further in that direction. Cursors
+are opaque: base64 of the boundary row's ordering values and a direction.
+``limit`` is clamped to ``PAGINATION['MAX_PAGE_SIZE']``.
+
+Ordering may use related fields (``organisation__name``) and annotations
+(``-search_rank``), but not expressions or ``?``. NULLs sort last in
+ascending order and first in descending order, as PostgreSQL does by default.
+Mixed directions and nullable columns can't be a single row comparison; their
+condition is the expanded ``a > x OR (a = x AND ...)`` form, bounded by
+``a >= x`` (``<=`` descending) on the first column so the scan still starts
+at the boundary.
+"""
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from datetime import date, datetime, time
+from typing import Any, List, Optional, Sequence, Tuple, Union
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured, ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import BooleanField, Expression, F, Field, Q, QuerySet, Value
+from ninja import Schema
+from ninja.errors import HttpError
+from ninja.pagination import PaginationBase
+
+DEFAULT_PAGE_SIZE = 50
+DEFAULT_MAX_PAGE_SIZE = 500
+
+FORWARD = 'n'
+BACKWARD = 'p'
+
+
+class InvalidCursor(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+
+class CursorEncoder(DjangoJSONEncoder):
+    def default(self, o):
+        # DjangoJSONEncoder rounds to milliseconds, which would skip or repeat rows.
+        if isinstance(o, (datetime, date, time)):
+            return o.isoformat()
+        return super().default(o)
+
+
+def encode_cursor(direction: str, values: Sequence[Any]) -> str:
+    raw = json.dumps([direction, list(values)], cls=CursorEncoder, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Tuple[str, list]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode('utf-8')
+        direction, values = json.loads(raw)
+        if direction not in (FORWARD, BACKWARD) or not isinstance(values, list):
+            raise ValueError(raw)
+        return direction, values
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError) as e:
+        raise InvalidCursor(f"Invalid cursor: {cursor}") from e
+
+
+@dataclass(frozen=True)
+class SortKey:
+    alias: str  # Annotation holding the ordering value
+    descending: bool
+    field: Field
+
+    def order_by(self, reverse: bool = False):
+        expression = F(self.alias)
+        if self.descending != reverse:
+            return expression.desc(nulls_first=True) if self.field.null else expression.desc()
+        return expression.asc(nulls_last=True) if self.field.null else expression.asc()
+
+    def after(self, value: Any, reverse: bool = False) -> Q:
+        """Rows whose value sorts strictly after ``value``."""
+        descending = self.descending != reverse
+        if value is None:
+            # NULLs are last ascending (nothing after them) and first descending.
+            return Q(**{f'{self.alias}__isnull': False}) if descending else Q(pk__in=[])
+        condition = Q(**{f"{self.alias}__{'lt' if descending else 'gt'}": value})
+        if self.field.null and not descending:
+            condition |= Q(**{f'{self.alias}__isnull': True})
+        return condition
+
+    def equal(self, value: Any) -> Q:
+        if value is None:
+            return Q(**{f'{self.alias}__isnull': True})
+        return Q(**{self.alias: value})
+
+
+def sort_keys(queryset: QuerySet, ordering: Optional[Sequence[str]] = None) -> Tuple[QuerySet, List[SortKey]]:
+    """
+    Annotate ``queryset`` with its ordering values and return it with the sort
+    keys, primary key last.
+    """
+    model = queryset.model
+    ordering = list(ordering or queryset.query.order_by or model._meta.ordering)
+    names = []
+    for item in ordering:
+        if not isinstance(item, str) or item == '?' or '.' in item:
+            raise ImproperlyConfigured(f"Keyset pagination needs field-name ordering, got {item!r}")
+        names.append((item.lstrip('-'), item.startswith('-')))
+    pk_names = {'pk', model._meta.pk.name, model._meta.pk.attname}
+    if not any(name in pk_names for name, _ in names):
+        names.append(('pk', False))
+
+    queryset = queryset.annotate(**{f'_keyset{index}': F(name) for index, (name, _) in enumerate(names)})
+    keys = [
+        SortKey(f'_keyset{index}', descending, queryset.query.annotations[f'_keyset{index}'].output_field)
+        for index, (_, descending) in enumerate(names)
+    ]
+    return queryset, keys
+
+
+class RowComparison(Expression):
+    """``(a, b, ...) > (x, y, ...)``, or ``<`` with ``descending``."""
+    conditional = True
+    output_field = BooleanField()
+
+    def __init__(self, columns: Sequence[Any], values: Sequence[Any], descending: bool = False):
+        super().__init__()
+        self.columns = list(columns)
+        self.values = list(values)
+        self.descending = descending
+
+    def get_source_expressions(self):
+        return [*self.columns, *self.values]
+
+    def set_source_expressions(self, exprs):
+        self.columns, self.values = exprs[:len(self.columns)], exprs[len(self.columns):]
+
+    def as_sql(self, compiler, connection):
+        sides, params = [], []
+        for side in (self.columns, self.values):
+            parts = []
+            for expression in side:
+                sql, expression_params = compiler.compile(expression)
+                parts.append(sql)
+                params.extend(expression_params)
+            sides.append(f"({', '.join(parts)})")
+        return f"{sides[0]} {'<' if self.descending else '>'} {sides[1]}", params
+
+
+def keyset_filter(keys: Sequence[SortKey], values: Sequence[Any], reverse: bool = False) -> Union[Q, RowComparison]:
+    """Rows after ``values`` in the order of ``keys`` (reversed for ``reverse``)."""
+    directions = {key.descending != reverse for key in keys}
+    if len(directions) == 1 and not any(key.field.null for key in keys):
+        return RowComparison(
+            [F(key.alias) for key in keys],
+            [Value(value, output_field=key.field) for key, value in zip(keys, values)],
+            descending=directions.pop(),
+        )
+
+    condition = Q(pk__in=[])
+    for index, key in enumerate(keys):
+        branch = key.after(values[index], reverse)
+        for previous, value in zip(keys[:index], values):
+            branch &= previous.equal(value)
+        condition |= branch
+
+    # Redundant with the OR chain, but gives an index scan on the first column a start.
+    first, value = keys[0], values[0]
+    descending = first.descending != reverse
+    if value is not None and (descending or not first.field.null):
+        condition &= Q(**{f"{first.alias}__{'lte' if descending else 'gte'}": value})
+    return condition
+
+
+class KeysetPagination(PaginationBase):
+    class Input(Schema):
+        limit: Optional[int] = None
+        cursor: Optional[str] = None
+
+    class Output(Schema):
+        items: List[Any]
+        next_cursor: Optional[str] = None
+        previous_cursor: Optional[str] = None
+
+    items_attribute: str = 'items'
+
+    def __init__(self, *, ordering: Optional[Sequence[str]] = None, page_size: Optional[int] = None,
+                 max_page_size: Optional[int] = None, **kwargs: Any):
+        """``ordering`` overrides the queryset's; the page sizes override ``settings.PAGINATION``."""
+        self.ordering = ordering
+        self.page_size = page_size
+        self.max_page_size = max_page_size
+        super().__init__(**kwargs)
+
+    def _limit(self, requested: Optional[int]) -> int:
+        config = getattr(settings, 'PAGINATION', {})
+        max_size = self.max_page_size or config.get('MAX_PAGE_SIZE', DEFAULT_MAX_PAGE_SIZE)
+        return max(1, min(requested or self.page_size or config.get('PAGE_SIZE', DEFAULT_PAGE_SIZE), max_size))
+
+    def _boundary(self, cursor: str, keys: List[SortKey]) -> Tuple[str, list]:
+        try:
+            direction, values = decode_cursor(cursor)
+            if len(values) != len(keys):
+                raise InvalidCursor(f"Invalid cursor: {cursor}")
+            return direction, [None if value is None else key.field.to_python(value) for key, value in zip(keys, values)]
+        except (InvalidCursor, ValidationError) as e:
+            raise HttpError(400, f"Invalid cursor: {cursor}") from e
+
+    def paginate_queryset(self, queryset: QuerySet, pagination: Input, request=None, **params: Any) -> dict:
+        if not isinstance(queryset, QuerySet):
+            raise ImproperlyConfigured("KeysetPagination views must return a queryset")
+        limit = self._limit(pagination.limit)
+        queryset, keys = sort_keys(queryset, self.ordering)
+
+        direction, boundary = FORWARD, None
+        if pagination.cursor:
+            direction, boundary = self._boundary(pagination.cursor, keys)
+        backward = direction == BACKWARD
+        queryset = queryset.order_by(*(key.order_by(reverse=backward) for key in keys))
+        if boundary is not None:
+            queryset = queryset.filter(keyset_filter(keys, boundary, reverse=backward))
+
+        rows = list(queryset[:limit + 1])
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        if backward:
+            rows.reverse()
+
+        def cursor_at(row, cursor_direction: str) -> str:
+            return encode_cursor(cursor_direction, [getattr(row, key.alias) for key in keys])
+
+        # Coming from a cursor means there are rows on the side it came from.
+        more_after = has_more if not backward else bool(rows)
+        more_before = has_more if backward else boundary is not None and bool(rows)
+        return {
+            'items': rows,
+            'next_cursor': cursor_at(rows[-1], FORWARD) if more_after else None,
+            'previous_cursor': cursor_at(rows[0], BACKWARD) if more_before else None,
+        }
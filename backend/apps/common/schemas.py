@@ -30,9 +30,9 @@ class DocumentSchema(Schema):
     status_id: Optional[int] = None
     metadata: Optional[Any] = None
     created_at: Optional[datetime.datetime] = None
-    created_by: Optional[str] = None
+    created_by: Optional[UserAuditSchema] = None
     updated_at: Optional[datetime.datetime] = None
-    updated_by: Optional[str] = None
+    updated_by: Optional[UserAuditSchema] = None
 
 class DocumentCreateSchema(Schema):
     file_name: str
@@ -0,0 +1,97 @@
+import uuid
+from datetime import timedelta
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from apps.common.changes import InvalidCursor, changes_since, decode_cursor, encode_cursor
+from apps.common.models import Organisation
+
+
+@override_settings(CHANGE_FEED={"PAGE_SIZE": 2, "MAX_PAGE_SIZE": 10, "SETTLE_SECONDS": 5})
+class ChangesSinceTest(TestCase):
+    def setUp(self):
+        self.base = timezone.now() - timedelta(minutes=10)
+
+    def organisation(self, name, seconds, **values):
+        organisation = Organisation.objects.create(name=name, **values)
+        Organisation.all_objects.filter(pk=organisation.pk).update(updated_at=self.base + timedelta(seconds=seconds))
+        return Organisation.all_objects.get(pk=organisation.pk)
+
+    def poll(self, cursor=None, limit=None):
+        return changes_since(Organisation.all_objects.all(), cursor, limit)
+
+    def drain(self, cursor=None):
+        seen = []
+        while True:
+            changed, deleted, cursor, has_more = self.poll(cursor)
+            seen.extend(row.name for row in changed + deleted)
+            if not has_more:
+                return seen, cursor
+
+    def test_pages_follow_updated_at_then_id(self):
+        tied = sorted([self.organisation("tied a", 2), self.organisation("tied b", 2)], key=lambda row: row.pk)
+        self.organisation("late", 3)
+        self.organisation("early", 1)
+        seen, _ = self.drain()
+        self.assertEqual(seen, ["early", tied[0].name, tied[1].name, "late"])
+
+    def test_cursor_resumes_after_last_row(self):
+        self.organisation("one", 1)
+        self.organisation("two", 2)
+        changed, _, cursor, has_more = self.poll()
+        self.assertEqual(([row.name for row in changed], has_more), (["one", "two"], False))
+        self.assertEqual(self.poll(cursor), ([], [], cursor, False))
+
+        later = Organisation.objects.get(name="two")
+        later.name = "two renamed"
+        later.save()
+        Organisation.all_objects.filter(pk=later.pk).update(updated_at=self.base + timedelta(seconds=4))
+        later.refresh_from_db()
+        changed, _, next_cursor, _ = self.poll(cursor)
+        self.assertEqual([row.pk for row in changed], [later.pk])
+        self.assertEqual(decode_cursor(next_cursor), (later.updated_at, later.pk))
+
+    def test_cursor_is_a_row_comparison(self):
+        organisation = self.organisation("one", 1)
+        queryset = Organisation.all_objects.all()
+        with self.assertNumQueries(1) as captured:
+            changes_since(queryset, encode_cursor(organisation.updated_at, organisation.pk))
+        table = Organisation._meta.db_table
+        sql = captured.captured_queries[0]["sql"]
+        self.assertIn(f'("{table}"."updated_at", "{table}"."id") > (', sql)
+        self.assertNotIn(" OR ", sql)
+
+    def test_soft_deleted_rows_are_tombstones(self):
+        self.organisation("kept", 1)
+        self.organisation("gone", 2, is_deleted=True)
+        changed, deleted, _, _ = self.poll()
+        self.assertEqual([row.name for row in changed], ["kept"])
+        self.assertEqual([row.name for row in deleted], ["gone"])
+
+    def test_rows_inside_settle_window_are_held_back(self):
+        self.organisation("settled", 1)
+        fresh = Organisation.objects.create(name="fresh")
+        changed, _, cursor, has_more = self.poll()
+        self.assertEqual(([row.name for row in changed], has_more), (["settled"], False))
+
+        Organisation.all_objects.filter(pk=fresh.pk).update(updated_at=timezone.now() - timedelta(seconds=6))
+        changed, _, _, _ = self.poll(cursor)
+        self.assertEqual([row.name for row in changed], ["fresh"])
+
+    def test_update_without_updated_at_is_not_seen(self):
+        organisation = self.organisation("quiet", 1)
+        _, _, cursor, _ = self.poll()
+        Organisation.all_objects.filter(pk=organisation.pk).update(name="renamed")
+        self.assertEqual(self.poll(cursor), ([], [], cursor, False))
+
+    def test_limit_is_clamped(self):
+        for second in range(12):
+            self.organisation(f"organisation {second:02}", second)
+        changed, _, _, has_more = self.poll(limit=50)
+        self.assertEqual((len(changed), has_more), (10, True))
+
+    def test_invalid_cursor(self):
+        with self.assertRaises(InvalidCursor):
+            self.poll("not-a-cursor")
+        self.assertEqual(decode_cursor(encode_cursor(self.base, uuid.UUID(int=1))), (self.base, uuid.UUID(int=1)))
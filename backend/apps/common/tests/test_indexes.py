@@ -0,0 +1,53 @@
+from io import StringIO
+
+from django.apps import apps
+from django.core.management import call_command
+from django.test import TestCase
+
+from apps.common.models import (
+    ACTIVE_INDEX_CONDITION, SoftDeleteModel, UUIDPKBaseModel, add_active_indexes, is_active_index,
+)
+from apps.referral_management.models import Referral
+
+
+def soft_delete_models():
+    return [model for model in apps.get_models() if issubclass(model, SoftDeleteModel)]
+
+
+class ActiveIndexTest(TestCase):
+    def test_indexes_follow_ordering_and_active_indexes(self):
+        active = {tuple(index.fields): index for index in Referral._meta.indexes if is_active_index(index)}
+        self.assertEqual(set(active), {
+            ('-referral_date', '-created_at'),
+            ('status', '-referral_date'),
+            ('client_type', '-referral_date'),
+        })
+        for index in active.values():
+            self.assertEqual(index.condition, ACTIVE_INDEX_CONDITION)
+            self.assertTrue(index.name.endswith('_act'))
+        # The declared full indexes are kept.
+        self.assertIn(['status'], [index.fields for index in Referral._meta.indexes if index.condition is None])
+
+    def test_change_feed_index(self):
+        for model in soft_delete_models():
+            change = [index for index in model._meta.indexes if index.fields == ['updated_at', 'id']]
+            self.assertEqual(len(change), 1 if issubclass(model, UUIDPKBaseModel) else 0, model)
+            if change:
+                self.assertIsNone(change[0].condition)
+
+    def test_names_are_short_and_unique(self):
+        names = [index.name for model in soft_delete_models() for index in model._meta.indexes]
+        self.assertTrue(all(len(name) <= 30 for name in names), [name for name in names if len(name) > 30])
+        self.assertEqual(len(names), len(set(names)))
+
+    def test_running_again_adds_nothing(self):
+        before = list(Referral._meta.indexes)
+        add_active_indexes(Referral)
+        self.assertEqual([index.name for index in Referral._meta.indexes], [index.name for index in before])
+        self.assertEqual(Referral._meta.original_attrs['indexes'], Referral._meta.indexes)
+
+    def test_check_command(self):
+        for args in (['--skip-db'], []):
+            out = StringIO()
+            call_command('check_soft_delete_indexes', '--fail', *args, stdout=out)
+            self.assertIn('soft-delete models have active-row indexes', out.getvalue())
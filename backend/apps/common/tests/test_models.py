@@ -0,0 +1,100 @@
+from django.contrib.auth import get_user_model
+from django.db import DatabaseError, transaction
+from django.db.models.signals import post_save, pre_save
+from django.test import TestCase
+
+from apps.common.models import Organisation
+from apps.optionlists.models import OptionList
+
+User = get_user_model()
+
+
+class DirtyFieldSaveTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="aroha", email="aroha@example.org")
+        self.organisation = Organisation.objects.create(name="Te Whare")
+        self.option_list = OptionList.objects.create(name="Statuses", slug="statuses", metadata={"colours": ["red"]})
+
+    def test_loading_copies_nothing(self):
+        option_list = OptionList.objects.get(pk=self.option_list.pk)
+        self.assertNotIn("_field_snapshot", option_list.__dict__)
+
+    def test_unchanged_save_writes_nothing(self):
+        organisation = Organisation.objects.get(pk=self.organisation.pk)
+        with self.assertNumQueries(0):
+            organisation.save()
+            organisation.save(user=self.user)
+        option_list = OptionList.objects.get(pk=self.option_list.pk)
+        option_list.metadata  # read, but not changed
+        with self.assertNumQueries(0):
+            option_list.save()
+
+    def test_unchanged_save_still_sends_signals(self):
+        received = []
+
+        def receiver(signal, sender, instance, update_fields, **kwargs):
+            received.append((signal, instance, update_fields))
+
+        pre_save.connect(receiver, sender=Organisation)
+        post_save.connect(receiver, sender=Organisation)
+        self.addCleanup(pre_save.disconnect, receiver, sender=Organisation)
+        self.addCleanup(post_save.disconnect, receiver, sender=Organisation)
+        organisation = Organisation.objects.get(pk=self.organisation.pk)
+        organisation.save()
+        self.assertEqual(received, [(pre_save, organisation, None), (post_save, organisation, None)])
+
+    def test_save_writes_only_changed_columns(self):
+        organisation = Organisation.objects.get(pk=self.organisation.pk)
+        Organisation.objects.filter(pk=organisation.pk).update(is_active=False)
+        organisation.name = "Te Whare Tapa Whā"
+        # One UPDATE, even inside a transaction: no savepoint around it.
+        with self.assertNumQueries(1) as captured:
+            organisation.save(user=self.user)
+        sql = captured.captured_queries[0]["sql"]
+        self.assertTrue(sql.startswith("UPDATE"))
+        self.assertNotIn('"is_active"', sql)
+        organisation.refresh_from_db()
+        self.assertEqual(organisation.name, "Te Whare Tapa Whā")
+        # The concurrent is_active change was not overwritten.
+        self.assertFalse(organisation.is_active)
+        self.assertEqual(organisation.updated_by, self.user)
+        with self.assertNumQueries(0):
+            organisation.save()
+
+    def test_json_edited_in_place_is_saved(self):
+        option_list = OptionList.objects.get(pk=self.option_list.pk)
+        option_list.metadata["colours"].append("green")
+        option_list.save()
+        self.assertEqual(OptionList.objects.get(pk=option_list.pk).metadata, {"colours": ["red", "green"]})
+        with self.assertNumQueries(0):
+            option_list.save()
+
+    def test_json_replaced_without_reading_is_saved(self):
+        option_list = OptionList.objects.get(pk=self.option_list.pk)
+        option_list.metadata = {"colours": []}
+        option_list.save()
+        self.assertEqual(OptionList.objects.get(pk=option_list.pk).metadata, {"colours": []})
+
+    def test_save_of_a_deleted_row_reinserts_it(self):
+        organisation = Organisation.objects.get(pk=self.organisation.pk)
+        Organisation.all_objects.filter(pk=organisation.pk).delete()
+        organisation.name = "Te Whare Hou"
+        organisation.save()
+        self.assertEqual(Organisation.objects.get(pk=organisation.pk).name, "Te Whare Hou")
+
+    def test_explicit_update_fields_on_a_deleted_row_raises(self):
+        organisation = Organisation.objects.get(pk=self.organisation.pk)
+        Organisation.all_objects.filter(pk=organisation.pk).delete()
+        organisation.name = "Te Whare Hou"
+        with self.assertRaises(DatabaseError), transaction.atomic():
+            organisation.save(update_fields=["name"])
+        self.assertFalse(Organisation.all_objects.filter(pk=organisation.pk).exists())
+
+    def test_soft_delete_and_undelete(self):
+        organisation = Organisation.objects.get(pk=self.organisation.pk)
+        organisation.delete(user=self.user)
+        self.assertFalse(Organisation.objects.filter(pk=organisation.pk).exists())
+        deleted = Organisation.all_objects.get(pk=organisation.pk)
+        self.assertEqual((deleted.is_deleted, deleted.deleted_by), (True, self.user))
+        deleted.undelete()
+        self.assertTrue(Organisation.objects.filter(pk=organisation.pk).exists())
@@ -0,0 +1,77 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+
+from apps.common.models import Organisation
+
+User = get_user_model()
+
+
+class BulkAuditedTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="aroha", email="aroha@example.org")
+        self.organisations = Organisation.objects.bulk_create_audited(
+            [Organisation(name=f"Organisation {index}") for index in range(3)],
+            user=self.user,
+        )
+
+    def test_bulk_create_stamps_creator(self):
+        self.assertEqual(
+            set(Organisation.objects.values_list("created_by", "updated_by")),
+            {(self.user.pk, self.user.pk)},
+        )
+
+    def test_bulk_update_writes_fields_and_stamps(self):
+        editor = User.objects.create_user(username="mere", email="mere@example.org")
+        organisations = list(Organisation.objects.order_by("name"))
+        before = {organisation.pk: organisation.updated_at for organisation in organisations}
+        for organisation in organisations:
+            organisation.name = organisation.name.upper()
+        with self.assertNumQueries(1):
+            rows = Organisation.objects.bulk_update_audited(organisations, ["name"], user=editor)
+        self.assertEqual(rows, 3)
+        for organisation in Organisation.objects.all():
+            self.assertTrue(organisation.name.startswith("ORGANISATION"))
+            self.assertEqual(organisation.updated_by, editor)
+            self.assertGreater(organisation.updated_at, before[organisation.pk])
+        # The written values are the new baseline, so a plain save() has nothing to do.
+        with self.assertNumQueries(0):
+            organisations[0].save()
+
+    def test_bulk_update_without_user_keeps_updated_by(self):
+        organisations = list(Organisation.objects.all())
+        for organisation in organisations:
+            organisation.is_active = False
+        Organisation.objects.bulk_update_audited(organisations, ["is_active"])
+        self.assertEqual(
+            set(Organisation.objects.values_list("is_active", "updated_by")),
+            {(False, self.user.pk)},
+        )
+
+    def test_soft_delete_returns_count(self):
+        deleted = Organisation.objects.filter(name="Organisation 0").soft_delete(user=self.user)
+        self.assertEqual(deleted, 1)
+        organisation = Organisation.all_objects.get(name="Organisation 0")
+        self.assertTrue(organisation.is_deleted)
+        self.assertEqual(organisation.deleted_by, self.user)
+        self.assertIsNotNone(organisation.deleted_at)
+
+    def test_soft_delete_returning_ids(self):
+        expected = {self.organisations[0].pk, self.organisations[1].pk}
+        ids = Organisation.objects.filter(pk__in=expected).soft_delete(user=self.user, returning=True)
+        self.assertEqual(set(ids), expected)
+        self.assertEqual(set(Organisation.objects.values_list("pk", flat=True)), {self.organisations[2].pk})
+        # Rows that are already deleted are not matched again.
+        self.assertEqual(Organisation.objects.soft_delete(returning=True), [self.organisations[2].pk])
+
+    def test_soft_delete_returning_without_update_returning(self):
+        expected = {self.organisations[0].pk, self.organisations[1].pk}
+        with mock.patch.object(connection.features, "can_return_columns_from_insert", False):
+            ids = Organisation.objects.filter(pk__in=expected).soft_delete(user=self.user, returning=True)
+        self.assertEqual(set(ids), expected)
+        self.assertEqual(
+            set(Organisation.all_objects.filter(is_deleted=True).values_list("pk", "deleted_by")),
+            {(pk, self.user.pk) for pk in expected},
+        )
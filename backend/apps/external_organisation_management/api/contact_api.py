@@ -3,18 +3,32 @@ from typing import List, Optional
 
 from ninja import Router, Query, Body
 from ninja.errors import HttpError
+from ninja.pagination import paginate
 from django.http import Http404
 
 from ..schemas import (
     ExternalOrganisationContactSchemaIn,
     ExternalOrganisationContactSchemaOut,
 )
+from ..models import ExternalOrganisationContact
 from .. import services
+from apps.authentication.decorators import auth_required
+from apps.common.changes import add_changes_endpoint
+from apps.common.pagination import KeysetPagination
 
 contacts_router = Router(tags=["External Organisation Contacts"])
 
+add_changes_endpoint(
+    contacts_router, ExternalOrganisationContact, ExternalOrganisationContactSchemaOut,
+    queryset=lambda: ExternalOrganisationContact.all_objects.select_related(
+        'organisation__type', 'created_by', 'updated_by'
+    ).prefetch_related('phones__type', 'emails__type'),
+    auth=auth_required,
+)
+
 # Collection operations (on /)
 @contacts_router.get("/", response=List[ExternalOrganisationContactSchemaOut], summary="List contacts")
+@paginate(KeysetPagination)
 def list_external_organisation_contacts(request, organisation_id: Optional[uuid.UUID] = Query(None)):
     filters = {}
     if organisation_id:
@@ -3,18 +3,30 @@ from typing import List, Optional
 
 from ninja import Router, Query, Body
 from ninja.errors import HttpError
+from ninja.pagination import paginate
 from django.http import Http404
 
 from ..schemas import (
     EmailAddressSchemaIn,
     EmailAddressSchemaOut,
 )
+from ..models import EmailAddress
 from .. import services
+from apps.authentication.decorators import auth_required
+from apps.common.changes import add_changes_endpoint
+from apps.common.pagination import KeysetPagination
 
 emails_router = Router(tags=["Email Addresses"])
 
+add_changes_endpoint(
+    emails_router, EmailAddress, EmailAddressSchemaOut,
+    queryset=lambda: EmailAddress.all_objects.select_related('type', 'created_by', 'updated_by'),
+    auth=auth_required,
+)
+
 # Collection operations (on /)
 @emails_router.get("/", response=List[EmailAddressSchemaOut], summary="List email addresses")
+@paginate(KeysetPagination)
 def list_email_addresses(request, contact_id: Optional[uuid.UUID] = Query(None), organisation_id: Optional[uuid.UUID] = Query(None)):
     if not hasattr(request, 'user') or not request.user.is_authenticated:
         raise HttpError(401, "Authentication required.")
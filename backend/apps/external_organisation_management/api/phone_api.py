@@ -3,6 +3,7 @@ from typing import List, Optional
 
 from ninja import Router, Query, Body
 from ninja.errors import HttpError
+from ninja.pagination import paginate
 from django.http import Http404
 
 from ..models import (
@@ -17,11 +18,21 @@ from ..schemas import (
     PhoneNumberSchemaOut,
 )
 from .. import services
+from apps.authentication.decorators import auth_required
+from apps.common.changes import add_changes_endpoint
+from apps.common.pagination import KeysetPagination
 
 phones_router = Router(tags=["Phone Numbers"])
 
+add_changes_endpoint(
+    phones_router, PhoneNumberModel, PhoneNumberSchemaOut,
+    queryset=lambda: PhoneNumberModel.all_objects.select_related('type', 'created_by', 'updated_by'),
+    auth=auth_required,
+)
+
 # Collection operations (on /)
 @phones_router.get("/", response=List[PhoneNumberSchemaOut], summary="List phone numbers")
+@paginate(KeysetPagination)
 def list_phone_numbers(request, contact_id: Optional[uuid.UUID] = Query(None), organisation_id: Optional[uuid.UUID] = Query(None)):
     if not hasattr(request, 'user') or not request.user.is_authenticated:
         raise HttpError(401, "Authentication required.")
@@ -5,6 +5,7 @@ from django.http import Http404
 from django.conf import settings
 import uuid # Ensure uuid is imported if not already present globally for org_id type hint
 from ninja.errors import HttpError
+from ninja.pagination import paginate
 
 from .models import ExternalOrganisation
 from .schemas import (
@@ -12,6 +13,9 @@ from .schemas import (
     ExternalOrganisationSchemaIn, 
     ExternalOrganisationSchemaOut
 )
+from apps.authentication.decorators import auth_required
+from apps.common.changes import add_changes_endpoint
+from apps.common.pagination import KeysetPagination
 from .services import (
     external_organisation_create,
     external_organisation_list,
@@ -29,6 +33,14 @@ class ExternalOrganisationFilterSchema(Schema):
 
 external_org_router = Router(tags=["External Organisations"])
 
+add_changes_endpoint(
+    external_org_router, ExternalOrganisation, ExternalOrganisationSchemaOut,
+    queryset=lambda: ExternalOrganisation.all_objects.select_related(
+        'type', 'created_by', 'updated_by'
+    ).prefetch_related('contacts', 'phones__type', 'emails__type'),
+    auth=auth_required,
+)
+
 
 @external_org_router.get("/batch-dropdowns/", response=ExternalOrganisationBatchDropdownsOut, summary="Get Batch Dropdowns for External Organisations")
 def batch_dropdowns_external_org(request):
@@ -55,9 +67,10 @@ def create_external_organisation(request, payload: ExternalOrganisationSchemaIn)
         raise HttpError(500, "An unexpected error occurred while creating the organisation." if not settings.DEBUG else str(e) )
 
 @external_org_router.get("/", response=List[ExternalOrganisationSchemaOut], summary="List External Organisations")
+@paginate(KeysetPagination)
 def list_external_organisations(request, filters: ExternalOrganisationFilterSchema = Query(default=ExternalOrganisationFilterSchema())):
     """
-    Retrieve a list of all external organisations.
+    Retrieve external organisations by name, one page at a time (``limit``, ``cursor``).
     Supports filtering by query parameters (e.g., ?type__slug=service-provider&name__icontains=test).
     """
     # Convert Pydantic model to dict, excluding unset values so we don't pass None for unprovided filters
@@ -0,0 +1,31 @@
+# Generated by Django 5.0.14 on 2026-10-16 22:47
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('external_organisation_management', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='emailaddress',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['email'], name='external_organisa_7eb74dd9_act'),
+        ),
+        migrations.AddIndex(
+            model_name='externalorganisation',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['name'], name='external_organisa_ec6f71ce_act'),
+        ),
+        migrations.AddIndex(
+            model_name='externalorganisationcontact',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['organisation', 'last_name', 'first_name'], name='external_organisa_c8b45593_act'),
+        ),
+        migrations.AddIndex(
+            model_name='phonenumber',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['number'], name='external_organisa_7331678d_act'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.0.14 on 2026-10-16 22:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('external_organisation_management', '0002_active_row_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='emailaddress',
+            index=models.Index(fields=['updated_at', 'id'], name='external_organisa_cf8f733d_chg'),
+        ),
+        migrations.AddIndex(
+            model_name='externalorganisation',
+            index=models.Index(fields=['updated_at', 'id'], name='external_organisa_ef4a3c23_chg'),
+        ),
+        migrations.AddIndex(
+            model_name='externalorganisationcontact',
+            index=models.Index(fields=['updated_at', 'id'], name='external_organisa_45351597_chg'),
+        ),
+        migrations.AddIndex(
+            model_name='phonenumber',
+            index=models.Index(fields=['updated_at', 'id'], name='external_organisa_10f7be08_chg'),
+        ),
+    ]
@@ -47,6 +47,9 @@ class ExternalOrganisationContact(UUIDPKBaseModel):
     is_active = models.BooleanField(default=True, verbose_name=_('Active'))
     notes = models.TextField(blank=True, verbose_name=_('Notes'))
 
+    # The default ordering starts on a related field, so index contacts per organisation instead.
+    active_indexes = [('organisation', 'last_name', 'first_name')]
+
     def __str__(self):
         return f"{self.first_name} {self.last_name} ({self.organisation.name})"
 
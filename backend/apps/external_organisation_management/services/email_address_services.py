@@ -13,6 +13,18 @@ from ..schemas import (
     EmailAddressSchemaIn,
 )
 from apps.optionlists.models import OptionListItem
+from apps.optionlists.validation import InvalidOptionItems, OptionFieldValidator
+
+EMAIL_ADDRESS_OPTION_FIELDS = OptionFieldValidator({'type': 'common-email-types'})
+
+
+def _resolve_type(type_id) -> OptionListItem:
+    if type_id is None:
+        raise Http404("type_id is required.")
+    try:
+        return EMAIL_ADDRESS_OPTION_FIELDS.resolve({'type': type_id})['type']
+    except InvalidOptionItems as e:
+        raise Http404(str(e))
 
 # --- Email Address Services ---
 
@@ -23,7 +35,7 @@ def email_address_create(payload: EmailAddressSchemaIn, user: settings.AUTH_USER
         raise ValueError("EmailAddress cannot be associated with both a contact and an organisation simultaneously.")
 
     email_data = payload.dict(exclude_unset=True)
-    type_instance = get_object_or_404(OptionListItem, pk=payload.type_id)
+    type_instance = _resolve_type(payload.type_id)
     email_data['type'] = type_instance
     del email_data['type_id']
 
@@ -58,7 +70,7 @@ def email_address_update(email_address_id: uuid.UUID, payload: EmailAddressSchem
     update_data = payload.dict(exclude_unset=True)
 
     if 'type_id' in update_data:
-        type_instance = get_object_or_404(OptionListItem, pk=update_data.pop('type_id'))
+        type_instance = _resolve_type(update_data.pop('type_id'))
         email_address.type = type_instance
 
     # Determine final state of associations based on explicit payload fields
@@ -15,6 +15,10 @@ from ..schemas import (
 )
 from apps.optionlists.models import OptionList, OptionListItem # For external_organisation_list_service_providers
 from apps.optionlists.services import OptionListService # For batch dropdowns
+from apps.optionlists.registry import get_option_registry
+from apps.optionlists.validation import InvalidOptionItems, OptionFieldValidator
+
+ORGANISATION_OPTION_FIELDS = OptionFieldValidator({'type': 'external-organisation-types'})
 
 # --- External Organisation Services ---
 
@@ -50,11 +54,8 @@ def external_organisation_create(payload: ExternalOrganisationSchemaIn, user: se
         raise ValueError("type_id is required to create an organisation.")
 
     try:
-        organisation_type = OptionListItem.objects.get(
-            pk=type_id,
-            option_list__slug='external-organisation-types'
-        )
-    except OptionListItem.DoesNotExist:
+        organisation_type = ORGANISATION_OPTION_FIELDS.resolve({'type': type_id})['type']
+    except InvalidOptionItems:
         raise ValueError(f"Invalid type_id: {type_id}. Organisation type not found.")
 
     organisation = ExternalOrganisation(type=organisation_type, **org_data)
@@ -78,13 +79,12 @@ def external_organisation_update(organisation_id: uuid.UUID, payload: ExternalOr
         # Only fetch and update if type_id is actually different or if organisation.type is None (though type is not nullable)
         if organisation.type_id != new_type_id:
             try:
-                new_organisation_type = OptionListItem.objects.get(
-                    pk=new_type_id,
-                    option_list__slug='external-organisation-types'
-                )
-                organisation.type = new_organisation_type
-            except OptionListItem.DoesNotExist:
+                new_organisation_type = ORGANISATION_OPTION_FIELDS.resolve({'type': new_type_id})['type']
+            except InvalidOptionItems:
+                new_organisation_type = None
+            if new_organisation_type is None:
                 raise ValueError(f"Invalid new type_id: {new_type_id}. Organisation type not found.")
+            organisation.type = new_organisation_type
 
     for key, value in update_data.items():
         setattr(organisation, key, value)
@@ -99,9 +99,8 @@ def external_organisation_delete(organisation_id: uuid.UUID, user: settings.AUTH
 def get_service_provider_organisations() -> List[ExternalOrganisation]:
     # Assuming 'Service Provider' is the name of the OptionListItem for service provider type
     # And 'external-organisation-types' is the slug of the OptionList for organisation types
-    try:
-        service_provider_item = OptionListItem.objects.get(option_list__slug='external-organisation-types', slug='service-provider')
-        return ExternalOrganisation.objects.filter(type=service_provider_item, is_active=True).select_related('type', 'created_by', 'updated_by')
-    except OptionListItem.DoesNotExist:
+    service_provider_item = get_option_registry().get_item_by_slug('external-organisation-types', 'service-provider')
+    if service_provider_item is None:
         # If the 'service-provider' OptionListItem itself is not found under the correct OptionList.
         return ExternalOrganisation.objects.none() # Return an empty queryset consistently
+    return ExternalOrganisation.objects.filter(type=service_provider_item, is_active=True).select_related('type', 'created_by', 'updated_by')
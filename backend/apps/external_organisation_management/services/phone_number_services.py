@@ -13,6 +13,18 @@ from ..schemas import (
     PhoneNumberSchemaIn,
 )
 from apps.optionlists.models import OptionListItem
+from apps.optionlists.validation import InvalidOptionItems, OptionFieldValidator
+
+PHONE_NUMBER_OPTION_FIELDS = OptionFieldValidator({'type': 'common-phone-types'})
+
+
+def _resolve_type(type_id) -> OptionListItem:
+    if type_id is None:
+        raise Http404("type_id is required.")
+    try:
+        return PHONE_NUMBER_OPTION_FIELDS.resolve({'type': type_id})['type']
+    except InvalidOptionItems as e:
+        raise Http404(str(e))
 
 # --- Phone Number Services ---
 
@@ -24,7 +36,7 @@ def phone_number_create(payload: PhoneNumberSchemaIn, user: settings.AUTH_USER_M
 
     phone_data = payload.dict(exclude_unset=True)
     
-    type_instance = get_object_or_404(OptionListItem, pk=payload.type_id)
+    type_instance = _resolve_type(payload.type_id)
     phone_data['type'] = type_instance
     del phone_data['type_id']
 
@@ -58,7 +70,7 @@ def phone_number_update(phone_number_id: uuid.UUID, payload: PhoneNumberSchemaIn
     update_data = payload.dict(exclude_unset=True)
 
     if 'type_id' in update_data:
-        type_instance = get_object_or_404(OptionListItem, pk=update_data.pop('type_id'))
+        type_instance = _resolve_type(update_data.pop('type_id'))
         phone_number.type = type_instance
 
     final_contact = phone_number.contact
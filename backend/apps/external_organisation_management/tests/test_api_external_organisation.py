@@ -117,7 +117,7 @@ def test_list_external_organisations(django_api_client, organisation_type_option
     django_api_client.force_login(test_user) # Assuming list might be protected or to be consistent
     response = django_api_client.get("/api/external-organisations/")
     assert response.status_code == 200, response.content
-    organisations_data = response.json()
+    organisations_data = response.json()["items"]
     
     assert len(organisations_data) >= 2
     
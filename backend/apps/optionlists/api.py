@@ -1,14 +1,95 @@
-from typing import Optional, List
-from ninja import Router, Query
-from django.http import Http404
-from .schemas import OptionListItemSchemaOut
-from .models import OptionList # For existence check
+from typing import Optional, List, Dict
+from uuid import UUID
+from ninja import Router, Query, Schema
+from django.http import Http404, HttpResponse
+from apps.common.http import etag_matches, make_etag, not_modified, set_validators
+from .schemas import OptionListItemSchemaOut, OptionListItemTreeOut
 from .services import OptionListService
+from .registry import get_option_registry
 # from apps.client_management.schemas import ClientBatchDropdownsOut
 
+# Upper bound on slugs per batch request, so one request cannot ask for everything.
+MAX_BATCH_SLUGS = 50
+
+
+class ErrorSchema(Schema):
+    detail: str
+
+
+def parse_slugs(slugs: str) -> List[str]:
+    """Split a comma-separated ``slugs`` parameter, dropping blanks and duplicates but keeping order."""
+    return list(dict.fromkeys(slug.strip() for slug in slugs.split(',') if slug.strip()))
+
+
 def create_optionlists_router():
     router = Router(tags=["Option Lists"])
 
+    @router.get("/batch", response={200: Dict[str, List[OptionListItemSchemaOut]], 400: ErrorSchema},
+                summary="List the active items of several OptionLists in one request")
+    def list_option_list_items_batch(request, response: HttpResponse, slugs: str,
+                                     organization_id: Optional[UUID] = Query(None), region: Optional[str] = Query(None)):
+        """
+        Returns ``{slug: [items]}`` for every slug in ``slugs`` (comma-separated),
+        e.g. ``/optionlists/batch?slugs=referral-types,referral-statuses``.
+        Unknown slugs map to an empty list. With ``organization_id`` and/or
+        ``region`` each list is resolved for that scope: the organisation's
+        overrides and regional variants replace template items slug by slug.
+
+        The response carries an ETag derived from the items themselves; send it
+        back in ``If-None-Match`` to get a 304 while the lists are unchanged.
+        """
+        requested = parse_slugs(slugs)
+        if not requested:
+            return 400, ErrorSchema(detail="At least one slug is required.")
+        if len(requested) > MAX_BATCH_SLUGS:
+            return 400, ErrorSchema(detail=f"At most {MAX_BATCH_SLUGS} slugs can be requested at once.")
+
+        registry = get_option_registry()
+        etag = registry.batch_etag(requested, organization_id=organization_id, region=region)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        set_validators(response, etag)
+        return 200, registry.batch(requested, organization_id=organization_id, region=region)
+
+    @router.get("/{list_slug}/tree", response={200: List[OptionListItemTreeOut], 404: ErrorSchema},
+                summary="List the items of an OptionList as a nested tree")
+    def list_option_list_tree(request, response: HttpResponse, list_slug: str,
+                              organization_id: Optional[UUID] = Query(None), region: Optional[str] = Query(None)):
+        """
+        Returns the active items of ``list_slug`` nested by ``parent``: root items,
+        each with its ``children``, ordered by sort order. Built in memory from the
+        option list registry. Supports ``If-None-Match``.
+        """
+        registry = get_option_registry()
+        if not registry.has_list(list_slug):
+            return 404, ErrorSchema(detail=f"OptionList with slug '{list_slug}' not found.")
+        roots, _, etag = registry.tree(list_slug, organization_id=organization_id, region=region)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        set_validators(response, etag)
+        return 200, roots
+
+    @router.get("/items/{item_id}/subtree", response={200: OptionListItemTreeOut, 404: ErrorSchema},
+                summary="Get an OptionListItem with all of its descendants")
+    def get_option_item_subtree(request, response: HttpResponse, item_id: int,
+                                organization_id: Optional[UUID] = Query(None), region: Optional[str] = Query(None)):
+        node = get_option_registry().subtree(item_id, organization_id=organization_id, region=region)
+        if node is None:
+            return 404, ErrorSchema(detail=f"OptionListItem {item_id} not found or not active.")
+        etag = make_etag(node)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        set_validators(response, etag)
+        return 200, node
+
+    @router.get("/items/{item_id}/ancestors", response={200: List[OptionListItemSchemaOut], 404: ErrorSchema},
+                summary="List the ancestors of an OptionListItem, root first")
+    def list_option_item_ancestors(request, item_id: int):
+        registry = get_option_registry()
+        if registry.get_item(item_id) is None:
+            return 404, ErrorSchema(detail=f"OptionListItem {item_id} not found.")
+        return 200, registry.ancestors(item_id)
+
     # @router.get("/client-batch-dropdowns/", response=ClientBatchDropdownsOut, summary="Retrieve Batch Dropdowns for Client Management")
     # def get_client_batch_dropdowns(request, organization_id: Optional[int] = Query(None, description="Optional Organization ID to filter dropdowns")):
     #     """
@@ -28,7 +109,7 @@ def create_optionlists_router():
         Items are ordered by their predefined sort_order.
         """
         # First, check if the OptionList itself exists to provide a clear 404 for the list itself
-        if not OptionList.objects.filter(slug=list_slug).exists():
+        if not get_option_registry().has_list(list_slug):
             raise Http404(f"OptionList with slug '{list_slug}' not found.")
 
         items = OptionListService.get_active_items_for_list_slug(list_slug=list_slug)
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class OptionlistsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.optionlists'
+
+    def ready(self):
+        import apps.optionlists.signals
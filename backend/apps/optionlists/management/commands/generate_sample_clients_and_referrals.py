@@ -68,6 +68,7 @@ class Command(BaseCommand):
             )
             if hasattr(client, 'pronoun') and pronoun:
                 client.pronoun = pronoun
+            client.refresh_search_text()  # bulk_create bypasses save()
             clients.append(client)
         Client.objects.bulk_create(clients)
         self.stdout.write(self.style.SUCCESS(f"Created {len(clients)} clients."))
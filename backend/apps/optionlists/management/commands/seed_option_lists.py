@@ -0,0 +1,69 @@
+import os
+import re
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+
+from apps.optionlists.seeding import DEFAULT_BATCH_SIZE, FixtureError, FixtureSeeder
+
+
+def default_fixtures():
+    """
+    Reference data and every option list fixture, in the order scripts/load_fixtures.sh
+    uses. client_management/fixtures/client_option_lists.json is left out: its
+    items have no slugs, and 3_client-statuses.json already seeds that list.
+    """
+    def path(app_label, *parts):
+        return os.path.join(apps.get_app_config(app_label).path, 'fixtures', *parts)
+
+    optionlists_dir = path('optionlists')
+    numbered = sorted(
+        (name for name in os.listdir(optionlists_dir) if name.endswith('.json')),
+        key=lambda name: int(re.match(r'\d+', name).group()) if re.match(r'\d+', name) else 0,
+    )
+    return [
+        path('reference_data', 'countries.json'),
+        path('reference_data', 'languages.json'),
+        *(os.path.join(optionlists_dir, name) for name in numbered),
+        path('external_organisation_management', 'optionlists_external_organisation_types.json'),
+    ]
+
+
+# Safe to re-run, e.g. after every deploy or when building a test database:
+# python manage.py seed_option_lists [fixture.json ...] [--dry-run]
+class Command(BaseCommand):
+    help = 'Upsert option lists and reference data (countries, languages) from fixtures, matching rows on natural keys'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'fixtures', nargs='*',
+            help='Fixture files to seed (default: reference data and all option list fixtures)',
+        )
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+        parser.add_argument('--dry-run', action='store_true', help='Report what would change, then roll back')
+
+    def handle(self, *args, **options):
+        paths = options['fixtures'] or default_fixtures()
+        for fixture in paths:
+            if not os.path.isfile(fixture):
+                raise CommandError(f'Fixture not found: {fixture}')
+
+        seeder = FixtureSeeder(using=options['database'], batch_size=options['batch_size'])
+        try:
+            results = seeder.seed(paths, dry_run=options['dry_run'])
+        except FixtureError as e:
+            raise CommandError(str(e))
+
+        for label, result in results.items():
+            self.stdout.write(
+                f'{label}: {result.inserted} inserted, {result.updated} updated, {result.unchanged} unchanged'
+            )
+            if result.ignored_fields:
+                self.stderr.write(f'  ignored unknown fields: {", ".join(sorted(result.ignored_fields))}')
+
+        if options['dry_run']:
+            self.stdout.write(self.style.WARNING(f'Dry run: rolled back changes from {len(paths)} fixture(s).'))
+        else:
+            self.stdout.write(self.style.SUCCESS(f'Seeded {len(paths)} fixture(s).'))
@@ -0,0 +1,23 @@
+# Generated by Django 5.0.14 on 2026-10-16 22:47
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('optionlists', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='optionlist',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['name'], name='optionlists_optio_5f55f571_act'),
+        ),
+        migrations.AddIndex(
+            model_name='optionlistitem',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['option_list', 'sort_order', 'name'], name='optionlists_optio_4ca38da3_act'),
+        ),
+    ]
@@ -0,0 +1,288 @@
+"""
+In-memory option list registry.
+
+Every non-deleted ``OptionList`` and ``OptionListItem`` is loaded in two
+queries and indexed by slug and id, then shared
+by every request in the process. FK validation and dropdown reads become dict
+lookups instead of a query (or two) each.
+
+The registry is versioned. Signal receivers in ``apps.optionlists.signals``
+call ``invalidate_after_write()`` when a list or item is saved or deleted: the
+next lookup rebuilds it, so a transaction reads its own writes, and it is
+invalidated again when the transaction commits. A registry built from writes
+that were then rolled back (including every ``TestCase`` test) is discarded
+on the next lookup. Writes made in other processes, or through
+queryset ``update()``/bulk helpers that send no signals, are picked up by a
+fingerprint check: one aggregate query at most every
+``OPTION_LISTS['REGISTRY_CHECK_INTERVAL']`` seconds.
+
+The model instances handed out are shared between requests. Treat them as
+read-only.
+
+Organisation overrides and regional variants are resolved by
+``apps.optionlists.scope``. Each resolved scope is memoised on the registry,
+so adding tenants does not add queries. Item hierarchies are built from the
+same data by ``apps.optionlists.tree`` and memoised the same way.
+"""
+import logging
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Max
+
+from apps.common.http import make_etag
+
+from .models import OptionList, OptionListItem
+from .scope import resolve_items, scope_lists
+from .tree import Node, ancestors, build_tree
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHECK_INTERVAL = 30
+
+
+def table_fingerprint() -> Tuple:
+    """Row counts and latest ``updated_at`` of both tables, soft-deleted rows included."""
+    lists = OptionList.all_objects.aggregate(count=Count('id'), latest=Max('updated_at'))
+    items = OptionListItem.all_objects.aggregate(count=Count('id'), latest=Max('updated_at'))
+    return (lists['count'], lists['latest'], items['count'], items['latest'])
+
+
+class OptionListRegistry:
+    """Versioned lookup tables of option lists and their items."""
+
+    def __init__(self, version: int, fingerprint: Tuple, lists: List[OptionList], items: List[OptionListItem]):
+        self.version = version
+        self.fingerprint = fingerprint
+        self.built_at = time.monotonic()
+        self.checked_at = self.built_at
+        # Uncommitted list/item writes of the building thread's transaction it includes.
+        self.uncommitted = 0
+
+        self.lists_by_id: Dict[int, OptionList] = {option_list.id: option_list for option_list in lists}
+        self.lists_by_slug: Dict[str, List[OptionList]] = defaultdict(list)
+        for option_list in lists:
+            self.lists_by_slug[option_list.slug].append(option_list)
+
+        self.items_by_id: Dict[int, OptionListItem] = {}
+        self.items_by_list: Dict[int, List[OptionListItem]] = defaultdict(list)
+        for item in items:
+            option_list = self.lists_by_id.get(item.option_list_id)
+            if option_list is None:
+                continue  # Item of a soft-deleted list
+            # Pre-fill the relation so item.option_list never queries.
+            item.option_list = option_list
+            self.items_by_id[item.id] = item
+            self.items_by_list[item.option_list_id].append(item)
+        for list_items in self.items_by_list.values():
+            list_items.sort(key=lambda item: (item.sort_order, item.name))
+        # Memoised scopes and batch ETags; safe because a registry never changes once built.
+        self._scopes: Dict[Tuple, List[OptionListItem]] = {}
+        self._trees: Dict[Tuple, Tuple[List[Node], Dict[int, Node], str]] = {}
+        self._etags: Dict[Tuple, str] = {}
+
+    @classmethod
+    def build(cls, version: int) -> 'OptionListRegistry':
+        fingerprint = table_fingerprint()
+        lists = list(OptionList.objects.order_by('name', 'id'))
+        items = list(OptionListItem.objects.all())
+        logger.debug(f"Built option list registry v{version}: {len(lists)} lists, {len(items)} items")
+        return cls(version, fingerprint, lists, items)
+
+    # --- Lists ---
+
+    def get_list(self, slug: str, organization_id: Optional[Any] = None) -> Optional[OptionList]:
+        """The list ``slug`` owned by ``organization_id``, or the global one when no organisation is given."""
+        for option_list in self.lists_by_slug.get(slug, ()):
+            if organization_id:
+                if str(option_list.organization_id) == str(organization_id):
+                    return option_list
+            elif option_list.organization_id is None:
+                return option_list
+        return None
+
+    def get_list_by_id(self, option_list_id) -> Optional[OptionList]:
+        return self.lists_by_id.get(option_list_id)
+
+    def has_list(self, slug: str) -> bool:
+        return slug in self.lists_by_slug
+
+    # --- Items ---
+
+    def get_item(self, item_id, list_slug: Optional[str] = None) -> Optional[OptionListItem]:
+        """The item with ``item_id``, optionally required to belong to a list with slug ``list_slug``."""
+        try:
+            item = self.items_by_id.get(int(item_id))
+        except (TypeError, ValueError):
+            return None
+        if item is None or (list_slug is not None and item.option_list.slug != list_slug):
+            return None
+        return item
+
+    def get_item_by_slug(self, list_slug: str, item_slug: str, region: Optional[str] = None,
+                         organization_id: Optional[Any] = None) -> Optional[OptionListItem]:
+        """The effective item ``item_slug`` in the scope, active or not."""
+        for item in self.resolve(list_slug, organization_id, region, active_only=False):
+            if item.slug == item_slug:
+                return item
+        return None
+
+    def items_for(self, option_list: OptionList, region: Optional[str] = None,
+                  active_only: bool = True) -> List[OptionListItem]:
+        """Items of ``option_list`` alone (no template overlay) for ``region``, ordered by sort order."""
+        return resolve_items([self.items_by_list.get(option_list.id, ())], region, active_only)
+
+    def resolve(self, list_slug: str, organization_id: Optional[Any] = None, region: Optional[str] = None,
+                active_only: bool = True) -> List[OptionListItem]:
+        """Effective items of ``list_slug`` for an organisation and region (see ``apps.optionlists.scope``)."""
+        key = (list_slug, organization_id, region, active_only)
+        items = self._scopes.get(key)
+        if items is None:
+            layers = [
+                self.items_by_list.get(option_list.id, ())
+                for option_list in scope_lists(self.lists_by_slug.get(list_slug, ()), organization_id)
+            ]
+            items = resolve_items(layers, region, active_only)
+            self._scopes[key] = items
+        return items
+
+    def active_items(self, list_slug: str, organization_id: Optional[Any] = None,
+                     region: Optional[str] = None) -> List[OptionListItem]:
+        return self.resolve(list_slug, organization_id, region)
+
+    def batch(self, slugs: Iterable[str], organization_id: Optional[Any] = None,
+              region: Optional[str] = None) -> Dict[str, List[OptionListItem]]:
+        """Active items for each slug in ``slugs`` (an empty list for unknown slugs)."""
+        return {slug: self.active_items(slug, organization_id, region) for slug in slugs}
+
+    def batch_etag(self, slugs: Iterable[str], organization_id: Optional[Any] = None,
+                   region: Optional[str] = None) -> str:
+        """
+        Content-based ETag for ``batch()``. It depends only on the items, not on the
+        registry version, so every worker process computes the same value.
+        """
+        key = (tuple(slugs), organization_id, region)
+        etag = self._etags.get(key)
+        if etag is None:
+            etag = make_etag([
+                (slug, [
+                    (item.id, item.slug, item.name, item.label, item.sort_order, item.is_active)
+                    for item in items
+                ])
+                for slug, items in self.batch(key[0], organization_id, region).items()
+            ])
+            self._etags[key] = etag
+        return etag
+
+    # --- Hierarchies ---
+
+    def tree(self, list_slug: str, organization_id: Optional[Any] = None, region: Optional[str] = None,
+             active_only: bool = True) -> Tuple[List[Node], Dict[int, Node], str]:
+        """
+        The resolved items of ``list_slug`` nested by parent: ``(roots, nodes by
+        item id, etag)``. The nodes are shared; do not modify them.
+        """
+        key = (list_slug, organization_id, region, active_only)
+        tree = self._trees.get(key)
+        if tree is None:
+            roots, nodes = build_tree(self.resolve(list_slug, organization_id, region, active_only), self.items_by_id)
+            tree = (roots, nodes, make_etag(list_slug, roots))
+            self._trees[key] = tree
+        return tree
+
+    def subtree(self, item_id, organization_id: Optional[Any] = None, region: Optional[str] = None,
+                active_only: bool = True) -> Optional[Node]:
+        """The node of ``item_id`` with its descendants, or None if the item is not in its list's tree."""
+        item = self.get_item(item_id)
+        if item is None:
+            return None
+        _, nodes, _ = self.tree(item.option_list.slug, organization_id, region, active_only)
+        return nodes.get(item.id)
+
+    def ancestors(self, item_id) -> List[OptionListItem]:
+        """Ancestors of ``item_id``, root first; empty for roots and unknown items."""
+        item = self.get_item(item_id)
+        return ancestors(item, self.items_by_id) if item is not None else []
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'version': self.version,
+            'lists': len(self.lists_by_id),
+            'items': len(self.items_by_id),
+            'age_seconds': round(time.monotonic() - self.built_at, 1),
+        }
+
+
+_registry: Optional[OptionListRegistry] = None
+_version = 0
+_lock = threading.Lock()
+
+
+def _check_interval() -> float:
+    return getattr(settings, 'OPTION_LISTS', {}).get('REGISTRY_CHECK_INTERVAL', DEFAULT_CHECK_INTERVAL)
+
+
+def _invalidate_on_commit() -> None:
+    invalidate_option_registry()
+
+
+def _uncommitted_writes() -> int:
+    """Number of list/item writes in this thread's transaction that are not committed yet."""
+    connection = transaction.get_connection()
+    if not connection.in_atomic_block:
+        return 0
+    return sum(1 for _, func, _ in connection.run_on_commit if func is _invalidate_on_commit)
+
+
+def _is_current(registry: Optional[OptionListRegistry]) -> bool:
+    if registry is None or registry.version != _version:
+        return False
+    # Committed and new writes bump the version, so writes that vanished were rolled back.
+    return not registry.uncommitted or _uncommitted_writes() >= registry.uncommitted
+
+
+def get_option_registry() -> OptionListRegistry:
+    """Return the current registry, rebuilding it if the option list tables changed since it was built."""
+    global _registry, _version
+    registry = _registry
+    if _is_current(registry):
+        interval = _check_interval()
+        if not interval or time.monotonic() - registry.checked_at < interval:
+            return registry
+
+    with _lock:
+        registry = _registry
+        if _is_current(registry):
+            interval = _check_interval()
+            if not interval or time.monotonic() - registry.checked_at < interval:
+                return registry
+            # Another process may have changed the tables.
+            if table_fingerprint() == registry.fingerprint:
+                registry.checked_at = time.monotonic()
+                return registry
+            _version += 1
+        elif registry is not None and registry.version == _version:
+            _version += 1
+        _registry = OptionListRegistry.build(_version)
+        _registry.uncommitted = _uncommitted_writes()
+        return _registry
+
+
+def invalidate_option_registry() -> None:
+    global _version
+    with _lock:
+        _version += 1
+
+
+def invalidate_after_write() -> None:
+    """
+    Invalidate the registry for a list or item write: now, so the writing
+    transaction reads its own changes, and again once the write commits, so
+    registries other threads built from the old rows meanwhile are dropped.
+    """
+    invalidate_option_registry()
+    transaction.on_commit(_invalidate_on_commit)
@@ -1,6 +1,7 @@
 from typing import Optional, List, Any
 from .models import OptionList, OptionListItem
-from django.db.models import Q, QuerySet
+from .scope import resolve_items, scope_lists
+from django.db.models import Q
 
 class OptionListRepository:
     """
@@ -34,13 +35,34 @@ class OptionListItemRepository:
     Repository for OptionListItem data access, with scoping logic.
     """
     @staticmethod
-    def get_items(option_list: OptionList, region: Optional[str] = None, client_id: Optional[str] = None, active_only: bool = True) -> QuerySet:
-        qs = OptionListItem.objects.filter(option_list=option_list)
-        if active_only:
-            qs = qs.filter(is_active=True)
+    def get_items(option_list: OptionList, region: Optional[str] = None, client_id: Optional[str] = None, active_only: bool = True) -> List[OptionListItem]:
+        # Regional and no-region items in one query; regional ones win per slug.
+        regions = Q(region__isnull=True)
         if region:
-            region_items = qs.filter(region=region)
-            if region_items.exists():
-                return region_items.order_by("sort_order")
-        # System-wide fallback (no region specified or no region items)
-        return qs.filter(region__isnull=True).order_by("sort_order")
+            regions |= Q(region=region)
+        items = OptionListItem.objects.filter(regions, option_list=option_list)
+        return resolve_items([items], region, active_only)
+
+    @staticmethod
+    def get_effective_items(slug: str, organization_id: Optional[Any] = None, region: Optional[str] = None, active_only: bool = True) -> List[OptionListItem]:
+        """
+        Items of ``slug`` for an organisation and region, template overlaid by the
+        organisation's overrides, in a single query. Request paths should prefer
+        the registry, which resolves the same scope from memory.
+        """
+        owners = Q(option_list__organization__isnull=True)
+        if organization_id:
+            owners |= Q(option_list__organization_id=organization_id)
+        regions = Q(region__isnull=True)
+        if region:
+            regions |= Q(region=region)
+        items = list(
+            OptionListItem.objects
+            .filter(owners, regions, option_list__slug=slug, option_list__is_deleted=False)
+            .select_related('option_list')
+        )
+        by_list = {}
+        for item in items:
+            by_list.setdefault(item.option_list_id, []).append(item)
+        lists = scope_lists({item.option_list_id: item.option_list for item in items}.values(), organization_id)
+        return resolve_items([by_list[option_list.id] for option_list in lists], region, active_only)
@@ -1,5 +1,5 @@
 from ninja import Schema
-from typing import Optional
+from typing import List, Optional
 
 class OptionListItemSchemaOut(Schema):
     id: int
@@ -9,6 +9,11 @@ class OptionListItemSchemaOut(Schema):
     sort_order: int
     is_active: bool
 
+class OptionListItemTreeOut(OptionListItemSchemaOut):
+    children: List['OptionListItemTreeOut'] = []
+
+OptionListItemTreeOut.model_rebuild()
+
 class OptionListSchemaOut(Schema):
     id: int
     name: str
@@ -0,0 +1,62 @@
+"""
+Effective option list items for an (organisation, region) scope.
+
+A slug can exist as a template list with no organisation, plus one override
+list per organisation. The items a tenant sees are resolved per item slug,
+most specific first:
+
+    1. the organisation's item for the region
+    2. the organisation's item with no region
+    3. the template's item for the region
+    4. the template's item with no region
+
+So an organisation item replaces the template item with the same slug, and an
+inactive one hides it. Organisation items with new slugs are added. A regional
+item replaces its no-region counterpart the same way. Inactive items are
+dropped only after resolution.
+
+The functions here work on items that are already loaded. The registry feeds
+them from memory and ``OptionListItemRepository`` from a single query.
+"""
+from typing import Any, Dict, Iterable, List, Optional
+
+from .models import OptionList, OptionListItem
+
+
+def scope_lists(candidates: Iterable[OptionList], organization_id: Optional[Any] = None) -> List[OptionList]:
+    """
+    The lists that make up a scope, least specific first: the template (the
+    list with no organisation, preferring one flagged ``is_template``) and the
+    organisation's own list. Either may be missing. ``organization_id`` may be
+    a UUID or its string form.
+    """
+    template = None
+    own = None
+    for option_list in candidates:
+        if option_list.organization_id is None:
+            if template is None or (option_list.is_template and not template.is_template):
+                template = option_list
+        elif organization_id and str(option_list.organization_id) == str(organization_id):
+            own = option_list
+    return [option_list for option_list in (template, own) if option_list is not None]
+
+
+def resolve_items(layers: Iterable[Iterable[OptionListItem]], region: Optional[str] = None,
+                  active_only: bool = True) -> List[OptionListItem]:
+    """
+    Overlay ``layers`` (item lists, least specific first) by item slug for
+    ``region``, ordered by sort order then name.
+    """
+    effective: Dict[str, OptionListItem] = {}
+    for items in layers:
+        items = list(items)
+        for item in items:
+            if item.region is None:
+                effective[item.slug] = item
+        if region:
+            for item in items:
+                if item.region == region:
+                    effective[item.slug] = item
+    resolved = [item for item in effective.values() if item.is_active or not active_only]
+    resolved.sort(key=lambda item: (item.sort_order, item.name))
+    return resolved
@@ -0,0 +1,291 @@
+"""
+Idempotent bulk seeding of option lists and reference data from fixtures.
+
+``loaddata`` saves fixture objects one by one by primary key. Re-running it
+against a database whose rows were created elsewhere duplicates them or fails
+on the unique constraints. The seeder matches rows on their natural keys
+instead:
+
+    optionlists.optionlist       (slug, organization)
+    optionlists.optionlistitem   (option_list, slug, region)
+    reference_data.country       (code)
+    reference_data.language      (code)
+
+Fixture files are parsed incrementally. Rows are then compared with one query
+per model (per tree level for nested items). Only new rows are inserted and
+only changed rows are updated, in batches, inside a single transaction.
+Fixture primary keys are kept for new rows whenever they are free, so other
+fixtures that reference them keep working. Foreign keys between seeded rows
+are remapped when a row already exists under a different key.
+
+``region`` and ``organization`` are nullable and NULLs never conflict in a
+unique index, so an ``ON CONFLICT (option_list, slug, region)`` upsert would
+insert duplicates of every region-less item. Matching is therefore done in
+Python against the prefetched rows.
+"""
+import json
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+from django.apps import apps
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.core.management.color import no_style
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+from apps.common.models import SoftDeleteModel, SoftDeleteQuerySet
+
+DEFAULT_BATCH_SIZE = 1000
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+
+@dataclass(frozen=True)
+class SeedSpec:
+    key: Tuple[str, ...]  # Attnames forming the natural key; the first one narrows the prefetch query
+    refs: Dict[str, str] = field(default_factory=dict)  # FK attname -> label of the seeded model it points at
+
+
+# Processed in this order, so referenced rows exist before the rows that point at them.
+SEED_SPECS = {
+    'reference_data.country': SeedSpec(key=('code',)),
+    'reference_data.language': SeedSpec(key=('code',)),
+    'optionlists.optionlist': SeedSpec(key=('slug', 'organization_id')),
+    'optionlists.optionlistitem': SeedSpec(
+        key=('option_list_id', 'slug', 'region'),
+        refs={'option_list_id': 'optionlists.optionlist', 'parent_id': 'optionlists.optionlistitem'},
+    ),
+}
+
+
+class FixtureError(ValueError):
+    """Raised for fixture content the seeder cannot handle."""
+
+
+def _as_pk(model, pk):
+    """``pk`` as a primary key value of ``model``, or None if it is only a fixture label."""
+    if pk is None:
+        return None
+    try:
+        return model._meta.pk.to_python(pk)
+    except ValidationError:
+        return None
+
+
+@dataclass
+class SeedResult:
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    ignored_fields: set = field(default_factory=set)
+
+
+def iter_fixture_objects(path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[dict]:
+    """Yield the objects of a JSON fixture (a top-level array) without loading the whole file."""
+    decoder = json.JSONDecoder()
+    buffer, pos, eof, started = '', 0, False, False
+    with open(path, encoding='utf-8') as stream:
+        while True:
+            while pos < len(buffer) and (buffer[pos].isspace() or (started and buffer[pos] == ',')):
+                pos += 1
+            if pos < len(buffer):
+                if not started:
+                    if buffer[pos] != '[':
+                        raise FixtureError(f"{path}: expected a JSON array of objects")
+                    started = True
+                    pos += 1
+                    continue
+                if buffer[pos] == ']':
+                    return
+                try:
+                    obj, end = decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    if eof:
+                        raise FixtureError(f"{path}: invalid JSON near offset {pos}")
+                else:
+                    if not isinstance(obj, dict):
+                        raise FixtureError(f"{path}: expected an object at offset {pos}")
+                    yield obj
+                    pos = end
+                    continue
+            elif eof:
+                raise FixtureError(f"{path}: unexpected end of file")
+            chunk = stream.read(chunk_size)
+            eof = not chunk
+            buffer, pos = buffer[pos:] + chunk, 0
+
+
+class FixtureSeeder:
+    def __init__(self, using: str = DEFAULT_DB_ALIAS, batch_size: int = DEFAULT_BATCH_SIZE):
+        self.using = using
+        self.batch_size = batch_size
+        self.results: Dict[str, SeedResult] = defaultdict(SeedResult)
+        # Model label -> {fixture pk: database pk}
+        self.pk_maps: Dict[str, Dict[Any, Any]] = defaultdict(dict)
+
+    def seed(self, paths: Iterable[str], dry_run: bool = False) -> Dict[str, SeedResult]:
+        """Seed every object in ``paths`` in one transaction; ``dry_run`` rolls it back."""
+        rows: Dict[str, List[Tuple[Any, Dict[str, Any]]]] = defaultdict(list)
+        for path in paths:
+            for obj in iter_fixture_objects(path):
+                label = str(obj.get('model', '')).lower()
+                if label not in SEED_SPECS:
+                    raise FixtureError(f"{path}: model '{label}' is not seedable; use loaddata for it")
+                model = apps.get_model(label)
+                values = self._values(label, model, obj.get('fields', {}))
+                missing = [
+                    attname for attname in SEED_SPECS[label].key
+                    if values.get(attname) is None and not model._meta.get_field(attname.removesuffix('_id')).null
+                ]
+                if missing:
+                    raise FixtureError(f"{path}: {label} {obj.get('pk')!r} has no {', '.join(missing)}")
+                rows[label].append((obj.get('pk'), values))
+
+        with transaction.atomic(using=self.using):
+            for label in SEED_SPECS:
+                if rows.get(label):
+                    self._seed_model(label, rows[label])
+            self._invalidate_caches(rows)
+            if dry_run:
+                transaction.set_rollback(True, using=self.using)
+        return dict(self.results)
+
+    def _values(self, label: str, model, fields: Dict[str, Any]) -> Dict[str, Any]:
+        values = {}
+        for name, value in fields.items():
+            try:
+                model_field = model._meta.get_field(name)
+            except FieldDoesNotExist:
+                self.results[label].ignored_fields.add(name)
+                continue
+            if not model_field.concrete or model_field.many_to_many or getattr(model_field, 'auto_now', False) \
+                    or getattr(model_field, 'auto_now_add', False):
+                continue
+            if model_field.attname in SEED_SPECS[label].refs or value is None:
+                values[model_field.attname] = value  # Fixture pk, converted once mapped
+            else:
+                target = model_field.target_field if model_field.is_relation else model_field
+                values[model_field.attname] = target.to_python(value)
+        return values
+
+    def _seed_model(self, label: str, rows: List[Tuple[Any, Dict[str, Any]]]) -> None:
+        spec = SEED_SPECS[label]
+        # Rows pointing at other rows of the same model go after their parents.
+        for level in self._levels(label, spec, rows):
+            self._seed_level(label, spec, level)
+
+    def _levels(self, label: str, spec: SeedSpec, rows) -> List[list]:
+        self_refs = [attname for attname, target in spec.refs.items() if target == label]
+        if not self_refs:
+            return [rows]
+        parents = {pk: values for pk, values in rows if pk is not None}
+        depths: Dict[Any, int] = {}
+
+        def depth(pk, values, seen=()):
+            if pk in depths:
+                return depths[pk]
+            parent = next((values.get(attname) for attname in self_refs if values.get(attname) is not None), None)
+            if parent is None or parent not in parents or parent in seen:
+                result = 0
+            else:
+                result = depth(parent, parents[parent], seen + (pk,)) + 1
+            if pk is not None:
+                depths[pk] = result
+            return result
+
+        levels = defaultdict(list)
+        for pk, values in rows:
+            levels[depth(pk, values)].append((pk, values))
+        return [levels[level] for level in sorted(levels)]
+
+    def _seed_level(self, label: str, spec: SeedSpec, rows) -> None:
+        model = apps.get_model(label)
+        soft_delete = issubclass(model, SoftDeleteModel)
+        result = self.results[label]
+
+        for pk, values in rows:
+            for attname, target in spec.refs.items():
+                value = values.get(attname)
+                if value is not None:
+                    if value in self.pk_maps[target]:
+                        values[attname] = self.pk_maps[target][value]
+                    else:
+                        # Not seeded here: an existing row's primary key, as loaddata would assume
+                        values[attname] = apps.get_model(target)._meta.pk.to_python(value)
+            if soft_delete:
+                values.update(is_deleted=False, deleted_at=None, deleted_by_id=None)
+
+        manager = model._base_manager.using(self.using)
+        first = spec.key[0]
+        existing = {
+            tuple(getattr(row, attname) for attname in spec.key): row
+            for row in manager.filter(**{f"{first}__in": {values.get(first) for _, values in rows}})
+        }
+        fixture_pks = {_as_pk(model, pk) for pk, _ in rows} - {None}
+        taken = set(manager.filter(pk__in=fixture_pks).values_list('pk', flat=True)) if fixture_pks else set()
+
+        new, changed, changed_fields = [], [], set()
+        handled = set()  # id() of rows already inserted or compared
+        mapped = []  # (fixture pk, row), resolved once new rows have their keys
+        for pk, values in rows:
+            key = tuple(values.get(attname) for attname in spec.key)
+            row = existing.get(key)
+            if row is None:
+                row = model(**values)
+                explicit_pk = _as_pk(model, pk)
+                if explicit_pk is not None and explicit_pk not in taken:
+                    row.pk = explicit_pk
+                    taken.add(explicit_pk)
+                existing[key] = row
+                new.append(row)
+            elif id(row) not in handled:
+                diff = {attname for attname, value in values.items() if getattr(row, attname) != value}
+                if diff:
+                    for attname in diff:
+                        setattr(row, attname, values[attname])
+                    changed.append(row)
+                    changed_fields |= diff
+                else:
+                    result.unchanged += 1
+            # else: repeated in the fixtures; the first occurrence wins
+            handled.add(id(row))
+            if pk is not None:
+                mapped.append((pk, row))
+
+        queryset = SoftDeleteQuerySet(model, using=self.using) if soft_delete else manager
+        if new:
+            explicit_pks = any(row.pk is not None for row in new)
+            if soft_delete:
+                queryset.bulk_create_audited(new, batch_size=self.batch_size)
+            else:
+                queryset.bulk_create(new, batch_size=self.batch_size)
+            result.inserted += len(new)
+            if explicit_pks:
+                self._reset_sequence(model)
+        for pk, row in mapped:
+            self.pk_maps[label][pk] = row.pk
+        if changed:
+            # bulk_update takes field names, not attnames
+            names_by_attname = {model_field.attname: model_field.name for model_field in model._meta.concrete_fields}
+            names = [names_by_attname[attname] for attname in changed_fields]
+            if soft_delete:
+                queryset.bulk_update_audited(changed, names, batch_size=self.batch_size)
+            else:
+                queryset.bulk_update(changed, names, batch_size=self.batch_size)
+            result.updated += len(changed)
+
+    def _reset_sequence(self, model) -> None:
+        connection = connections[self.using]
+        statements = connection.ops.sequence_reset_sql(no_style(), [model])
+        if statements:
+            with connection.cursor() as cursor:
+                for sql in statements:
+                    cursor.execute(sql)
+
+    def _invalidate_caches(self, rows) -> None:
+        # Bulk writes send no signals, so drop the in-process caches ourselves.
+        if any(label.startswith('optionlists.') for label in rows):
+            from .registry import invalidate_option_registry
+            transaction.on_commit(invalidate_option_registry, using=self.using)
+        if any(label.startswith('reference_data.') for label in rows):
+            from apps.reference_data.cache import invalidate_reference_payloads
+            transaction.on_commit(invalidate_reference_payloads, using=self.using)
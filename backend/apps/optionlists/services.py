@@ -5,6 +5,7 @@ from django.db.models import QuerySet, Case, When
 from django.db import models # Added for models.Case, models.When if not covered by direct import
 from .models import OptionList, OptionListItem
 from .repositories import OptionListRepository, OptionListItemRepository
+from .registry import get_option_registry
 # from apps.client_management.schemas import (
 #     ClientBatchDropdownsOut,
 #     SimpleDropdownItemOut,
@@ -22,26 +23,17 @@ class OptionListService:
         Retrieves all active OptionListItems for a given OptionList slug,
         ordered by sort_order (assuming repository handles ordering).
         """
-        try:
-            # Assuming OptionListRepository.get_by_slug does not need organization_id for global lists like 'external-organisation-types'
-            # If OptionListRepository.get_by_slug can't find the list, it should raise an exception (e.g., OptionList.DoesNotExist)
-            option_list = OptionListRepository.get_by_slug(slug=list_slug, organization_id=None) # Explicitly pass None if org_id is not relevant here
-            if option_list:
-                # OptionListItemService.get_items_for_scope already handles active_only=True
-                # and repository should handle ordering by sort_order.
-                return OptionListItemService.get_items_for_scope(option_list=option_list, active_only=True)
-        except OptionList.DoesNotExist:
-            # This case will be handled by the API layer to return a 404 if the list itself is not found.
-            return []
-        return []
+        # Served from the in-memory registry; global lists only (no organization_id).
+        return get_option_registry().active_items(list_slug)
+
+    @staticmethod
+    def get_active_items_for_slugs(slugs: List[str], organization_id: Optional[Any] = None) -> Dict[str, List[OptionListItem]]:
+        """Active items for several lists at once, keyed by slug; unknown slugs map to an empty list."""
+        return get_option_registry().batch(slugs, organization_id=organization_id)
 
     @staticmethod
     def _get_option_list_items(slug: str, organization_id: Optional[Any] = None) -> List[OptionListItem]:
-        option_list = OptionListRepository.get_by_slug(slug=slug, organization_id=organization_id)
-        if option_list:
-            # Assuming get_items_for_scope handles active_only and ordering by sort_order
-            return list(OptionListItemService.get_items_for_scope(option_list=option_list, active_only=True))
-        return []
+        return get_option_registry().active_items(slug, organization_id=organization_id)
 
     # @staticmethod
     # def get_options_for_client_batch_dropdowns(organization_id: Optional[Any] = None) -> ClientBatchDropdownsOut:
@@ -118,4 +110,5 @@ class OptionListItemService:
     """
     @staticmethod
     def get_items_for_scope(option_list: OptionList, region: Optional[str] = None, client_id: Optional[str] = None, active_only: bool = True) -> List[OptionListItem]:
-        return list(OptionListItemRepository.get_items(option_list, region, client_id, active_only))
+        # client_id is accepted for API compatibility; items are not client-scoped.
+        return get_option_registry().items_for(option_list, region=region, active_only=active_only)
@@ -0,0 +1,14 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import OptionList, OptionListItem
+from .registry import invalidate_after_write
+
+
+@receiver(post_save, sender=OptionList)
+@receiver(post_delete, sender=OptionList)
+@receiver(post_save, sender=OptionListItem)
+@receiver(post_delete, sender=OptionListItem)
+def invalidate_registry_on_change(sender, **kwargs):
+    """Rebuild the in-memory option list registry, now and once the change is committed."""
+    invalidate_after_write()
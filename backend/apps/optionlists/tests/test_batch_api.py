@@ -0,0 +1,37 @@
+from django.test import TestCase
+from ninja.testing import TestClient
+from apps.optionlists.api import create_optionlists_router
+from apps.optionlists.models import OptionList, OptionListItem
+
+
+class OptionListBatchAPITest(TestCase):
+    def setUp(self):
+        self.client = TestClient(create_optionlists_router())
+        self.types = OptionList.objects.create(name="Referral Types", slug="referral-types")
+        self.priorities = OptionList.objects.create(name="Referral Priorities", slug="referral-priorities")
+        OptionListItem.objects.create(option_list=self.types, slug="internal", name="internal", label="Internal")
+        self.urgent = OptionListItem.objects.create(option_list=self.priorities, slug="urgent", name="urgent", label="Urgent")
+
+    def test_returns_every_requested_list(self):
+        response = self.client.get("/batch?slugs=referral-types,referral-priorities,missing")
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual([item["slug"] for item in data["referral-types"]], ["internal"])
+        self.assertEqual([item["slug"] for item in data["referral-priorities"]], ["urgent"])
+        self.assertEqual(data["missing"], [])
+
+    def test_conditional_get(self):
+        etag = self.client.get("/batch?slugs=referral-types,referral-priorities")["ETag"]
+        with self.assertNumQueries(0):
+            response = self.client.get("/batch?slugs=referral-types,referral-priorities", headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.urgent.label = "Very urgent"
+            self.urgent.save()
+        response = self.client.get("/batch?slugs=referral-types,referral-priorities", headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_requires_slugs(self):
+        self.assertEqual(self.client.get("/batch?slugs=,").status_code, 400)
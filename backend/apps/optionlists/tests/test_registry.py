@@ -0,0 +1,54 @@
+from django.db import transaction
+from django.test import TestCase
+from apps.optionlists.models import OptionList, OptionListItem
+from apps.optionlists.registry import get_option_registry
+
+
+class OptionListRegistryTest(TestCase):
+    def setUp(self):
+        self.statuses = OptionList.objects.create(name="Client Statuses", slug="client-statuses")
+        self.types = OptionList.objects.create(name="Referral Types", slug="referral-types")
+        self.active = OptionListItem.objects.create(option_list=self.statuses, slug="active", name="active", sort_order=2)
+        self.pending = OptionListItem.objects.create(option_list=self.statuses, slug="pending", name="pending", sort_order=1)
+        self.closed = OptionListItem.objects.create(option_list=self.statuses, slug="closed", name="closed", is_active=False)
+        self.internal = OptionListItem.objects.create(option_list=self.types, slug="internal", name="internal")
+
+    def test_lookups_need_no_queries(self):
+        registry = get_option_registry()
+        with self.assertNumQueries(0):
+            self.assertEqual(registry.get_item(self.active.id).slug, "active")
+            self.assertEqual(registry.get_item(str(self.active.id), list_slug="client-statuses").id, self.active.id)
+            self.assertEqual(registry.get_item_by_slug("referral-types", "internal").id, self.internal.id)
+            self.assertEqual(registry.get_item(self.active.id).option_list.slug, "client-statuses")
+
+    def test_get_item_checks_the_list(self):
+        registry = get_option_registry()
+        self.assertIsNone(registry.get_item(self.internal.id, list_slug="client-statuses"))
+        self.assertIsNone(registry.get_item(999999))
+        self.assertIsNone(registry.get_item("not-an-id"))
+
+    def test_active_items_are_ordered_and_filtered(self):
+        items = get_option_registry().active_items("client-statuses")
+        self.assertEqual([item.slug for item in items], ["pending", "active"])
+
+    def test_rebuilt_after_save_and_delete(self):
+        version = get_option_registry().version
+        with self.captureOnCommitCallbacks(execute=True):
+            OptionListItem.objects.create(option_list=self.types, slug="external", name="external")
+        registry = get_option_registry()
+        self.assertGreater(registry.version, version)
+        self.assertIsNotNone(registry.get_item_by_slug("referral-types", "external"))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.internal.delete()
+        self.assertIsNone(get_option_registry().get_item(self.internal.id))
+
+    def test_uncommitted_writes_are_read_and_rolled_back_ones_dropped(self):
+        get_option_registry()
+        with self.assertRaises(RuntimeError), transaction.atomic():
+            OptionListItem.objects.create(option_list=self.types, slug="external", name="external")
+            self.assertIsNotNone(get_option_registry().get_item_by_slug("referral-types", "external"))
+            raise RuntimeError
+        self.assertIsNone(get_option_registry().get_item_by_slug("referral-types", "external"))
+        with self.assertNumQueries(0):
+            get_option_registry().active_items("client-statuses")
@@ -0,0 +1,40 @@
+from django.test import TestCase
+from apps.common.models import Organisation
+from apps.optionlists.models import OptionList, OptionListItem
+from apps.optionlists.registry import get_option_registry
+from apps.optionlists.repositories import OptionListItemRepository
+
+
+class OptionListScopeTest(TestCase):
+    def setUp(self):
+        self.org = Organisation.objects.create(name="Tenant")
+        template = OptionList.objects.create(name="Priorities", slug="priorities", is_template=True)
+        own = OptionList.objects.create(name="Priorities", slug="priorities", organization=self.org)
+        OptionListItem.objects.create(option_list=template, slug="low", name="low", label="Low", sort_order=1)
+        OptionListItem.objects.create(option_list=template, slug="high", name="high", label="High", sort_order=2)
+        OptionListItem.objects.create(option_list=template, slug="high", name="high", label="High (NZ)", sort_order=2, region="NZ")
+        OptionListItem.objects.create(option_list=template, slug="urgent", name="urgent", label="Urgent", sort_order=3)
+        OptionListItem.objects.create(option_list=own, slug="low", name="low", label="Routine", sort_order=1)
+        OptionListItem.objects.create(option_list=own, slug="urgent", name="urgent", label="Urgent", is_active=False)
+        OptionListItem.objects.create(option_list=own, slug="critical", name="critical", label="Critical", sort_order=4)
+
+    def labels(self, items):
+        return [item.label for item in items]
+
+    def test_template_only(self):
+        registry = get_option_registry()
+        self.assertEqual(self.labels(registry.resolve("priorities")), ["Low", "High", "Urgent"])
+        self.assertEqual(self.labels(registry.resolve("priorities", region="NZ")), ["Low", "High (NZ)", "Urgent"])
+
+    def test_organisation_overrides_template(self):
+        registry = get_option_registry()
+        self.assertEqual(self.labels(registry.resolve("priorities", self.org.id)), ["Routine", "High", "Critical"])
+        self.assertEqual(self.labels(registry.resolve("priorities", str(self.org.id), "NZ")), ["Routine", "High (NZ)", "Critical"])
+        self.assertEqual(registry.get_item_by_slug("priorities", "urgent", organization_id=self.org.id).is_active, False)
+
+    def test_single_query_matches_registry(self):
+        registry = get_option_registry()
+        for organization_id, region in [(None, None), (None, "NZ"), (self.org.id, None), (self.org.id, "NZ")]:
+            with self.assertNumQueries(1):
+                items = OptionListItemRepository.get_effective_items("priorities", organization_id, region)
+            self.assertEqual([item.id for item in items], [item.id for item in registry.resolve("priorities", organization_id, region)])
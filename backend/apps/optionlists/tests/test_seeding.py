@@ -0,0 +1,53 @@
+import json
+import os
+import tempfile
+
+from django.test import TestCase
+from apps.optionlists.models import OptionList, OptionListItem
+from apps.optionlists.seeding import FixtureSeeder, iter_fixture_objects
+
+FIXTURE = [
+    {"model": "optionlists.optionlist", "pk": 50, "fields": {"name": "Service Types", "slug": "service-types"}},
+    {"model": "optionlists.optionlistitem", "pk": 501, "fields": {"option_list": 50, "slug": "health", "name": "Health", "sort_order": 1}},
+    {"model": "optionlists.optionlistitem", "pk": 502, "fields": {"option_list": 50, "slug": "gp", "name": "GP", "parent": 501}},
+    {"model": "optionlists.optionlistitem", "pk": 503, "fields": {"option_list": 50, "slug": "housing", "name": "Housing", "label": "Housing"}},
+]
+
+
+class FixtureSeederTest(TestCase):
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix='.json')
+        with os.fdopen(handle, 'w') as stream:
+            json.dump(FIXTURE, stream, indent=2)
+        self.addCleanup(os.remove, self.path)
+
+    def counts(self, results):
+        return {label: (r.inserted, r.updated, r.unchanged) for label, r in results.items()}
+
+    def test_streams_objects(self):
+        self.assertEqual(list(iter_fixture_objects(self.path, chunk_size=7)), FIXTURE)
+
+    def test_seeding_is_idempotent(self):
+        first = FixtureSeeder().seed([self.path])
+        self.assertEqual(self.counts(first), {'optionlists.optionlist': (1, 0, 0), 'optionlists.optionlistitem': (3, 0, 0)})
+        self.assertEqual(OptionListItem.objects.get(pk=502).parent_id, 501)
+
+        second = FixtureSeeder().seed([self.path])
+        self.assertEqual(self.counts(second), {'optionlists.optionlist': (0, 0, 1), 'optionlists.optionlistitem': (0, 0, 3)})
+        self.assertEqual(OptionListItem.objects.count(), 3)
+
+    def test_matches_existing_rows_on_natural_keys(self):
+        existing = OptionList.objects.create(name="Old", slug="service-types")
+        health = OptionListItem.objects.create(option_list=existing, slug="health", name="Health", sort_order=1)
+        OptionListItem.objects.create(option_list=existing, slug="housing", name="Housing", label="Housing")
+
+        results = FixtureSeeder().seed([self.path])
+        self.assertEqual(self.counts(results), {'optionlists.optionlist': (0, 1, 0), 'optionlists.optionlistitem': (1, 0, 2)})
+        gp = OptionListItem.objects.get(slug="gp")
+        self.assertEqual((gp.option_list_id, gp.parent_id), (existing.id, health.id))
+        self.assertEqual(OptionList.objects.get(pk=existing.pk).name, "Service Types")
+
+    def test_dry_run_rolls_back(self):
+        results = FixtureSeeder().seed([self.path], dry_run=True)
+        self.assertEqual(results['optionlists.optionlistitem'].inserted, 3)
+        self.assertFalse(OptionListItem.objects.exists())
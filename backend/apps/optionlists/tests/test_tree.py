@@ -0,0 +1,51 @@
+from django.test import TestCase
+from ninja.testing import TestClient
+from apps.common.models import Organisation
+from apps.optionlists.api import create_optionlists_router
+from apps.optionlists.models import OptionList, OptionListItem
+from apps.optionlists.registry import get_option_registry
+
+
+class OptionListTreeTest(TestCase):
+    def setUp(self):
+        self.client = TestClient(create_optionlists_router())
+        self.org = Organisation.objects.create(name="Tenant")
+        template = OptionList.objects.create(name="Sources", slug="sources", is_template=True)
+        own = OptionList.objects.create(name="Sources", slug="sources", organization=self.org)
+        self.agency = OptionListItem.objects.create(option_list=template, slug="agency", name="agency", label="Agency", sort_order=1)
+        self.health = OptionListItem.objects.create(option_list=template, slug="health", name="health", label="Health", parent=self.agency)
+        self.gp = OptionListItem.objects.create(option_list=template, slug="gp", name="gp", label="GP", parent=self.health)
+        OptionListItem.objects.create(option_list=template, slug="self", name="self", label="Self", sort_order=2)
+        self.own_agency = OptionListItem.objects.create(option_list=own, slug="agency", name="agency", label="Local agency", sort_order=1)
+
+    def test_nested_tree_without_queries(self):
+        get_option_registry()
+        with self.assertNumQueries(0):
+            roots, _, _ = get_option_registry().tree("sources")
+        self.assertEqual([node["slug"] for node in roots], ["agency", "self"])
+        self.assertEqual(roots[0]["children"][0]["slug"], "health")
+        self.assertEqual(roots[0]["children"][0]["children"][0]["slug"], "gp")
+
+    def test_subtree_and_ancestors(self):
+        registry = get_option_registry()
+        self.assertEqual([node["slug"] for node in registry.subtree(self.health.id)["children"]], ["gp"])
+        self.assertEqual([item.slug for item in registry.ancestors(self.gp.id)], ["agency", "health"])
+        self.assertEqual(registry.ancestors(self.agency.id), [])
+
+    def test_override_adopts_template_children(self):
+        roots, _, _ = get_option_registry().tree("sources", self.org.id)
+        self.assertEqual(roots[0]["label"], "Local agency")
+        self.assertEqual(roots[0]["id"], self.own_agency.id)
+        self.assertEqual(roots[0]["children"][0]["slug"], "health")
+
+    def test_tree_endpoint(self):
+        response = self.client.get("/sources/tree")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()[0]["children"][0]["children"][0]["label"], "GP")
+        response = self.client.get("/sources/tree", headers={"If-None-Match": response["ETag"]})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(self.client.get("/missing/tree").status_code, 404)
+        self.assertEqual(self.client.get(f"/items/{self.health.id}/subtree").json()["children"][0]["slug"], "gp")
+        ancestors = self.client.get(f"/items/{self.gp.id}/ancestors").json()
+        self.assertEqual([item["slug"] for item in ancestors], ["agency", "health"])
+        self.assertEqual(self.client.get("/items/999999/ancestors").status_code, 404)
@@ -0,0 +1,37 @@
+from django.test import TestCase
+from apps.optionlists.models import OptionList, OptionListItem
+from apps.optionlists.registry import get_option_registry
+from apps.optionlists.validation import InvalidOptionItems, OptionFieldValidator
+
+
+class OptionFieldValidatorTest(TestCase):
+    def setUp(self):
+        self.types = OptionList.objects.create(name="Referral Types", slug="referral-types")
+        self.statuses = OptionList.objects.create(name="Referral Statuses", slug="referral-statuses")
+        self.internal = OptionListItem.objects.create(option_list=self.types, slug="internal", name="internal")
+        self.pending = OptionListItem.objects.create(option_list=self.statuses, slug="pending", name="pending")
+        self.validator = OptionFieldValidator(
+            {'type': 'referral-types', 'status': 'referral-statuses'}, by_slug=('status',)
+        )
+        get_option_registry()
+
+    def test_resolves_all_fields_without_queries(self):
+        with self.assertNumQueries(0):
+            items = self.validator.resolve({'type': str(self.internal.id), 'status': 'pending', 'other': 1})
+        self.assertEqual(items, {'type': self.internal, 'status': self.pending})
+        self.assertEqual(self.validator.resolve({'type': None}), {'type': None})
+
+    def test_rejects_items_of_other_lists(self):
+        with self.assertRaises(InvalidOptionItems) as raised:
+            self.validator.resolve({'type': self.pending.id, 'status': 'internal'})
+        self.assertEqual(set(raised.exception.errors), {'type', 'status'})
+
+    def test_items_missing_from_the_registry_cost_one_query(self):
+        # Not yet in the registry: bulk_create sends no signals, like a write from another process.
+        external, closed = OptionListItem.objects.bulk_create([
+            OptionListItem(option_list=self.types, slug="external", name="external"),
+            OptionListItem(option_list=self.statuses, slug="closed", name="closed"),
+        ])
+        with self.assertNumQueries(1):
+            items = self.validator.resolve({'type': external.id, 'status': 'closed'})
+        self.assertEqual(items, {'type': external, 'status': closed})
@@ -0,0 +1,81 @@
+"""
+Option item hierarchies (``OptionListItem.parent``) built in memory.
+
+Trees are built in one pass over items that are already loaded, usually a
+list's resolved scope from the registry, so a tree of any depth costs no
+queries. The registry memoises each tree, which ties its lifetime to the
+registry version.
+
+Nodes are plain dicts, ready to be rendered as nested JSON:
+
+    {"id": 501, "slug": "government-agencies", ..., "children": [{...}, ...]}
+
+An item whose parent is not in the tree is a root. That happens when the
+parent is inactive, or lives in another scope and has no counterpart with the
+same slug.
+"""
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .models import OptionListItem
+
+Node = dict
+
+
+def item_node(item: OptionListItem) -> Node:
+    return {
+        'id': item.id,
+        'slug': item.slug,
+        'name': item.name,
+        'label': item.label,
+        'sort_order': item.sort_order,
+        'is_active': item.is_active,
+        'children': [],
+    }
+
+
+def build_tree(items: Iterable[OptionListItem],
+               items_by_id: Dict[int, OptionListItem]) -> Tuple[List[Node], Dict[int, Node]]:
+    """
+    Nest ``items`` (in display order) under their parents. Returns the root
+    nodes and every node by item id. ``items_by_id`` resolves parents outside
+    ``items``: a child of an overridden template item attaches to the override
+    with the same slug.
+    """
+    items = list(items)
+    nodes = {item.id: item_node(item) for item in items}
+    by_slug = {item.slug: item for item in items}
+
+    def parent_of(item_id: int) -> Optional[int]:
+        parent_id = items_by_id[item_id].parent_id if item_id in items_by_id else None
+        if parent_id is None or parent_id in nodes:
+            return parent_id
+        original = items_by_id.get(parent_id)
+        match = by_slug.get(original.slug) if original is not None else None
+        return match.id if match is not None and match.id != item_id else None
+
+    parents = {item.id: parent_of(item.id) for item in items}
+    roots = []
+    for item in items:
+        parent_id = parents[item.id]
+        # Walk up to make sure a corrupt parent chain cannot loop back here.
+        seen, current = {item.id}, parent_id
+        while current is not None and current not in seen:
+            seen.add(current)
+            current = parents.get(current)
+        if parent_id is None or current is not None:
+            roots.append(nodes[item.id])
+        else:
+            nodes[parent_id]['children'].append(nodes[item.id])
+    return roots, nodes
+
+
+def ancestors(item: OptionListItem, items_by_id: Dict[int, OptionListItem]) -> List[OptionListItem]:
+    """``item``'s ancestors, root first."""
+    chain, seen = [], {item.id}
+    parent = items_by_id.get(item.parent_id)
+    while parent is not None and parent.id not in seen:
+        chain.append(parent)
+        seen.add(parent.id)
+        parent = items_by_id.get(parent.parent_id)
+    chain.reverse()
+    return chain
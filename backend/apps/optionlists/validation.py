@@ -0,0 +1,112 @@
+"""
+Batched validation of option-list foreign keys in service write paths.
+
+A service declares which list each option field must come from, then resolves
+every submitted value in one pass:
+
+    REFERRAL_OPTION_FIELDS = OptionFieldValidator({
+        'type': 'referral-types',
+        'status': 'referral-statuses',
+    })
+
+    items = REFERRAL_OPTION_FIELDS.resolve({'type': 3, 'status': 7})
+    # {'type': <OptionListItem>, 'status': <OptionListItem>}
+
+Values are item ids, or item slugs for the fields named in ``by_slug``.
+Lookups are served by the option list registry. Values it does not know
+(e.g. an item created in another process since the last rebuild) are
+re-checked with a single query. Each write therefore costs at most one
+validation query, however many option fields it sets.
+
+Unknown values and items from the wrong list raise ``InvalidOptionItems``
+with one message per field. Callers translate it into their own error type.
+"""
+from typing import Any, Dict, Iterable, Mapping, Optional
+
+from django.db.models import Q
+
+from .models import OptionListItem
+from .registry import get_option_registry
+
+
+class InvalidOptionItems(ValueError):
+    """Raised when option field values do not resolve to items of the expected lists."""
+
+    def __init__(self, errors: Dict[str, str]):
+        self.errors = errors
+        super().__init__("; ".join(f"{field}: {message}" for field, message in errors.items()))
+
+
+def _as_id(value: Any) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class OptionFieldValidator:
+    """Resolves option-list FK values for a fixed mapping of field name to list slug."""
+
+    def __init__(self, fields: Mapping[str, str], by_slug: Iterable[str] = ()):
+        self.fields = dict(fields)
+        self.by_slug = frozenset(by_slug)
+
+    def _matches(self, field: str, value: Any, item: OptionListItem) -> bool:
+        if item.option_list.slug != self.fields[field]:
+            return False
+        if field in self.by_slug:
+            return item.slug == value
+        return item.id == _as_id(value)
+
+    def resolve(self, values: Mapping[str, Any]) -> Dict[str, Optional[OptionListItem]]:
+        """
+        Return ``{field: item}`` for the declared fields present in ``values``.
+        ``None`` values resolve to ``None`` (the caller clears the field).
+        Undeclared keys are ignored.
+        """
+        registry = get_option_registry()
+        resolved: Dict[str, Optional[OptionListItem]] = {}
+        missing: Dict[str, Any] = {}
+        for field, list_slug in self.fields.items():
+            if field not in values:
+                continue
+            value = values[field]
+            if value is None:
+                resolved[field] = None
+                continue
+            if field in self.by_slug:
+                item = registry.get_item_by_slug(list_slug, value)
+            else:
+                item = registry.get_item(value, list_slug=list_slug)
+            if item is not None:
+                resolved[field] = item
+            else:
+                missing[field] = value
+
+        if missing:
+            self._resolve_from_database(missing, resolved)
+        return resolved
+
+    def _resolve_from_database(self, missing: Dict[str, Any], resolved: Dict[str, Optional[OptionListItem]]) -> None:
+        condition = Q(pk__in=[])
+        for field, value in missing.items():
+            if field in self.by_slug:
+                condition |= Q(option_list__slug=self.fields[field], slug=value)
+            elif _as_id(value) is not None:
+                condition |= Q(id=_as_id(value), option_list__slug=self.fields[field])
+        candidates = list(OptionListItem.objects.filter(condition).select_related('option_list'))
+
+        errors = {}
+        for field, value in missing.items():
+            # A slug can exist once per region; prefer the item with no region.
+            matches = sorted(
+                (item for item in candidates if self._matches(field, value, item)),
+                key=lambda item: item.region is not None,
+            )
+            if matches:
+                resolved[field] = matches[0]
+            else:
+                kind = 'slug' if field in self.by_slug else 'ID'
+                errors[field] = f"Invalid {field} {kind}: {value} is not an item of '{self.fields[field]}'"
+        if errors:
+            raise InvalidOptionItems(errors)
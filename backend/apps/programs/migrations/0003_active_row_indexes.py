@@ -0,0 +1,31 @@
+# Generated by Django 5.0.14 on 2026-10-16 22:47
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('programs', '0002_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='enrolment',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['-created_at'], name='programs_enrolmen_fd61ddfe_act'),
+        ),
+        migrations.AddIndex(
+            model_name='enrolment',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['program', '-created_at'], name='programs_enrolmen_c3d5dd33_act'),
+        ),
+        migrations.AddIndex(
+            model_name='program',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['-created_at'], name='programs_program_f285847a_act'),
+        ),
+        migrations.AddIndex(
+            model_name='programassignedstaff',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['-created_at'], name='programs_programa_eb4914c5_act'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.0.14 on 2026-10-16 22:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('programs', '0003_active_row_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='enrolment',
+            index=models.Index(fields=['updated_at', 'id'], name='programs_enrolmen_9ddc35b9_chg'),
+        ),
+        migrations.AddIndex(
+            model_name='program',
+            index=models.Index(fields=['updated_at', 'id'], name='programs_program_aa77c1d2_chg'),
+        ),
+        migrations.AddIndex(
+            model_name='programassignedstaff',
+            index=models.Index(fields=['updated_at', 'id'], name='programs_programa_218dc6d9_chg'),
+        ),
+    ]
@@ -87,6 +87,8 @@ class Enrolment(UUIDPKBaseModel):
     documents = models.ManyToManyField('common.Document', blank=True)
     extra_data = models.JSONField(blank=True, null=True)
 
+    active_indexes = [('program', '-created_at')]
+
     def __str__(self):
         return f"Enrolment in {self.program} ({self.start_date})"
 
@@ -1,12 +1,14 @@
 from typing import List, Optional, Union
 from uuid import UUID
 from django.db import transaction
+from django.http import Http404
 from django.shortcuts import get_object_or_404
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 
 from .models import ServiceProgram, ServiceAssignedStaff, Enrolment
-from apps.optionlists.models import OptionListItem
+from apps.optionlists.services import OptionListService
+from apps.optionlists.validation import InvalidOptionItems, OptionFieldValidator
 from .schemas import (
     ServiceProgramIn, ServiceProgramOut, 
     ServiceAssignedStaffIn, ServiceAssignedStaffOut,
@@ -184,6 +186,21 @@ class ServiceProgramService:
         return True
 
 
+# Enrolment status is submitted as an item slug, exit reason as an item id.
+ENROLMENT_OPTION_FIELDS = OptionFieldValidator(
+    {'status': 'enrolment-status', 'exit_reason': 'service_management-exit-reasons'},
+    by_slug=('status',),
+)
+
+
+def resolve_enrolment_options(values: dict) -> dict:
+    """Resolve enrolment option fields in one pass; unknown items are a 404 as before."""
+    try:
+        return ENROLMENT_OPTION_FIELDS.resolve(values)
+    except InvalidOptionItems as e:
+        raise Http404(str(e))
+
+
 class EnrolmentService:
     @staticmethod
     @transaction.atomic
@@ -194,10 +211,8 @@ class EnrolmentService:
         client = get_object_or_404(Client, pk=data.client_id, is_deleted=False)
         service_program = get_object_or_404(ServiceProgram, pk=data.service_program_id, is_deleted=False)
         
-        exit_reason_obj = None
-        if data.exit_reason_id:
-            # Assuming 'service_management-exit-reasons' is the correct slug for the OptionList
-            exit_reason_obj = get_object_or_404(OptionListItem, pk=data.exit_reason_id, option_list__slug='service_management-exit-reasons')
+        # Status and exit reason are validated together in one pass
+        options = resolve_enrolment_options({'status': data.status, 'exit_reason': data.exit_reason_id or None})
 
         try:
             user = User.objects.get(pk=user_id)
@@ -207,14 +222,11 @@ class EnrolmentService:
         # Prepare data for Enrolment creation, excluding FK IDs that will be passed as objects
         enrolment_create_data = data.dict(exclude={'client_id', 'service_program_id', 'exit_reason_id', 'status'}, exclude_none=True)
 
-        # Fetch status OptionListItem
-        status_obj = get_object_or_404(OptionListItem, slug=data.status, option_list__slug='enrolment-status')
-
         enrolment = Enrolment.objects.create(
             client=client,
             service_program=service_program,
-            status=status_obj, # Assign status object
-            exit_reason=exit_reason_obj,
+            status=options['status'], # Assign status object
+            exit_reason=options['exit_reason'],
             **enrolment_create_data,
             created_by=user,
             updated_by=user
@@ -267,20 +279,17 @@ class EnrolmentService:
             service_program = get_object_or_404(ServiceProgram, pk=update_fields_data.pop('service_program_id'), is_deleted=False)
             enrolment.service_program = service_program
 
-        if 'status' in update_fields_data: # Handle status slug
+        # Status slug and exit reason id are validated together in one pass
+        option_values = {}
+        if 'status' in update_fields_data:
             status_slug = update_fields_data.pop('status')
+            # An empty status slug leaves the status unchanged; unsetting it is not supported.
             if status_slug:
-                status_obj = get_object_or_404(OptionListItem, slug=status_slug, option_list__slug='enrolment-status')
-                enrolment.status = status_obj
-            # else: if status_slug is None/empty, what should happen? Maybe nothing, or disallow unsetting status without explicit logic.
-
+                option_values['status'] = status_slug
         if 'exit_reason_id' in update_fields_data:
-            exit_reason_id_val = update_fields_data.pop('exit_reason_id')
-            if exit_reason_id_val is not None:
-                exit_reason_obj = get_object_or_404(OptionListItem, pk=exit_reason_id_val, option_list__slug='service_management-exit-reasons')
-                enrolment.exit_reason = exit_reason_obj
-            else:
-                enrolment.exit_reason = None # Allow unsetting exit reason
+            option_values['exit_reason'] = update_fields_data.pop('exit_reason_id') # None unsets the exit reason
+        for field_name, item in resolve_enrolment_options(option_values).items():
+            setattr(enrolment, field_name, item)
 
         for key, value in update_fields_data.items():
             setattr(enrolment, key, value)
@@ -330,12 +339,13 @@ class ServiceManagementOptionListService:
             'locations': 'service_management-locations', # Ensure this slug exists for location options
         }
 
+        items_by_slug = OptionListService.get_active_items_for_slugs(list(slug_map.values()))
         result = {}
         for field_name, slug in slug_map.items():
-            items = list(OptionListItem.objects.filter(
-                option_list__slug=slug, 
-                is_active=True
-            ).values('id', 'name', 'slug')) # Fetch 'slug' as it's used by SimpleOptionListItemOut
-            result[field_name] = items
+            # 'slug' is used by SimpleOptionListItemOut
+            result[field_name] = [
+                {'id': item.id, 'name': item.name, 'slug': item.slug}
+                for item in items_by_slug[slug]
+            ]
 
         return result
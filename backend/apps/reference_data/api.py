@@ -1,8 +1,28 @@
 from typing import List
+from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers
 from ninja import Router
-from .models import Country, Language
+from apps.common.http import is_not_modified, not_modified, set_validators
+from .cache import get_reference_payload, max_age
 from .schemas import CountryOut, LanguageOut
 
+
+def reference_response(request, name: str) -> HttpResponse:
+    """
+    Serve the precomputed ``name`` payload, or a 304 when the client's copy is
+    current. Neither touches the database while the payload is cached.
+    """
+    payload = get_reference_payload(name)
+    cache_control = f"public, max-age={max_age()}"
+    if is_not_modified(request, payload.etag):
+        response = not_modified(payload.etag, cache_control)
+    else:
+        response = HttpResponse(payload.body, content_type='application/json')
+        set_validators(response, payload.etag, cache_control)
+    patch_vary_headers(response, ('Authorization',))
+    return response
+
+
 def create_reference_router():
     router = Router(tags=["Reference Data"])
 
@@ -10,30 +30,16 @@ def create_reference_router():
     def list_countries(request):
         """
         Retrieves all active countries for use in dropdowns and forms.
+        Cacheable: honours If-None-Match.
         """
-        countries = Country.objects.filter(is_active=True).order_by('name')
-        return [
-            {
-                'id': country.id,
-                'code': country.code,
-                'name': country.name
-            }
-            for country in countries
-        ]
+        return reference_response(request, 'countries')
 
     @router.get("/languages/", response=List[LanguageOut], summary="List all active languages")
     def list_languages(request):
         """
         Retrieves all active languages for use in dropdowns and forms.
+        Cacheable: honours If-None-Match.
         """
-        languages = Language.objects.filter(is_active=True).order_by('name')
-        return [
-            {
-                'id': language.id,
-                'code': language.code,
-                'name': language.name
-            }
-            for language in languages
-        ]
+        return reference_response(request, 'languages')
 
-    return router
\ No newline at end of file
+    return router
@@ -4,3 +4,6 @@ class ReferenceDataConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.reference_data'
     verbose_name = 'Reference Data'
+
+    def ready(self):
+        import apps.reference_data.signals
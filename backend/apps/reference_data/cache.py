@@ -0,0 +1,99 @@
+"""
+Precomputed reference data payloads.
+
+Active countries and languages only change when fixtures are loaded or an
+admin edits them. Each list is therefore serialised once into JSON bytes and
+served from memory with an ``etag``: a hash of the bytes, so every process
+sends the same value for the same content. No ``Last-Modified`` is sent. The
+tables have no modification time to derive one from, and a per-process
+timestamp would differ between workers serving identical bytes.
+
+Signal receivers in ``apps.reference_data.signals`` drop the payloads when a
+row is saved or deleted, which covers admin edits and ``loaddata`` in this
+process. ``loaddata`` usually runs in another process, so payloads are also
+re-read every ``REFERENCE_DATA['REFRESH_INTERVAL']`` seconds.
+"""
+import hashlib
+import json
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .models import Country, Language
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_AGE = 3600
+DEFAULT_REFRESH_INTERVAL = 300
+
+# Payload name -> (model, serialised fields). Rows are active only, ordered by name.
+DATASETS = {
+    'countries': (Country, ('id', 'code', 'name')),
+    'languages': (Language, ('id', 'code', 'name')),
+}
+
+
+@dataclass(frozen=True)
+class ReferencePayload:
+    name: str
+    version: int
+    body: bytes
+    etag: str
+    checked_at: float  # time.monotonic() of the last read from the database
+
+
+def serialise(name: str) -> bytes:
+    model, fields = DATASETS[name]
+    # order_by() replaces the models' CASE-based Meta.ordering.
+    rows = list(model.objects.filter(is_active=True).order_by('name').values(*fields))
+    return json.dumps(rows, cls=DjangoJSONEncoder).encode('utf-8')
+
+
+_payloads: Dict[str, ReferencePayload] = {}
+_version = 0
+_lock = threading.Lock()
+
+
+def _config() -> dict:
+    return getattr(settings, 'REFERENCE_DATA', {})
+
+
+def max_age() -> int:
+    return _config().get('MAX_AGE', DEFAULT_MAX_AGE)
+
+
+def _is_fresh(payload: ReferencePayload) -> bool:
+    if payload.version != _version:
+        return False
+    interval = _config().get('REFRESH_INTERVAL', DEFAULT_REFRESH_INTERVAL)
+    return not interval or time.monotonic() - payload.checked_at < interval
+
+
+def get_reference_payload(name: str) -> ReferencePayload:
+    """Return the serialised ``name`` dataset, reading it from the database only when stale."""
+    payload = _payloads.get(name)
+    if payload is not None and _is_fresh(payload):
+        return payload
+
+    with _lock:
+        previous = _payloads.get(name)
+        if previous is not None and _is_fresh(previous):
+            return previous
+        body = serialise(name)
+        etag = '"%s"' % hashlib.sha1(body).hexdigest()
+        if previous is None or previous.etag != etag:
+            logger.debug(f"Rebuilt reference payload '{name}' ({len(body)} bytes)")
+        payload = ReferencePayload(name, _version, body, etag, time.monotonic())
+        _payloads[name] = payload
+        return payload
+
+
+def invalidate_reference_payloads() -> None:
+    global _version
+    with _lock:
+        _version += 1
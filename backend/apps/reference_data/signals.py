@@ -0,0 +1,16 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .cache import invalidate_reference_payloads
+from .models import Country, Language
+
+
+@receiver(post_save, sender=Country)
+@receiver(post_delete, sender=Country)
+@receiver(post_save, sender=Language)
+@receiver(post_delete, sender=Language)
+def invalidate_payloads_on_change(sender, **kwargs):
+    """Re-read the cached reference payloads now and once the change is committed (admin edits, loaddata)."""
+    invalidate_reference_payloads()
+    transaction.on_commit(invalidate_reference_payloads)
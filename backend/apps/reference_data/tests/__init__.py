@@ -0,0 +1 @@
+# Test package for the reference_data app
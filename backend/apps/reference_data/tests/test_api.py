@@ -0,0 +1,52 @@
+from django.test import TestCase
+from ninja.testing import TestClient
+
+from apps.reference_data.api import create_reference_router
+from apps.reference_data.models import Country, Language
+
+
+class ReferencePayloadAPITest(TestCase):
+    def setUp(self):
+        self.client = TestClient(create_reference_router())
+        self.nz = Country.objects.create(code="NZL", name="New Zealand")
+        Country.objects.create(code="AUS", name="Australia")
+        Country.objects.create(code="XXX", name="Nowhere", is_active=False)
+        Language.objects.create(code="mi", name="Māori")
+
+    def test_serves_active_rows_by_name(self):
+        response = self.client.get("/countries/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([country["code"] for country in response.json()], ["AUS", "NZL"])
+        self.assertEqual(response["Cache-Control"], "public, max-age=3600")
+        self.assertNotIn("Last-Modified", response.headers)
+        self.assertEqual([language["code"] for language in self.client.get("/languages/").json()], ["mi"])
+
+    def test_cached_payload_needs_no_queries(self):
+        first = self.client.get("/countries/")
+        with self.assertNumQueries(0):
+            second = self.client.get("/countries/")
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second["ETag"], first["ETag"])
+
+    def test_if_none_match(self):
+        etag = self.client.get("/countries/")["ETag"]
+        with self.assertNumQueries(0):
+            response = self.client.get("/countries/", headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+        self.assertEqual(self.client.get("/countries/", headers={"If-None-Match": '"stale"'}).status_code, 200)
+
+    def test_if_modified_since_alone_is_not_a_match(self):
+        # Without a Last-Modified there is nothing to compare the date with.
+        response = self.client.get("/countries/", headers={"If-Modified-Since": "Fri, 01 Jan 2100 00:00:00 GMT"})
+        self.assertEqual(response.status_code, 200)
+
+    def test_country_save_invalidates(self):
+        etag = self.client.get("/countries/")["ETag"]
+        with self.captureOnCommitCallbacks(execute=True):
+            self.nz.name = "Aotearoa New Zealand"
+            self.nz.save()
+        response = self.client.get("/countries/", headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertIn("Aotearoa New Zealand", [country["name"] for country in response.json()])
@@ -1,6 +1,7 @@
 from django.http import HttpRequest
 from django.shortcuts import get_object_or_404
 from ninja import Router
+from ninja.pagination import paginate
 from typing import List, Optional
 from uuid import UUID
 
@@ -12,19 +13,28 @@ from .schemas import (
     ReferralBatchDropdownsSchemaOut,
     ReferralStatusUpdateSchemaIn,
     OptionListItemSchemaOut,
-    ReferralListResponse
 )
 from .services.referral_service import ReferralService
 from apps.optionlists.services import OptionListService
 from apps.authentication.decorators import auth_required
+from apps.common.changes import add_changes_endpoint
+from apps.common.pagination import KeysetPagination
 
 router = Router()
 
-@router.get("/", response=ReferralListResponse, auth=auth_required)
-def list_referrals(request: HttpRequest, page: int = 1, limit: int = 20, 
-                  status: Optional[str] = None, priority: Optional[str] = None, 
-                  client_type: Optional[str] = None):
-    """List all referrals with pagination and optional filtering."""
+add_changes_endpoint(
+    router, Referral, ReferralSchemaOut,
+    queryset=lambda: Referral.all_objects.select_related(
+        'type', 'status', 'priority', 'service_type', 'created_by', 'updated_by'
+    ),
+    auth=auth_required,
+)
+
+@router.get("/", response=List[ReferralSchemaOut], auth=auth_required)
+@paginate(KeysetPagination)
+def list_referrals(request: HttpRequest, status: Optional[str] = None, priority: Optional[str] = None,
+                   client_type: Optional[str] = None):
+    """List referrals, newest first, one page at a time (``limit``, ``cursor``), with optional filtering."""
     queryset = Referral.objects.select_related(
         'type', 'status', 'priority', 'service_type', 
         'external_organisation', 'created_by', 'updated_by'
@@ -37,20 +47,7 @@ def list_referrals(request: HttpRequest, page: int = 1, limit: int = 20,
         queryset = queryset.filter(priority__slug=priority)
     if client_type:
         queryset = queryset.filter(client_type=client_type)
-    
-    # Calculate pagination
-    total = queryset.count()
-    offset = (page - 1) * limit
-    items = list(queryset[offset:offset + limit])
-    total_pages = (total + limit - 1) // limit  # Ceiling division
-    
-    return {
-        'items': items,
-        'total': total,
-        'page': page,
-        'limit': limit,
-        'total_pages': total_pages
-    }
+    return queryset
 
 @router.post("/", response=ReferralSchemaOut, auth=auth_required)
 def create_referral(request: HttpRequest, payload: ReferralSchemaIn):
@@ -77,11 +74,14 @@ def create_referral(request: HttpRequest, payload: ReferralSchemaIn):
 @router.get("/batch-dropdowns", response=ReferralBatchDropdownsSchemaOut, auth=auth_required)
 def get_batch_dropdowns(request: HttpRequest):
     """Get all dropdown options needed for referral forms."""
+    items = OptionListService.get_active_items_for_slugs([
+        'referral-types', 'referral-statuses', 'referral-priorities', 'referral-service-types',
+    ])
     return {
-        "referral_types": OptionListService.get_active_items_for_list_slug('referral-types'),
-        "referral_statuses": OptionListService.get_active_items_for_list_slug('referral-statuses'),
-        "referral_priorities": OptionListService.get_active_items_for_list_slug('referral-priorities'),
-        "referral_service_types": OptionListService.get_active_items_for_list_slug('referral-service-types'),
+        "referral_types": items['referral-types'],
+        "referral_statuses": items['referral-statuses'],
+        "referral_priorities": items['referral-priorities'],
+        "referral_service_types": items['referral-service-types'],
     }
 
 @router.get("/{referral_id}", response=ReferralSchemaOut, auth=auth_required)
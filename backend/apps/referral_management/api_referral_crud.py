@@ -2,6 +2,8 @@ from ninja import Router
 from .schemas import ReferralIn, ReferralOut, OptionListItemOut, ReferralStatusOut, ReferralPriorityOut, ReferralTypeOut, DropdownItemOut, ReferralStatusUpdateIn, DetailOut
 from .models import Referral, ReferralStatus, ReferralPriority, ReferralType
 from apps.optionlists.models import OptionList, OptionListItem
+from apps.optionlists.validation import InvalidOptionItems
+from .services.referral_service import REFERRAL_OPTION_FIELDS
 from django.shortcuts import get_object_or_404
 from typing import List, Optional
 from uuid import UUID
@@ -281,8 +283,8 @@ def update_referral_status(request, referral_id: UUID, payload: ReferralStatusUp
     
     try:
         # Ensure the status_id belongs to the 'referral-statuses' OptionList for safety
-        new_status = OptionListItem.objects.get(pk=payload.status_id, option_list__slug="referral-statuses")
-    except OptionListItem.DoesNotExist:
+        new_status = REFERRAL_OPTION_FIELDS.resolve({'status': payload.status_id})['status']
+    except InvalidOptionItems:
         # Using a 400 error for invalid input, could also be 404 if status_id is seen as a sub-resource not found
         return 400, {"detail": f"Invalid status_id: {payload.status_id} or it does not belong to 'referral-statuses'."}
 
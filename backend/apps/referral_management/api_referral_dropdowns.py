@@ -1,7 +1,7 @@
 from ninja import Router, Schema
 from typing import List, Optional
 
-from apps.optionlists.models import OptionList, OptionListItem
+from apps.optionlists.services import OptionListService
 
 # Reusable schema for simple dropdown items (id, label, slug)
 class SimpleDropdownItemOut(Schema):
@@ -39,16 +39,12 @@ def referral_batch_dropdowns(request):
         "required_documents": "referral-required-documents",
     }
 
+    # One registry lookup for all lists; unknown slugs come back as empty lists.
+    items_by_slug = OptionListService.get_active_items_for_slugs(list(optionlist_slug_map.values()))
     for key, slug in optionlist_slug_map.items():
-        try:
-            option_list = OptionList.objects.get(slug=slug)
-            items = OptionListItem.objects.filter(option_list=option_list, is_active=True).order_by("sort_order", "label")
-            result[key] = [SimpleDropdownItemOut(id=item.id, label=item.label, slug=item.slug) for item in items]
-        except OptionList.DoesNotExist:
-            result[key] = []
-        except Exception as e:
-            # Log error for diagnostics, but return empty list for the specific dropdown
-            print(f"Error fetching OptionList for slug '{slug}': {e}")
-            result[key] = []
+        result[key] = [
+            SimpleDropdownItemOut(id=item.id, label=item.label, slug=item.slug)
+            for item in items_by_slug[slug]
+        ]
 
     return ReferralBatchDropdownsOut(**result)
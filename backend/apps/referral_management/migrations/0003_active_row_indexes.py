@@ -0,0 +1,27 @@
+# Generated by Django 5.0.14 on 2026-10-16 22:47
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('referral_management', '0002_alter_referral_notes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='referral',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['-referral_date', '-created_at'], name='referral_manageme_2883856c_act'),
+        ),
+        migrations.AddIndex(
+            model_name='referral',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['status', '-referral_date'], name='referral_manageme_cac37c34_act'),
+        ),
+        migrations.AddIndex(
+            model_name='referral',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['client_type', '-referral_date'], name='referral_manageme_4c76cfbd_act'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.0.14 on 2026-10-16 22:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('referral_management', '0003_active_row_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='referral',
+            index=models.Index(fields=['updated_at', 'id'], name='referral_manageme_ef4086d1_chg'),
+        ),
+    ]
@@ -97,6 +97,9 @@ class Referral(UUIDPKBaseModel):
         help_text=_('Contact person at referring organisation')
     )
     
+    # Partial (active-row) indexes for the list filters; see SoftDeleteModel.
+    active_indexes = [('status', '-referral_date'), ('client_type', '-referral_date')]
+
     def __str__(self) -> str:
         # Determine referral direction and source
         if self.client_type == 'self':
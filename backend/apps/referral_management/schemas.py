@@ -84,11 +84,3 @@ class ReferralBatchDropdownsSchemaOut(Schema):
 # Status update schema
 class ReferralStatusUpdateSchemaIn(Schema):
     status_id: int
-
-# Paginated response schema
-class ReferralListResponse(Schema):
-    items: list[ReferralSchemaOut]
-    total: int
-    page: int
-    limit: int
-    total_pages: int
@@ -7,9 +7,19 @@ from django.db.models import QuerySet
 from typing import Optional, Any, Union
 import uuid
 
+from apps.optionlists.validation import InvalidOptionItems, OptionFieldValidator
 from ..repositories import ReferralRepository
 from ..models import Referral
 
+# Option-list FK fields of Referral and the list each must come from.
+REFERRAL_OPTION_FIELDS = OptionFieldValidator({
+    'type': 'referral-types',
+    'status': 'referral-statuses',
+    'priority': 'referral-priorities',
+    'service_type': 'referral-service-types',
+})
+
+
 class ReferralService:
     """
     Service class for handling business logic related to Referrals.
@@ -59,8 +69,8 @@ class ReferralService:
             new_status = status_id_or_item
         else:
             try:
-                new_status = OptionListItem.objects.get(id=status_id_or_item)
-            except OptionListItem.DoesNotExist:
+                new_status = REFERRAL_OPTION_FIELDS.resolve({'status': status_id_or_item})['status']
+            except InvalidOptionItems:
                 raise ValidationError({"status": [_("Invalid status ID")]})
         return ReferralRepository.update_referral_status(referral, new_status, updated_by_user)
 
@@ -70,24 +80,19 @@ class ReferralService:
         Update referral fields from data dict, handling OptionListItem fields, 
         and then delegate to repository for saving and audit trail.
         """
-        from apps.optionlists.models import OptionListItem 
+        # The API schema sends '<field>_id'; validate those like the bare field names
+        for field_name in REFERRAL_OPTION_FIELDS.fields:
+            if f"{field_name}_id" in data:
+                data[field_name] = data.pop(f"{field_name}_id")
 
-        optionlist_fields = ['type', 'status', 'priority', 'service_type']
-        
-        # Handle OptionListItem fields first
-        for field_name in optionlist_fields:
-            if field_name in data:
-                item_id = data.pop(field_name) # Use pop to remove it from data dict
-                if item_id is None:
-                    setattr(referral, field_name, None)
-                else:
-                    try:
-                        item_instance = OptionListItem.objects.get(id=item_id)
-                        setattr(referral, field_name, item_instance)
-                    except OptionListItem.DoesNotExist:
-                        raise ValidationError({field_name: _(f"Invalid {field_name} ID: {item_id}")})
-                    except TypeError: # Handle cases where item_id might not be a valid UUID/PK type
-                        raise ValidationError({field_name: _(f"Invalid ID format for {field_name}: {item_id}")})
+        # Handle OptionListItem fields first, all validated in one pass
+        try:
+            items = REFERRAL_OPTION_FIELDS.resolve(data)
+        except InvalidOptionItems as e:
+            raise ValidationError(e.errors)
+        for field_name, item_instance in items.items():
+            data.pop(field_name) # Remove from data so it isn't set again below
+            setattr(referral, field_name, item_instance)
 
         # Update other direct fields from the remaining data
         for field_name, value in data.items():
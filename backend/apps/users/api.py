@@ -1,7 +1,12 @@
 from uuid import UUID
 from ninja import Router
 from typing import List
+from django.http import HttpResponse
+from ninja.pagination import paginate
+from apps.common.http import etag_matches, not_modified, set_validators
+from apps.common.pagination import KeysetPagination
 from .services import UserService, RoleService
+from .profile_snapshot import get_profile_snapshot, render_current_user
 from .schemas import UserOut, UserCreate, UserUpdate, RoleOut, RoleCreate, RoleUpdate, UserProfileOut
 
 # Initialize routers
@@ -11,69 +16,26 @@ roles_router = Router(tags=["roles"])
 # --- User Endpoints ---
 
 @users_router.get("/me", response=UserOut)
-def get_current_user(request):
-    print("HIT /me endpoint (CASCADE DEBUG)")
+def get_current_user(request, response: HttpResponse):
     # In auth bypass mode, user comes from request.user
     # In normal mode, user comes from request.auth
     user = request.user if hasattr(request, 'user') and request.user.is_authenticated else request.auth
     if not user or not user.is_authenticated:
         return 401, {"detail": "Not authenticated"}
-    profile = user.profile if hasattr(user, 'profile') else None
-    if not profile:
+    snapshot = get_profile_snapshot(user)
+    if not snapshot.profile:
         return 404, {"detail": "User profile not found for current user."}
-    profile_schema = UserProfileOut(
-        id=profile.id,
-        phone_number=getattr(profile, 'phone_number', None),
-        employee_id=getattr(profile, 'employee_id', None),
-        title=getattr(profile, 'title', None),
-        avatar=getattr(profile, 'avatar', None),
-        preferences=getattr(profile, 'preferences', {}),
-        azure_ad_groups=getattr(profile, 'azure_ad_groups', []),
-    )
-    roles = []
-    if profile and profile.role:
-        roles = [RoleOut.from_orm(profile.role)]
-    return UserOut(
-        id=user.id,
-        username=user.username,
-        email=user.email,
-        is_active=user.is_active,
-        first_name=getattr(user, 'first_name', None),
-        last_name=getattr(user, 'last_name', None),
-        profile=profile_schema,
-        roles=roles,
-    )
+    etag = snapshot.etag('users.me')
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_validators(response, etag)
+    return render_current_user(snapshot)
 
 @users_router.get("/", response=List[UserOut])
+@paginate(KeysetPagination)
 def list_users(request, active: bool = None, search: str = None):
-    users = UserService.list_users(active=active, search=search)
-    result = []
-    for user in users:
-        profile = user.profile if hasattr(user, 'profile') else None
-        profile_data = None
-        if profile:
-            profile_data = {
-                'id': profile.id,
-                'phone_number': getattr(profile, 'phone_number', None),
-                'employee_id': getattr(profile, 'employee_id', None),
-                'title': getattr(profile, 'title', None),
-                'avatar': getattr(profile, 'avatar', None),
-                'preferences': getattr(profile, 'preferences', {}),
-                'azure_ad_groups': getattr(profile, 'azure_ad_groups', []),
-            }
-        roles = [RoleOut.from_orm(role) for role in getattr(user, 'roles', []).all()] if hasattr(user, 'roles') else []
-        user_data = {
-            'id': user.id,
-            'username': user.username,
-            'email': user.email,
-            'is_active': user.is_active,
-            'first_name': getattr(user, 'first_name', None),
-            'last_name': getattr(user, 'last_name', None),
-            'profile': profile_data,
-            'roles': roles,
-        }
-        result.append(user_data)
-    return result
+    # UserOut reads the profile straight off the (select_related) user.
+    return UserService.list_users(active=active, search=search)
 
 @users_router.post("/", response=UserOut)
 def create_user(request, data: UserCreate):
@@ -66,6 +66,10 @@ class Role(UserAppBaseModel):
     
     def get_all_permissions(self):
         """Get all permissions including custom ones."""
+        from .permission_matrix import get_permission_matrix
+        cached = get_permission_matrix().role_permissions(self.id)
+        if cached is not None:
+            return list(cached)
         django_perms = list(self.permissions.values_list('codename', flat=True))
         custom_perms = list(self.custom_permissions.keys()) if self.custom_permissions else []
         return django_perms + custom_perms
@@ -0,0 +1,227 @@
+"""
+In-memory role/permission matrix.
+
+Built from ``Role``, ``Role.permissions``, ``Role.custom_permissions`` and
+``GroupRoleMapping`` in three queries, then shared by every request in the
+process. Role checks in ``apps.authentication.decorators`` become set and
+integer operations against a ``PrincipalPermissions`` snapshot instead of a
+query per check. As before, ``require_role('Administrator')`` means membership
+of the Django group named "Administrator", whether synced from Azure AD or
+assigned by hand.
+
+The matrix is versioned: signal receivers in ``apps.users.signals`` call
+``invalidate_permission_matrix()`` when the role tables change and the next
+lookup rebuilds it. Writes made in other processes, or through queryset
+``update()``/bulk helpers that send no signals, are picked up by a fingerprint
+check: one query at most every ``JWT_AUTH['PERMISSION_MATRIX_CHECK_INTERVAL']``
+seconds.
+"""
+import logging
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.db.models import Count, Max
+
+from .models import GroupRoleMapping, Role
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHECK_INTERVAL = 30
+
+
+def table_fingerprint() -> Tuple:
+    """Row counts and latest change of the role, role-permission and group-mapping tables."""
+    roles = Role.objects.aggregate(count=Count('id'), latest=Max('updated_at'))
+    mappings = GroupRoleMapping.objects.aggregate(count=Count('id'), latest=Max('updated_at'))
+    # The permission through table has no timestamps; a new row gets a higher id.
+    role_perms = Role.permissions.through.objects.aggregate(count=Count('id'), latest=Max('id'))
+    return (roles['count'], roles['latest'], mappings['count'], mappings['latest'],
+            role_perms['count'], role_perms['latest'])
+
+
+class RoleEntry:
+    """Immutable snapshot of a single role."""
+    __slots__ = ('id', 'name', 'description', 'level', 'is_active', 'codenames', 'permissions')
+
+    def __init__(self, id, name: str, description: Optional[str], level: int, is_active: bool,
+                 codenames: FrozenSet[str], permissions: FrozenSet[str]):
+        self.id = id
+        self.name = name
+        self.description = description
+        self.level = level
+        self.is_active = is_active
+        # Django permission codenames only; ``permissions`` adds the custom permission keys.
+        self.codenames = codenames
+        self.permissions = permissions
+
+
+class PrincipalPermissions:
+    """Roles and permissions resolved for one user, answerable without queries."""
+    __slots__ = ('version', 'group_names', 'role_names', 'highest_level', 'permissions')
+
+    def __init__(self, version: int, group_names: FrozenSet[str], role_names: FrozenSet[str],
+                 highest_level: Optional[int], permissions: FrozenSet[str]):
+        self.version = version
+        self.group_names = group_names
+        self.role_names = role_names
+        self.highest_level = highest_level
+        self.permissions = permissions
+
+    def has_role(self, name: str) -> bool:
+        """True if the user belongs to the Django group ``name``."""
+        return name in self.group_names
+
+    def has_any_role(self, *names: str) -> bool:
+        return any(self.has_role(name) for name in names)
+
+    def has_perm(self, codename: str) -> bool:
+        return codename in self.permissions
+
+    def in_group(self, group_name: str) -> bool:
+        return group_name in self.group_names
+
+    def level_at_least(self, level: int) -> bool:
+        """True if the user's highest role is at ``level`` or above (lower numbers rank higher)."""
+        return self.highest_level is not None and self.highest_level <= level
+
+
+class PermissionMatrix:
+    """Versioned lookup tables of roles, their permissions and their Azure AD group mappings."""
+
+    def __init__(self, version: int, fingerprint: Tuple, roles: Dict[object, RoleEntry],
+                 group_roles: Dict[str, FrozenSet[object]]):
+        self.version = version
+        self.fingerprint = fingerprint
+        self.checked_at = time.monotonic()
+        self.roles = roles
+        self.roles_by_name = {role.name: role for role in roles.values()}
+        self.group_roles = group_roles
+
+    @classmethod
+    def build(cls, version: int) -> 'PermissionMatrix':
+        fingerprint = table_fingerprint()
+        role_perms = defaultdict(set)
+        for role_id, codename in Role.permissions.through.objects.values_list('role_id', 'permission__codename'):
+            role_perms[role_id].add(codename)
+
+        roles = {}
+        for role in Role.objects.all():
+            codenames = frozenset(role_perms.get(role.id, ()))
+            perms = set(codenames)
+            if role.custom_permissions:
+                perms.update(role.custom_permissions.keys())
+            roles[role.id] = RoleEntry(
+                role.id, role.name, role.description, role.level, role.is_active, codenames, frozenset(perms)
+            )
+
+        group_roles = defaultdict(set)
+        for group_id, role_id in GroupRoleMapping.objects.values_list('azure_ad_group_id', 'role_id'):
+            group_roles[group_id].add(role_id)
+
+        logger.debug(f"Built permission matrix v{version}: {len(roles)} roles, {len(group_roles)} group mappings")
+        return cls(version, fingerprint, roles, {group: frozenset(ids) for group, ids in group_roles.items()})
+
+    def role_permissions(self, role_id) -> Optional[FrozenSet[str]]:
+        role = self.roles.get(role_id)
+        return role.permissions if role else None
+
+    def mapped_roles(self, group_names: Iterable[str]) -> List[RoleEntry]:
+        """Roles mapped from ``group_names``, highest (lowest level number) first."""
+        role_ids = set()
+        for group in group_names:
+            role_ids.update(self.group_roles.get(group, ()))
+        entries = [self.roles[role_id] for role_id in role_ids if role_id in self.roles]
+        return sorted(entries, key=lambda role: role.level)
+
+    def stats(self) -> Dict[str, int]:
+        return {'version': self.version, 'roles': len(self.roles), 'group_mappings': len(self.group_roles)}
+
+    def resolve(self, group_names: Iterable[str], extra_role_ids: Iterable[object] = (),
+                mapped_groups: Optional[Iterable[str]] = None) -> PrincipalPermissions:
+        """
+        Resolve the permissions of a user in the Django groups ``group_names``.
+        Roles come from the ``GroupRoleMapping`` of ``mapped_groups`` (the
+        token's Azure AD groups; ``group_names`` when not given) plus any
+        directly assigned roles.
+        """
+        group_names = frozenset(group_names)
+        role_ids = set(extra_role_ids)
+        for group in (group_names if mapped_groups is None else mapped_groups):
+            role_ids.update(self.group_roles.get(group, ()))
+
+        entries = [self.roles[role_id] for role_id in role_ids if role_id in self.roles]
+        entries = [role for role in entries if role.is_active]
+        permissions = frozenset().union(*(role.permissions for role in entries)) if entries else frozenset()
+        return PrincipalPermissions(
+            version=self.version,
+            group_names=group_names,
+            role_names=frozenset(role.name for role in entries),
+            highest_level=min((role.level for role in entries), default=None),
+            permissions=permissions,
+        )
+
+
+_matrix: Optional[PermissionMatrix] = None
+_version = 0
+_lock = threading.Lock()
+
+
+def _check_interval() -> float:
+    return getattr(settings, 'JWT_AUTH', {}).get('PERMISSION_MATRIX_CHECK_INTERVAL', DEFAULT_CHECK_INTERVAL)
+
+
+def get_permission_matrix() -> PermissionMatrix:
+    """Return the current matrix, rebuilding it if the role tables changed since it was built."""
+    global _matrix, _version
+    matrix = _matrix
+    if matrix is not None and matrix.version == _version:
+        interval = _check_interval()
+        if not interval or time.monotonic() - matrix.checked_at < interval:
+            return matrix
+
+    with _lock:
+        matrix = _matrix
+        if matrix is not None and matrix.version == _version:
+            interval = _check_interval()
+            if not interval or time.monotonic() - matrix.checked_at < interval:
+                return matrix
+            # Another process may have changed the tables.
+            if table_fingerprint() == matrix.fingerprint:
+                matrix.checked_at = time.monotonic()
+                return matrix
+            _version += 1
+        _matrix = PermissionMatrix.build(_version)
+        return _matrix
+
+
+def invalidate_permission_matrix() -> None:
+    global _version
+    with _lock:
+        _version += 1
+
+
+def get_user_permissions(user) -> PrincipalPermissions:
+    """
+    Return the ``PrincipalPermissions`` for ``user``, computed once per request.
+
+    Users authenticated by JWTAuthenticationMiddleware carry a principal that
+    already holds their Django group names; other users (session, auth bypass)
+    fall back to a single query for them.
+    """
+    matrix = get_permission_matrix()
+    principal = getattr(user, 'principal', None)
+    if principal is not None:
+        return principal.permissions
+
+    cached = getattr(user, '_principal_permissions', None)
+    if cached is not None and cached.version == matrix.version:
+        return cached
+
+    group_names = user.groups.values_list('name', flat=True) if user.pk else ()
+    role = getattr(user, 'role', None)
+    permissions = matrix.resolve(group_names, extra_role_ids=[role.id] if role else ())
+    user._principal_permissions = permissions
+    return permissions
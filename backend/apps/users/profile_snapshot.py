@@ -0,0 +1,312 @@
+"""
+Cached profile snapshots for ``/profile``, ``/users/me`` and ``/auth/me``.
+
+The frontend calls these endpoints on every navigation. A snapshot gathers
+everything they render in a fixed number of queries:
+- the user's ``UserProfile`` with its role (skipped when the principal already holds it)
+- role details and permission codenames from the in-memory permission matrix
+- ``user.get_all_permissions()`` (Django's backend: user and group permissions)
+
+Snapshots are cached per user in-process and rebuilt when:
+- the permission matrix version changes (``Role``, ``GroupRoleMapping`` or role permissions edited)
+- the user, their profile, their Django groups or permissions change (signal receivers in ``apps.users.signals``)
+- the user's Azure AD group list differs from the cached one
+- the entry is older than ``JWT_AUTH['PROFILE_CACHE_TTL']`` seconds
+
+Each rendering carries an ETag derived from the snapshot content, so a repeat
+call with ``If-None-Match`` is answered with 304 from memory.
+"""
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from django.conf import settings
+
+from apps.common.http import make_etag
+
+from .models import UserProfile
+from .permission_matrix import get_permission_matrix
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_SIZE = 2048
+DEFAULT_TTL = 300
+
+
+class ProfileSnapshot:
+    """Immutable view of a user's profile, roles and permissions."""
+    __slots__ = ('user_id', 'azure_groups', 'matrix_version', 'version', 'built_at', 'data', 'fingerprint', '_etags')
+
+    def __init__(self, user_id, azure_groups: Tuple[str, ...], matrix_version: int, version: int, data: Dict[str, Any]):
+        self.user_id = user_id
+        self.azure_groups = azure_groups
+        self.matrix_version = matrix_version
+        self.version = version
+        self.built_at = time.monotonic()
+        self.data = data
+        self.fingerprint = make_etag(data)
+        self._etags: Dict[str, str] = {}
+
+    def etag(self, view: str) -> str:
+        """ETag for the rendering of this snapshot served by ``view``."""
+        etag = self._etags.get(view)
+        if etag is None:
+            etag = self._etags[view] = make_etag(view, self.fingerprint)
+        return etag
+
+    @property
+    def user(self) -> Dict[str, Any]:
+        return self.data['user']
+
+    @property
+    def profile(self) -> Optional[Dict[str, Any]]:
+        return self.data['profile']
+
+    @property
+    def role(self) -> Optional[Dict[str, Any]]:
+        return self.data['role']
+
+
+def user_azure_groups(user) -> Tuple[str, ...]:
+    """The Azure AD groups for ``user``: from the principal, the token, or the stored profile."""
+    principal = getattr(user, 'principal', None)
+    if principal is not None:
+        return tuple(principal.azure_groups)
+    groups = getattr(user, '_azure_ad_groups_from_token', None)
+    if groups is not None:
+        return tuple(groups)
+    profile = UserProfile.user.field.remote_field.get_cached_value(user, default=None)
+    if profile is not None:
+        return tuple(profile.azure_ad_groups or ())
+    return ()
+
+
+def _load_profile(user) -> Optional[UserProfile]:
+    profile = UserProfile.user.field.remote_field.get_cached_value(user, default=None)
+    if profile is not None and (profile.role_id is None or UserProfile.role.field.is_cached(profile)):
+        return profile
+    profile = UserProfile.objects.select_related('role').filter(user_id=user.pk).first()
+    UserProfile.user.field.remote_field.set_cached_value(user, profile)
+    return profile
+
+
+def build_snapshot(user, azure_groups: Tuple[str, ...], version: int) -> ProfileSnapshot:
+    """Gather the profile, role and permission data for ``user``."""
+    matrix = get_permission_matrix()
+    profile = _load_profile(user)
+
+    role = None
+    if profile is not None and profile.role is not None:
+        entry = matrix.roles.get(profile.role_id)
+        role = {
+            'id': profile.role.id,
+            'name': profile.role.name,
+            'description': profile.role.description,
+            'level': profile.role.level,
+            'is_system_role': profile.role.is_system_role,
+            'is_active': profile.role.is_active,
+            'custom_permissions': profile.role.custom_permissions or {},
+            'permissions': sorted(entry.codenames) if entry else [],
+        }
+
+    data = {
+        'user': {
+            'id': user.id,
+            'username': user.username,
+            'email': user.email,
+            'first_name': user.first_name,
+            'last_name': user.last_name,
+            'is_active': user.is_active,
+            'is_staff': user.is_staff,
+            'is_superuser': user.is_superuser,
+            'date_joined': user.date_joined,
+            'last_login': user.last_login,
+        },
+        'profile': {
+            'id': profile.id,
+            'phone_number': profile.phone_number,
+            'employee_id': profile.employee_id,
+            'title': profile.title,
+            'avatar': profile.avatar.name if profile.avatar else None,
+            'preferences': profile.preferences or {},
+            'azure_ad_groups': list(profile.azure_ad_groups or []),
+        } if profile is not None else None,
+        'role': role,
+        'mapped_roles': [
+            {
+                'id': entry.id,
+                'name': entry.name,
+                'description': entry.description,
+                'level': entry.level,
+                'permissions': sorted(entry.codenames),
+            }
+            for entry in matrix.mapped_roles(azure_groups)
+        ],
+        'permissions': sorted(user.get_all_permissions()),
+    }
+    return ProfileSnapshot(user.pk, azure_groups, matrix.version, version, data)
+
+
+class ProfileSnapshotCache:
+    """Thread-safe, versioned LRU of profile snapshots keyed by user id."""
+
+    def __init__(self, max_size: int = DEFAULT_CACHE_SIZE, ttl: int = DEFAULT_TTL):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.version = 0
+        self._entries: 'OrderedDict[Any, ProfileSnapshot]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.rebuilds = 0
+
+    @classmethod
+    def from_settings(cls) -> 'ProfileSnapshotCache':
+        config = getattr(settings, 'JWT_AUTH', {})
+        return cls(
+            max_size=config.get('PROFILE_CACHE_SIZE', DEFAULT_CACHE_SIZE),
+            ttl=config.get('PROFILE_CACHE_TTL', DEFAULT_TTL),
+        )
+
+    def _is_fresh(self, snapshot: ProfileSnapshot, azure_groups: Tuple[str, ...], matrix_version: int) -> bool:
+        return (
+            snapshot.version == self.version
+            and snapshot.matrix_version == matrix_version
+            and snapshot.azure_groups == azure_groups
+            and time.monotonic() - snapshot.built_at < self.ttl
+        )
+
+    def get(self, user) -> ProfileSnapshot:
+        """Return the snapshot for ``user``, rebuilding it only when it is stale."""
+        azure_groups = user_azure_groups(user)
+        matrix_version = get_permission_matrix().version
+
+        with self._lock:
+            snapshot = self._entries.get(user.pk)
+            if snapshot is not None and self._is_fresh(snapshot, azure_groups, matrix_version):
+                self._entries.move_to_end(user.pk)
+                self.hits += 1
+                return snapshot
+            if snapshot is None:
+                self.misses += 1
+            else:
+                self.rebuilds += 1
+            version = self.version
+
+        snapshot = build_snapshot(user, azure_groups, version)
+        if self.max_size > 0:
+            with self._lock:
+                # An invalidation may have happened while we were building; don't cache stale data.
+                if snapshot.version == self.version:
+                    self._entries[user.pk] = snapshot
+                    self._entries.move_to_end(user.pk)
+                    while len(self._entries) > self.max_size:
+                        self._entries.popitem(last=False)
+        return snapshot
+
+    def invalidate_all(self) -> None:
+        with self._lock:
+            self.version += 1
+            self._entries.clear()
+
+    def invalidate_user(self, user_pk) -> None:
+        with self._lock:
+            self._entries.pop(user_pk, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.rebuilds = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'version': self.version,
+                'hits': self.hits,
+                'misses': self.misses,
+                'rebuilds': self.rebuilds,
+            }
+
+
+_profile_cache: Optional[ProfileSnapshotCache] = None
+_profile_cache_lock = threading.Lock()
+
+
+def get_profile_cache() -> ProfileSnapshotCache:
+    """Return the process-wide profile snapshot cache, creating it from settings on first use."""
+    global _profile_cache
+    if _profile_cache is None:
+        with _profile_cache_lock:
+            if _profile_cache is None:
+                _profile_cache = ProfileSnapshotCache.from_settings()
+    return _profile_cache
+
+
+def get_profile_snapshot(user) -> ProfileSnapshot:
+    return get_profile_cache().get(user)
+
+
+# --- Renderings ---
+
+def render_profile(snapshot: ProfileSnapshot) -> Dict[str, Any]:
+    """Payload for ``GET /profile``."""
+    user = snapshot.user
+    role_details: List[Dict[str, Any]] = snapshot.data['mapped_roles']
+    highest_role = role_details[0] if role_details else None
+    return {
+        'id': user['id'],
+        'username': user['username'],
+        'email': user['email'],
+        'first_name': user['first_name'],
+        'last_name': user['last_name'],
+        'roles': [role['name'] for role in role_details],  # For backward compatibility
+        'role_details': role_details,
+        'highest_role': {
+            'id': highest_role['id'],
+            'name': highest_role['name'],
+            'level': highest_role['level'],
+        } if highest_role else None,
+        'permissions': snapshot.data['permissions'],
+        'is_staff': user['is_staff'],
+        'is_superuser': user['is_superuser'],
+        'date_joined': user['date_joined'],
+        'last_login': user['last_login'],
+    }
+
+
+def render_current_user(snapshot: ProfileSnapshot) -> Dict[str, Any]:
+    """Payload for ``GET /users/me`` (``UserOut``)."""
+    user = snapshot.user
+    return {
+        'id': user['id'],
+        'username': user['username'],
+        'email': user['email'],
+        'is_active': user['is_active'],
+        'first_name': user['first_name'],
+        'last_name': user['last_name'],
+        'profile': snapshot.profile,
+        'roles': [snapshot.role] if snapshot.role else [],
+    }
+
+
+def render_auth_user(snapshot: ProfileSnapshot) -> Dict[str, Any]:
+    """Payload for ``GET /auth/me``."""
+    user = snapshot.user
+    role = snapshot.role
+    return {
+        'username': user['username'],
+        'email': user['email'],
+        'first_name': user['first_name'],
+        'last_name': user['last_name'],
+        'role': {
+            'id': role['id'],
+            'name': role['name'],
+            'level': role['level'],
+        } if role else None,
+        'is_staff': user['is_staff'],
+        'is_superuser': user['is_superuser'],
+    }
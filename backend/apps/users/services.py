@@ -1,5 +1,6 @@
 from typing import List, Optional
 from django.db import transaction
+from django.db.models import QuerySet
 from django.contrib.auth import get_user_model
 from .models import Role, UserProfile
 
@@ -9,13 +10,13 @@ User = get_user_model()
 class UserService:
     """Service layer for user management."""
     @staticmethod
-    def list_users(active: Optional[bool] = None, search: Optional[str] = None) -> List[User]:
-        qs = User.objects.select_related('profile').all()
+    def list_users(active: Optional[bool] = None, search: Optional[str] = None) -> QuerySet:
+        qs = User.objects.select_related('profile').order_by('username')
         if active is not None:
             qs = qs.filter(is_active=active)
         if search:
             qs = qs.filter(username__icontains=search)
-        return list(qs)
+        return qs
 
     @staticmethod
     def get_user(user_id: int) -> Optional[User]:
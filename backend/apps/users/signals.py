@@ -1,7 +1,10 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete, m2m_changed
 from django.dispatch import receiver
 from django.conf import settings # Using settings.AUTH_USER_MODEL is more robust
-from .models import UserProfile, User # Or directly from .models import User if preferred and settings.AUTH_USER_MODEL points to it
+from django.contrib.auth.models import Group
+from .models import UserProfile, User, Role, GroupRoleMapping
+from .permission_matrix import invalidate_permission_matrix
+from .profile_snapshot import get_profile_cache
 
 @receiver(post_save, sender=settings.AUTH_USER_MODEL)
 def create_user_profile(sender, instance, created, **kwargs):
@@ -14,3 +17,45 @@ def save_user_profile(sender, instance, **kwargs):
     """Save UserProfile when User is saved."""
     if hasattr(instance, 'profile'):
         instance.profile.save()
+
+@receiver(post_save, sender=Role)
+@receiver(post_delete, sender=Role)
+@receiver(post_save, sender=GroupRoleMapping)
+@receiver(post_delete, sender=GroupRoleMapping)
+@receiver(m2m_changed, sender=Role.permissions.through)
+def invalidate_role_permission_matrix(sender, **kwargs):
+    """Rebuild the in-memory permission matrix when roles or their mappings change."""
+    invalidate_permission_matrix()
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def invalidate_user_profile_snapshot(sender, instance, **kwargs):
+    """Drop the cached profile snapshot when the user changes."""
+    get_profile_cache().invalidate_user(instance.pk)
+
+@receiver(post_save, sender=UserProfile)
+@receiver(post_delete, sender=UserProfile)
+def invalidate_profile_snapshot(sender, instance, **kwargs):
+    """Drop the cached profile snapshot when the profile changes."""
+    get_profile_cache().invalidate_user(instance.user_id)
+
+@receiver(m2m_changed, sender=User.groups.through)
+@receiver(m2m_changed, sender=User.user_permissions.through)
+def invalidate_membership_profile_snapshots(sender, instance, action, reverse, pk_set, **kwargs):
+    """Django groups and permissions feed ``user.get_all_permissions()`` in the snapshot."""
+    if not action.startswith('post_'):
+        return
+    cache = get_profile_cache()
+    if not reverse:
+        cache.invalidate_user(instance.pk)
+    elif pk_set:
+        for user_pk in pk_set:
+            cache.invalidate_user(user_pk)
+    else:
+        cache.invalidate_all()
+
+@receiver(m2m_changed, sender=Group.permissions.through)
+def invalidate_group_permission_snapshots(sender, action, **kwargs):
+    if action.startswith('post_'):
+        get_profile_cache().invalidate_all()
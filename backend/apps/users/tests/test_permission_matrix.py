@@ -0,0 +1,98 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group, Permission
+from django.test import TestCase, override_settings
+
+from apps.authentication.principal import get_principal_cache
+from apps.users.models import GroupRoleMapping, Role
+from apps.users.permission_matrix import get_permission_matrix, get_user_permissions, invalidate_permission_matrix
+
+User = get_user_model()
+
+
+@override_settings(JWT_AUTH={'PERMISSION_MATRIX_CHECK_INTERVAL': 30})
+class PermissionMatrixTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="aroha", email="aroha@example.org")
+        self.admin = Role.objects.create(name="Administrator", level=1, custom_permissions={"manage_roles": True})
+        self.staff = Role.objects.create(name="Staff", level=3)
+        self.staff.permissions.add(Permission.objects.get(codename="view_group"))
+        GroupRoleMapping.objects.create(azure_ad_group_id="azure-admins", role=self.admin, created_by=self.user)
+        GroupRoleMapping.objects.create(azure_ad_group_id="azure-staff", role=self.staff, created_by=self.user)
+        invalidate_permission_matrix()
+
+    def test_lookups_need_no_queries(self):
+        matrix = get_permission_matrix()
+        with self.assertNumQueries(0):
+            permissions = matrix.resolve(["azure-staff", "azure-admins"])
+            self.assertEqual(permissions.highest_level, 1)
+            self.assertTrue(permissions.has_perm("view_group"))
+            self.assertTrue(permissions.has_perm("manage_roles"))
+            self.assertEqual(set(self.admin.get_all_permissions()), {"manage_roles"})
+
+    def test_has_role_means_django_group_membership(self):
+        # A mapped role is not a group: the baseline require_role checked user.groups only.
+        self.user.groups.add(Group.objects.create(name="azure-admins"))
+        permissions = get_user_permissions(self.user)
+        self.assertIn("Administrator", permissions.role_names)
+        self.assertFalse(permissions.has_role("Administrator"))
+
+        # A hand-assigned Django group counts, with or without a mapping.
+        other = User.objects.create_user(username="tama", email="tama@example.org")
+        other.groups.add(Group.objects.create(name="Administrator"))
+        permissions = get_user_permissions(other)
+        self.assertTrue(permissions.has_role("Administrator"))
+        self.assertTrue(permissions.has_any_role("Manager", "Administrator"))
+        self.assertIsNone(permissions.highest_level)
+
+    def test_principal_checks_django_groups_and_maps_token_groups(self):
+        self.user.groups.add(Group.objects.create(name="Administrator"))
+        cache = get_principal_cache()
+        cache.clear()
+        self.addCleanup(cache.clear)
+        principal = cache.resolve(self.user, ["azure-staff"])
+        self.assertTrue(principal.permissions.has_role("Administrator"))
+        self.assertFalse(principal.permissions.has_role("Staff"))
+        self.assertEqual(principal.permissions.highest_level, 3)
+
+        # Removing the hand-assigned group drops the cached principal.
+        self.user.groups.clear()
+        principal = cache.resolve(self.user, ["azure-staff"])
+        self.assertFalse(principal.permissions.has_role("Administrator"))
+
+    def test_signals_rebuild_the_matrix(self):
+        version = get_permission_matrix().version
+        self.staff.permissions.add(Permission.objects.get(codename="change_group"))
+        matrix = get_permission_matrix()
+        self.assertGreater(matrix.version, version)
+        self.assertIn("change_group", matrix.role_permissions(self.staff.id))
+
+    def age(self, matrix):
+        """Make ``matrix`` due for its next fingerprint check."""
+        matrix.checked_at -= 60
+        return matrix
+
+    def test_writes_without_signals_are_picked_up_by_the_fingerprint(self):
+        version = get_permission_matrix().version
+        Role.objects.filter(pk=self.staff.pk).update(is_active=False)
+        Role.permissions.through.objects.filter(role=self.staff).delete()
+        self.assertEqual(get_permission_matrix().version, version)
+
+        self.age(get_permission_matrix())
+        matrix = get_permission_matrix()
+        self.assertGreater(matrix.version, version)
+        self.assertFalse(matrix.roles[self.staff.id].is_active)
+        self.assertEqual(matrix.role_permissions(self.staff.id), frozenset())
+
+    def test_check_interval_throttles_the_fingerprint(self):
+        matrix = get_permission_matrix()
+        with self.assertNumQueries(0):
+            get_permission_matrix()
+        self.age(matrix)
+        with self.assertNumQueries(3):
+            self.assertIs(get_permission_matrix(), matrix)
+        with self.assertNumQueries(0):
+            get_permission_matrix()
+        with self.settings(JWT_AUTH={'PERMISSION_MATRIX_CHECK_INTERVAL': 0}):
+            self.age(matrix)
+            with self.assertNumQueries(0):
+                get_permission_matrix()
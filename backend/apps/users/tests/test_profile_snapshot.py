@@ -0,0 +1,113 @@
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase, override_settings
+from ninja.testing import TestClient
+
+from apps.authentication.jwt_auth import JWTAuth
+from apps.authentication.principal import get_principal_cache
+from apps.users.api import users_router
+from apps.users.models import Role, UserProfile
+from apps.users.permission_matrix import invalidate_permission_matrix
+from apps.users.profile_snapshot import get_profile_cache, get_profile_snapshot
+
+User = get_user_model()
+
+
+@override_settings(JWT_AUTH={**settings.JWT_AUTH, 'PERMISSION_MATRIX_CHECK_INTERVAL': 30})
+class ProfileSnapshotTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="aroha", email="aroha@example.org", first_name="Aroha")
+        self.staff = Role.objects.create(name="Staff", level=3)
+        self.manager = Role.objects.create(name="Manager", level=2)
+        UserProfile.objects.filter(user=self.user).update(role=self.staff, title="Kaimahi")
+        invalidate_permission_matrix()
+        # The signal receivers act on the process-wide caches.
+        self.cache = get_profile_cache()
+        self.cache.invalidate_all()
+        self.addCleanup(self.cache.clear)
+        get_principal_cache().clear()
+        self.addCleanup(get_principal_cache().clear)
+        self.client = TestClient(users_router)
+
+    def fetch_user(self):
+        # Each request authenticates a fresh user object.
+        return User.objects.get(pk=self.user.pk)
+
+    def get_profile(self, **extra):
+        # /profile lives on the project API behind JWTAuth, so it goes through the full stack.
+        return Client().get("/api/v1/profile", HTTP_AUTHORIZATION="Bearer token-a", **extra)
+
+    def get_me(self, **headers):
+        return self.client.get("/me", user=self.fetch_user(), headers=headers)
+
+    def test_hit_needs_no_queries(self):
+        first = get_profile_snapshot(self.fetch_user())
+        user = self.fetch_user()
+        with self.assertNumQueries(0):
+            second = get_profile_snapshot(user)
+        self.assertIs(second, first)
+        self.assertEqual(second.role["name"], "Staff")
+        self.assertEqual(self.cache.stats()["hits"], 1)
+
+    def test_users_me_sends_an_etag_and_answers_304(self):
+        response = self.get_me()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["profile"]["title"], "Kaimahi")
+        self.assertEqual(response.json()["roles"][0]["name"], "Staff")
+        etag = response.headers["ETag"]
+
+        response = self.get_me(**{"If-None-Match": etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.headers["ETag"], etag)
+        self.assertEqual(response.content, b"")
+
+        response = self.get_me(**{"If-None-Match": '"stale"'})
+        self.assertEqual(response.status_code, 200)
+
+    def test_profile_change_invalidates_the_snapshot(self):
+        etag = self.get_me().headers["ETag"]
+        profile = UserProfile.objects.get(user=self.user)
+        profile.title = "Kaiwhakahaere"
+        profile.save()
+
+        response = self.get_me(**{"If-None-Match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["profile"]["title"], "Kaiwhakahaere")
+        self.assertNotEqual(response.headers["ETag"], etag)
+
+    def test_role_change_invalidates_the_snapshot(self):
+        etag = self.get_me().headers["ETag"]
+        profile = UserProfile.objects.get(user=self.user)
+        profile.role = self.manager
+        profile.save()
+
+        response = self.get_me(**{"If-None-Match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["roles"][0]["name"], "Manager")
+        etag = response.headers["ETag"]
+
+        # Editing the role itself moves the permission matrix version.
+        self.manager.description = "Team leads"
+        self.manager.save()
+        response = self.get_me(**{"If-None-Match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["roles"][0]["description"], "Team leads")
+
+    def test_profile_endpoint_sends_an_etag_and_answers_304(self):
+        with mock.patch.object(JWTAuth, "_authenticate", side_effect=lambda token: self.fetch_user()):
+            response = self.get_profile()
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json()["username"], "aroha")
+            etag = response["ETag"]
+
+            response = self.get_profile(HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 304)
+
+            self.user.first_name = "Tama"
+            self.user.save()
+            response = self.get_profile(HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json()["first_name"], "Tama")
+
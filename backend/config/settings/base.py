@@ -1,4 +1,5 @@
 import os
+import sys
 from pathlib import Path
 import environ
 
@@ -16,6 +17,8 @@ if env_file.exists():
 # Security
 SECRET_KEY = env('DJANGO_SECRET_KEY')
 DEBUG = env('DJANGO_DEBUG', default=True)
+# Running under `manage.py test` or pytest
+TESTING = sys.argv[1:2] == ['test'] or 'pytest' in sys.modules
 ALLOWED_HOSTS = env.list('DJANGO_ALLOWED_HOSTS', default=[
     'localhost',
     '127.0.0.1',
@@ -224,12 +227,82 @@ AZURE_AD = {
      'CLIENT_ID': env('AZURE_AD_CLIENT_ID', default=''),
      'CLIENT_SECRET': env('AZURE_AD_CLIENT_SECRET', default=''),
 }
+# Audit trail writer (see apps/audit/writer.py)
+AUDIT_LOG = {
+     'MODE': env('AUDIT_LOG_MODE', default=None), # 'async' or 'sync' (each entry written inline); unset means sync under DEBUG or tests, async otherwise
+     'BATCH_SIZE': env.int('AUDIT_LOG_BATCH_SIZE', default=100), # Flush once this many entries are buffered
+     'FLUSH_INTERVAL': env.float('AUDIT_LOG_FLUSH_INTERVAL', default=1.0), # Max seconds an entry waits in the buffer
+     'QUEUE_SIZE': env.int('AUDIT_LOG_QUEUE_SIZE', default=10000),
+     'OVERFLOW_POLICY': env('AUDIT_LOG_OVERFLOW_POLICY', default='inline'), # 'inline', 'block' or 'drop' when the buffer is full
+     'BLOCK_TIMEOUT': env.float('AUDIT_LOG_BLOCK_TIMEOUT', default=0.05),
+     'RETRY_DELAY': env.float('AUDIT_LOG_RETRY_DELAY', default=0.5), # Pause before retrying a failed batch
+     # Compact row storage (see apps/audit/encoding.py)
+     'MAX_PAYLOAD_BYTES': env.int('AUDIT_LOG_MAX_PAYLOAD_BYTES', default=8192), # Redacted JSON above this is truncated before compression
+     'DICTIONARY_CACHE_SIZE': env.int('AUDIT_LOG_DICTIONARY_CACHE_SIZE', default=10000),
+     # Audit search API (see apps/audit/queries.py)
+     'QUERY_DEFAULT_WINDOW_HOURS': env.int('AUDIT_LOG_QUERY_DEFAULT_WINDOW_HOURS', default=24), # Window searched when no 'since' is given
+     'EXPORT_MAX_ROWS': env.int('AUDIT_LOG_EXPORT_MAX_ROWS', default=100000),
+     # Monthly partitions and retention (see apps/audit/partitions.py and the audit_maintenance command)
+     'PARTITION_MONTHS_AHEAD': env.int('AUDIT_LOG_PARTITION_MONTHS_AHEAD', default=3),
+     'PARTITION_CHECK_INTERVAL': env.int('AUDIT_LOG_PARTITION_CHECK_INTERVAL', default=86400), # Seconds between checks by the writer
+     'RETENTION_MONTHS': env.int('AUDIT_LOG_RETENTION_MONTHS', default=0), # 0 keeps every partition
+     'RETENTION_ACTION': env('AUDIT_LOG_RETENTION_ACTION', default='detach'), # 'detach' keeps old months as standalone tables, 'drop' deletes them
+}
+# In-memory option list registry (see apps/optionlists/registry.py)
+OPTION_LISTS = {
+     'REGISTRY_CHECK_INTERVAL': env.int('OPTION_LISTS_REGISTRY_CHECK_INTERVAL', default=30), # Seconds between checks for changes made by other processes; 0 relies on signals only
+}
+# Cached country/language payloads (see apps/reference_data/cache.py)
+REFERENCE_DATA = {
+     'MAX_AGE': env.int('REFERENCE_DATA_MAX_AGE', default=3600), # Cache-Control max-age sent to clients
+     'REFRESH_INTERVAL': env.int('REFERENCE_DATA_REFRESH_INTERVAL', default=300), # Seconds before a payload is re-read to pick up loaddata/edits from other processes; 0 relies on signals only
+}
+# Incremental "changes since" feeds, e.g. /clients/changes (see apps/common/changes.py)
+CHANGE_FEED = {
+     'PAGE_SIZE': env.int('CHANGE_FEED_PAGE_SIZE', default=200),
+     'MAX_PAGE_SIZE': env.int('CHANGE_FEED_MAX_PAGE_SIZE', default=1000),
+     'SETTLE_SECONDS': env.float('CHANGE_FEED_SETTLE_SECONDS', default=2.0), # Rows newer than this are held back; transactions committing later than this after a write can be skipped
+}
+# Keyset pagination of list endpoints (see apps/common/pagination.py)
+PAGINATION = {
+     'PAGE_SIZE': env.int('PAGINATION_PAGE_SIZE', default=50),
+     'MAX_PAGE_SIZE': env.int('PAGINATION_MAX_PAGE_SIZE', default=500), # Larger ?limit= values are clamped
+}
+
 # JWT Configuration
 JWT_AUTH = {
      'ALGORITHM': 'RS256',
      'AUDIENCE': f"api://{AZURE_AD['CLIENT_ID']}", # Match Application ID URI format
      'ISSUER': f"https://sts.windows.net/{AZURE_AD['TENANT_ID']}/", # Changed to v1.0 issuer
      'JWKS_URI': f"https://login.microsoftonline.com/{AZURE_AD['TENANT_ID']}/discovery/keys", # Common v1.0/v2.0 JWKS URI
+     # JWKS key manager (see apps/authentication/jwks.py)
+     'JWKS_REFRESH_INTERVAL': env.int('JWT_JWKS_REFRESH_INTERVAL', default=3600), # Seconds between background refreshes
+     'JWKS_UNKNOWN_KID_INTERVAL': env.int('JWT_JWKS_UNKNOWN_KID_INTERVAL', default=60), # Min seconds between refetches for unknown kids
+     'JWKS_FETCH_TIMEOUT': env.float('JWT_JWKS_FETCH_TIMEOUT', default=5.0),
+     'JWKS_FILE': env('JWT_JWKS_FILE', default=None), # Optional local JWKS JSON loaded at startup
+     'JWKS_BACKGROUND_REFRESH': env.bool('JWT_JWKS_BACKGROUND_REFRESH', default=True),
+     # Microsoft Graph group-overage resolver (see apps/authentication/graph_groups.py)
+     'GRAPH_API_BASE_URL': env('JWT_GRAPH_API_BASE_URL', default='https://graph.microsoft.com/v1.0'),
+     'GRAPH_GROUPS_CACHE_TTL': env.int('JWT_GRAPH_GROUPS_CACHE_TTL', default=300),
+     'GRAPH_CONNECT_TIMEOUT': env.float('JWT_GRAPH_CONNECT_TIMEOUT', default=2.0),
+     'GRAPH_READ_TIMEOUT': env.float('JWT_GRAPH_READ_TIMEOUT', default=5.0),
+     'GRAPH_MAX_PAGES': env.int('JWT_GRAPH_MAX_PAGES', default=20),
+     # Remove Django group memberships that are no longer in the token (see apps/authentication/group_sync.py)
+     'SYNC_REMOVE_STALE_GROUPS': env.bool('JWT_SYNC_REMOVE_STALE_GROUPS', default=False),
+     # Verified-token cache (see apps/authentication/token_cache.py)
+     'TOKEN_CACHE_SIZE': env.int('JWT_TOKEN_CACHE_SIZE', default=1024), # 0 disables the cache
+     'TOKEN_CACHE_MAX_TTL': env.int('JWT_TOKEN_CACHE_MAX_TTL', default=300), # Seconds a process-local entry is trusted
+     'TOKEN_CACHE_BACKEND': env('JWT_TOKEN_CACHE_BACKEND', default=None), # Optional CACHES alias shared between workers
+     # Add X-Auth-Passes / X-Auth-Queries headers to API responses (defaults to DEBUG)
+     'EXPOSE_AUTH_COST_HEADERS': env.bool('JWT_EXPOSE_AUTH_COST_HEADERS', default=DEBUG),
+     # Resolved-principal cache (see apps/authentication/principal.py)
+     'PRINCIPAL_CACHE_SIZE': env.int('JWT_PRINCIPAL_CACHE_SIZE', default=2048), # 0 disables the cache
+     'PRINCIPAL_CACHE_TTL': env.int('JWT_PRINCIPAL_CACHE_TTL', default=300), # Seconds before a principal is rebuilt regardless
+     # Profile snapshot cache for /profile, /users/me and /auth/me (see apps/users/profile_snapshot.py)
+     'PROFILE_CACHE_SIZE': env.int('JWT_PROFILE_CACHE_SIZE', default=2048), # 0 disables the cache
+     'PROFILE_CACHE_TTL': env.int('JWT_PROFILE_CACHE_TTL', default=300),
+     # In-memory role/permission matrix (see apps/users/permission_matrix.py)
+     'PERMISSION_MATRIX_CHECK_INTERVAL': env.int('JWT_PERMISSION_MATRIX_CHECK_INTERVAL', default=30), # Seconds between checks for role changes made by other processes; 0 relies on signals only
 }
 
 # Session configuration
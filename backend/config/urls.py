@@ -7,6 +7,9 @@ from api.ninja import api
 from ninja.security import HttpBearer # HttpBearer might be used by JWTAuth or other parts, keep for now
 from django.contrib.auth.models import User # Keep if used by JWTAuth or other parts
 from apps.authentication.jwt_auth import JWTAuth
+from apps.common.http import etag_matches, not_modified, set_validators
+from apps.users.profile_snapshot import get_profile_snapshot, render_profile
+from django.http import HttpResponse
 
 # Authentication instance (used by @api.get decorators below for auth=auth)
 auth = JWTAuth()
@@ -48,7 +51,7 @@ def validate_token(request):
 
 # User profile endpoint
 @api.get("/profile", auth=auth)
-def get_user_profile(request):
+def get_user_profile(request, response: HttpResponse):
     """
     Get current user profile with detailed role information.
     
@@ -67,64 +70,16 @@ def get_user_profile(request):
             - is_superuser: Boolean indicating superuser status
             - date_joined: When the user account was created
             - last_login: When the user last logged in
+
+    The payload is served from the cached profile snapshot with an ETag;
+    a request with a matching If-None-Match gets 304 Not Modified.
     """
-    user = request.auth
-    
-    # Get all roles from Azure AD groups
-    azure_groups = getattr(user, 'azure_ad_groups', []) or []
-    
-    # Get all role mappings for user's Azure AD groups
-    from apps.users.models import GroupRoleMapping
-    role_mappings = GroupRoleMapping.objects.filter(
-        azure_ad_group_id__in=azure_groups
-    ).select_related('role').order_by('role__level')
-    
-    # Extract unique roles (in case of multiple mappings to same role)
-    roles = []
-    seen_role_ids = set()
-    
-    for mapping in role_mappings:
-        if mapping.role_id not in seen_role_ids:
-            seen_role_ids.add(mapping.role_id)
-            roles.append(mapping.role)
-    
-    # Get highest role (lowest level number)
-    highest_role = roles[0] if roles else None
-    
-    # Prepare role details
-    role_details = [
-        {
-            "id": role.id,
-            "name": role.name,
-            "description": role.description,
-            "level": role.level,
-            "permissions": list(role.permissions.values_list('codename', flat=True))
-        }
-        for role in roles
-    ]
-    
-    # For backward compatibility, include role names in the root
-    role_names = [role['name'] for role in role_details]
-    
-    return {
-        "id": user.id,
-        "username": user.username,
-        "email": user.email,
-        "first_name": user.first_name,
-        "last_name": user.last_name,
-        "roles": role_names,  # For backward compatibility
-        "role_details": role_details,
-        "highest_role": {
-            "id": highest_role.id,
-            "name": highest_role.name,
-            "level": highest_role.level
-        } if highest_role else None,
-        "permissions": list(user.get_all_permissions()),
-        "is_staff": user.is_staff,
-        "is_superuser": user.is_superuser,
-        "date_joined": user.date_joined,
-        "last_login": user.last_login,
-    }
+    snapshot = get_profile_snapshot(request.auth)
+    etag = snapshot.etag('profile')
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_validators(response, etag)
+    return render_profile(snapshot)
 
 # Include API routers
 
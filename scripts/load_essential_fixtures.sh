@@ -30,30 +30,19 @@ echo "0. Running migrations to ensure roles are created..."
 $PYTHON_CMD manage.py migrate users || echo "   ⚠️  Failed to run migrations"
 
 echo ""
-# Load fixtures individually with error handling
-echo "1. Loading reference data..."
-echo "   - Countries..."
-$PYTHON_CMD manage.py loaddata apps/reference_data/fixtures/countries.json || echo "   ⚠️  Failed to load countries"
-
-echo "   - Languages..."
-$PYTHON_CMD manage.py loaddata apps/reference_data/fixtures/languages.json || echo "   ⚠️  Failed to load languages"
-
-echo ""
-echo "2. Loading option lists..."
-echo "   - Client statuses..."
-$PYTHON_CMD manage.py loaddata apps/optionlists/fixtures/3_client-statuses.json || echo "   ⚠️  Failed to load client statuses"
-
-echo "   - Referral types..."
-$PYTHON_CMD manage.py loaddata apps/optionlists/fixtures/1_referral-types.json || echo "   ⚠️  Failed to load referral types"
-
-echo "   - Referral statuses..."
-$PYTHON_CMD manage.py loaddata apps/optionlists/fixtures/2_referral-statuses.json || echo "   ⚠️  Failed to load referral statuses"
-
-echo "   - Other option lists..."
-$PYTHON_CMD manage.py loaddata apps/optionlists/fixtures/4_referral-priorities.json || echo "   ⚠️  Failed"
-$PYTHON_CMD manage.py loaddata apps/optionlists/fixtures/5_referral-service-types.json || echo "   ⚠️  Failed"
-$PYTHON_CMD manage.py loaddata apps/optionlists/fixtures/7_pronouns.json || echo "   ⚠️  Failed"
-$PYTHON_CMD manage.py loaddata apps/optionlists/fixtures/8_ethnicity.json || echo "   ⚠️  Failed"
+# Seed reference data and option lists in one transaction; existing rows are matched and updated
+echo "1. Seeding reference data (countries, languages)..."
+echo "2. Seeding option lists..."
+$PYTHON_CMD manage.py seed_option_lists \
+    apps/reference_data/fixtures/countries.json \
+    apps/reference_data/fixtures/languages.json \
+    apps/optionlists/fixtures/3_client-statuses.json \
+    apps/optionlists/fixtures/1_referral-types.json \
+    apps/optionlists/fixtures/2_referral-statuses.json \
+    apps/optionlists/fixtures/4_referral-priorities.json \
+    apps/optionlists/fixtures/5_referral-service-types.json \
+    apps/optionlists/fixtures/7_pronouns.json \
+    apps/optionlists/fixtures/8_ethnicity.json || echo "   ⚠️  Failed to seed reference data and option lists"
 
 echo ""
 echo "Essential fixtures loaded. You can now create clients and referrals."